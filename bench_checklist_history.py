@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark for listing saved checklist history.
+Compares scanning a directory of JSON files with an indexed query on the SQLite store.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from data.checklist_store import ChecklistStore
+
+DESTINATIONS = ["杭州", "三亚", "北京", "桂林", "昆明"]
+CHECKLIST = {key: [f"{key}第{index}项：提前准备并检查" for index in range(8)] for key in ("documents", "clothing", "medications", "daily_items")}
+
+
+def scan_history(directory, destination=None, limit=20):
+    """The previous approach: open and parse every file, then sort."""
+    history = []
+    for filename in os.listdir(directory):
+        if filename.endswith(".json"):
+            with open(os.path.join(directory, filename), "r", encoding="utf-8") as f:
+                meta = json.load(f)["metadata"]
+            if destination is None or meta["destination"] == destination:
+                history.append(meta)
+    history.sort(key=lambda meta: meta["created_at"], reverse=True)
+    return history[:limit]
+
+
+def best_ms(run, repeat=5):
+    """Best wall time of run() in milliseconds."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == "__main__":
+    print("🗂️ 清单历史查询基准测试（最近20条）")
+    for count in (200, 2000):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = ChecklistStore(os.path.join(tmp_dir, "store.sqlite3"), legacy_dir=None)
+            json_bytes = 0
+            for index in range(count):
+                destination = DESTINATIONS[index % len(DESTINATIONS)]
+                created_at = f"2024-01-01T00:00:{index:06d}"
+                path = os.path.join(tmp_dir, f"checklist_{index}.json")
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump({
+                        "metadata": {"created_at": created_at, "origin": "北京", "destination": destination, "duration": "3天"},
+                        "checklist": CHECKLIST
+                    }, f, ensure_ascii=False, indent=2)
+                json_bytes += os.path.getsize(path)
+                store.save(CHECKLIST, origin="北京", destination=destination, duration="3天")
+            
+            print(f"  {count} 条记录（JSON文件共 {json_bytes / 1024:.0f}KB，数据库 {os.path.getsize(store.db_path) / 1024:.0f}KB）:")
+            print(f"    扫描JSON目录:       {best_ms(lambda: scan_history(tmp_dir)):8.2f} ms")
+            print(f"    SQLite索引查询:     {best_ms(lambda: store.history(limit=20)):8.2f} ms")
+            print(f"    按目的地（扫描）:   {best_ms(lambda: scan_history(tmp_dir, '杭州')):8.2f} ms")
+            print(f"    按目的地（索引）:   {best_ms(lambda: store.history(limit=20, destination='杭州')):8.2f} ms")
\ No newline at end of file
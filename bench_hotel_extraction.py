@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark for hotel extraction.
+Compares the single-pass extractor with the previous multi-pattern version on
+adversarial single-line input and realistic itineraries up to 100KB.
+"""
+
+import sys
+import os
+import re
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.helpers import extract_hotels_from_itinerary
+
+LEGACY_PATTERNS = [
+    r'(?:入住|住宿|下榻)[：:]\s*([^\n，,。.]+)',
+    r'(?:酒店|宾馆|度假村|客栈)[：:]\s*([^\n，,。.]+)',
+    r'推荐(?:酒店|住宿)[：:]\s*([^\n，,。.]+)',
+    r'([^\n，,。.]*(?:酒店|宾馆|度假村|客栈)[^\n，,。.]*)',
+    r'([^\n，,。.]*(?:Hotel|Resort|Inn|Motel)[^\n，,。.]*)',
+    r'(?:位于|在)([^\n，,。.]*(?:酒店|宾馆|度假村|客栈)[^\n，,。.]*)',
+    r'(?:预订|预约)([^\n，,。.]*(?:酒店|宾馆|度假村|客栈)[^\n，,。.]*)',
+    r'[-•]\s*([^\n，,。.]*(?:酒店|宾馆|度假村|客栈)[^\n，,。.]*)',
+]
+
+
+def legacy_extract(itinerary_text):
+    """The previous extractor: one findall per pattern."""
+    hotels = []
+    for pattern in LEGACY_PATTERNS:
+        hotels.extend(re.findall(pattern, itinerary_text, re.IGNORECASE))
+    hotels = [hotel.strip() for hotel in hotels if hotel.strip()]
+    return list(dict.fromkeys(hotels))[:10]
+
+
+def adversarial(size):
+    """One long line with no punctuation and no hotel keyword, the worst case for [^，。]* on both sides."""
+    return ("早上出发沿湖慢慢散步欣赏风景" * (size // 14 + 1))[:size]
+
+
+def keyword_flood(size):
+    """One long line that is nothing but bare keywords."""
+    return ("酒店宾馆Hotel " * (size // 11 + 1))[:size]
+
+
+def realistic(size):
+    """Many days of ordinary itinerary text."""
+    day = "第{n}天：上午乘高铁抵达，入住西湖国宾馆。下午漫步西湖，晚上回酒店休息。\n"
+    text, n = "", 1
+    while len(text) < size:
+        text += day.format(n=n)
+        n += 1
+    return text[:size]
+
+
+def measure(extract, text, repeat=3):
+    """Best wall time in milliseconds over a few runs."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extract(text)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(name, extract, generator, sizes):
+    """Print timings per size and the growth factor between consecutive sizes."""
+    print(f"\n📊 {name}")
+    previous = None
+    for size in sizes:
+        elapsed = measure(extract, generator(size))
+        growth = f"  x{elapsed / previous:.1f}" if previous else ""
+        print(f"  {size // 1000:>4}KB: {elapsed:9.2f} ms{growth}")
+        previous = max(elapsed, 1e-3)
+
+
+if __name__ == "__main__":
+    sizes = [12_500, 25_000, 50_000, 100_000]
+    # The old extractor is quadratic on adversarial input, so it only gets small sizes
+    legacy_sizes = [1_000, 2_000, 4_000, 8_000]
+    
+    print("⏱️ 酒店提取基准测试（倍数为相对上一档的耗时增长，线性约为 x2）")
+    report("单次扫描 - 无标点长行", extract_hotels_from_itinerary, adversarial, sizes)
+    report("单次扫描 - 关键词堆叠", extract_hotels_from_itinerary, keyword_flood, sizes)
+    report("单次扫描 - 常规行程", extract_hotels_from_itinerary, realistic, sizes)
+    report("旧版多模式 - 无标点长行", legacy_extract, adversarial, legacy_sizes)
+    report("旧版多模式 - 常规行程", legacy_extract, realistic, sizes)
+    
+    text = realistic(100_000)
+    print(f"\n📝 100KB 常规行程结果: 新 {extract_hotels_from_itinerary(text)} / 旧 {legacy_extract(text)}")
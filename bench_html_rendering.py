@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark for checklist HTML rendering.
+Compares the template renderer with the previous html += version on a 500-item checklist,
+reporting render time and the peak memory allocated while rendering.
+"""
+
+import sys
+import os
+import html
+import time
+import tracemalloc
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.travel_functions import format_checklist_html, CHECKLIST_SECTIONS
+
+ITEM_COUNT = 500
+
+# Page header and footer of the previous inline-styled renderer
+LEGACY_HEADER_HTML = """
+    <div style="font-family: 'Segoe UI', 'Microsoft YaHei', sans-serif; max-width: 800px; margin: 0 auto; background: #fafafa; padding: 20px; border-radius: 15px;">
+        <div style="text-align: center; margin-bottom: 30px;">
+            <h1 style="color: #2c3e50; font-size: 32px; margin-bottom: 10px;">🎁 专属旅行清单</h1>
+            <p style="color: #7f8c8d; font-size: 16px;">为您的旅行做好充分准备</p>
+        </div>
+    """
+LEGACY_FOOTER_HTML = """
+        <div style="background: #f5f5f5; padding: 15px; border-radius: 8px; text-align: center; color: #666; font-size: 13px; margin-top: 20px;">
+            <p style="margin: 5px 0;">💡 此清单仅供参考，请根据实际情况调整</p>
+        </div>
+    </div>
+    """
+
+
+def legacy_section(title, items, bg_color, title_color, escape=str):
+    """The previous create_checklist_section, optionally escaping each item."""
+    page = f"""
+    <div style="background: {bg_color}; padding: 20px; border-radius: 10px; margin-bottom: 15px; border-left: 5px solid {title_color};">
+        <h3 style="margin: 0 0 15px 0; color: {title_color}; font-size: 20px;">{title}</h3>
+        <ul style="margin: 0; padding-left: 20px; color: #555;">
+    """
+    for item in items:
+        page += f'<li style="margin-bottom: 8px; line-height: 1.6;">{escape(item)}</li>'
+    page += """
+        </ul>
+    </div>
+    """
+    return page
+
+
+def legacy_tips(tips, escape=str):
+    """The previous create_tips_section, optionally escaping each item."""
+    page = """
+    <div style="background: #fff3e0; padding: 20px; border-radius: 10px; margin-bottom: 15px; border-left: 5px solid #e65100;">
+        <h3 style="margin: 0 0 15px 0; color: #e65100; font-size: 20px;">💡 温馨提示</h3>
+    """
+    for tip in tips:
+        page += f'<p style="margin: 8px 0; color: #555; line-height: 1.6;">• {escape(tip)}</p>'
+    page += """
+    </div>
+    """
+    return page
+
+
+def legacy_format(data, escape=str):
+    """The previous format_checklist_html; it did not escape, pass html.escape to compare like for like."""
+    page = LEGACY_HEADER_HTML
+    for key, title, bg_color, title_color in CHECKLIST_SECTIONS:
+        if data.get(key):
+            page += legacy_section(title, data[key], bg_color, title_color, escape)
+    if data.get("tips"):
+        page += legacy_tips(data["tips"], escape)
+    page += LEGACY_FOOTER_HTML
+    return page
+
+
+def checklist(item_count):
+    """Checklist data with item_count items spread over every category."""
+    keys = [key for key, _, _, _ in CHECKLIST_SECTIONS] + ["tips"]
+    data = {key: [] for key in keys}
+    for index in range(item_count):
+        data[keys[index % len(keys)]].append(f"第{index}项：舒适的防滑鞋，建议提前试穿 & 准备备用鞋垫")
+    return data
+
+
+def measure(render, data, repeat=20):
+    """Best render time in milliseconds and peak traced allocation in KB."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(data)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    
+    tracemalloc.start()
+    render(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1024
+
+
+if __name__ == "__main__":
+    data = checklist(ITEM_COUNT)
+    size = len(format_checklist_html(data)) / 1024
+    print(f"⏱️ 清单渲染基准测试（{ITEM_COUNT} 项，输出约 {size:.0f}KB）")
+    renderers = (
+        ("旧版 html +=（不转义）", legacy_format),
+        ("旧版 html += 逐项 html.escape", lambda data: legacy_format(data, html.escape)),
+        ("模板渲染（整体转义）", format_checklist_html),
+    )
+    for name, render in renderers:
+        elapsed, peak = measure(render, data)
+        print(f"  {name}: {elapsed:7.3f} ms  峰值分配 {peak:8.1f} KB")
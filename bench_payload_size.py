@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark for checklist payload size.
+Compares the bytes sent for one checklist by the previous inline-styled renderer
+and the class-based renderer, with and without HTML minification.
+"""
+
+import sys
+import os
+import gzip
+import importlib
+
+# Add src to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import utils.templates as templates
+import core.travel_functions as travel_functions
+from bench_html_rendering import legacy_format, checklist
+
+# A typical generated checklist has a few dozen items
+ITEM_COUNT = 60
+
+
+def sizes(page):
+    """Raw and gzip-compressed UTF-8 size of a page in KB."""
+    data = page.encode("utf-8")
+    return len(data) / 1024, len(gzip.compress(data)) / 1024
+
+
+if __name__ == "__main__":
+    data = checklist(ITEM_COUNT)
+    data["booking_guides"] = {
+        "transport": {"title": "交通预订", "platforms": ["12306", "携程旅行", "飞猪"]},
+        "hotel": {"title": "酒店预订", "platforms": ["携程旅行", "美团", "同程旅行"]},
+    }
+    
+    pages = [("旧版内联样式", legacy_format(data))]
+    pages.append(("类名样式（压缩）", travel_functions.format_checklist_html(data)))
+    
+    # Templates are compiled at import, so reload the renderer with minification off
+    templates.HTML_MINIFY_ENABLED = False
+    importlib.reload(travel_functions)
+    pages.insert(1, ("类名样式（未压缩）", travel_functions.format_checklist_html(data)))
+    
+    print(f"📦 清单响应体积基准测试（{ITEM_COUNT} 项）")
+    baseline = len(pages[0][1].encode("utf-8"))
+    for name, page in pages:
+        raw, compressed = sizes(page)
+        print(f"  {name}: {raw:6.1f} KB（gzip {compressed:5.1f} KB）  为旧版的 {len(page.encode('utf-8')) / baseline:.0%}")
\ No newline at end of file
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark for response cleaning.
+Compares the precompiled cleaner with the previous per-call regex version, in one
+pass and on a stream where the old code re-cleaned the accumulated text per chunk.
+"""
+
+import sys
+import os
+import re
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.helpers import clean_response
+from utils.cleaning import ResponseCleaner
+
+CHUNK_SIZE = 8
+
+
+def legacy_clean(response_text):
+    """The previous clean_response."""
+    response_text = re.sub(r'```json\n?', '', response_text)
+    response_text = re.sub(r'\n?```', '', response_text)
+    response_text = response_text.strip()
+    return re.sub(r'\n{3,}', '\n\n', response_text)
+
+
+def sample(size):
+    """A fenced itinerary-like response of about size characters."""
+    day = "第{n}天：上午游览西湖，下午品尝杭帮菜。\n- 交通：地铁\n\n\n"
+    body, n = "", 1
+    while len(body) < size:
+        body += day.format(n=n)
+        n += 1
+    return "<thinking>先安排轻松的路线</thinking>\n```json\n" + body + "```\n"
+
+
+def chunks(text):
+    """Split text the way a streamed response arrives."""
+    return [text[i:i + CHUNK_SIZE] for i in range(0, len(text), CHUNK_SIZE)]
+
+
+def legacy_stream(pieces):
+    """Old streaming loop: re-clean everything received so far on every chunk."""
+    response = ""
+    for piece in pieces:
+        response += piece
+        legacy_clean(response)
+
+
+def cleaner_stream(pieces):
+    """New streaming loop: clean each chunk once."""
+    cleaner = ResponseCleaner()
+    response = ""
+    for piece in pieces:
+        response += cleaner.feed(piece)
+    return response + cleaner.flush()
+
+
+def measure(function, argument, repeat=5):
+    """Best wall time in milliseconds over a few runs."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(argument)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == "__main__":
+    print("⏱️ 响应清理基准测试")
+    
+    print("\n📊 单次清理（短响应，重复 10000 次）")
+    short = sample(300)
+    for name, function in (("旧版逐次编译", legacy_clean), ("预编译引擎", clean_response)):
+        elapsed = measure(lambda text: [function(text) for _ in range(10000)], short, repeat=3)
+        print(f"  {name}: {elapsed / 10:.2f} μs/次")
+    
+    print(f"\n📊 流式清理（每块 {CHUNK_SIZE} 字符）")
+    for size in (2_000, 8_000, 32_000):
+        pieces = chunks(sample(size))
+        legacy = measure(legacy_stream, pieces, repeat=1)
+        current = measure(cleaner_stream, pieces)
+        print(f"  {size // 1000:>3}KB: 旧版 {legacy:9.2f} ms  新版 {current:7.2f} ms")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark for UI server round trips.
+Counts the server events one user action sets off in the app's event graph:
+the handler itself, chained .then() steps and .change() listeners on the
+components it updates. Browser-only (js=) events are counted separately.
+"""
+
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import gradio as gr
+from main import create_app
+
+# User actions, identified by the button that starts them
+ACTIONS = ["🔍 推荐目的地", "📋 制定行程", "🔄 重新生成这一天", "🎯 生成专属清单"]
+
+
+def count_events(dependencies, trigger_id):
+    """Server and browser-only events set off by clicking the component trigger_id."""
+    pending = [index for index, dep in enumerate(dependencies) if [trigger_id, "click"] in map(list, dep["targets"])]
+    seen, server, browser = set(), 0, 0
+    while pending:
+        index = pending.pop()
+        if index in seen:
+            continue
+        seen.add(index)
+        dep = dependencies[index]
+        if dep["backend_fn"]:
+            server += 1
+        else:
+            browser += 1
+        
+        # Chained steps and change listeners on every updated component
+        for other, candidate in enumerate(dependencies):
+            targets = list(map(list, candidate["targets"]))
+            if candidate.get("trigger_after") == index or any([output, "change"] in targets for output in dep["outputs"]):
+                pending.append(other)
+    return server, browser
+
+
+if __name__ == "__main__":
+    app = create_app()
+    dependencies = app.config["dependencies"]
+    buttons = {block.value: block._id for block in app.blocks.values() if isinstance(block, gr.Button)}
+    
+    print("🔁 每次操作触发的事件数")
+    for label in ACTIONS:
+        server, browser = count_events(dependencies, buttons[label])
+        print(f"  {label}: 服务器事件 {server} 个，浏览器端事件 {browser} 个")
\ No newline at end of file
@@ -0,0 +1,237 @@
+"""
+Response cache module for the travel assistant application.
+Provides a two-tier (in-process LRU + on-disk SQLite) cache for model responses.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+try:
+    from ..config.config import (
+        CACHE_ENABLED, CACHE_DIR, CACHE_TTL_SECONDS, CACHE_STALE_TTL_SECONDS,
+        CACHE_MEMORY_MAX_ENTRIES, CACHE_DISK_MAX_ENTRIES
+    )
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config.config import (
+        CACHE_ENABLED, CACHE_DIR, CACHE_TTL_SECONDS, CACHE_STALE_TTL_SECONDS,
+        CACHE_MEMORY_MAX_ENTRIES, CACHE_DISK_MAX_ENTRIES
+    )
+
+
+def make_cache_key(model: str,
+                   system_prompt: str,
+                   user_prompt: str,
+                   max_tokens: Optional[int],
+                   temperature: Optional[float]) -> str:
+    """
+    Build a stable cache key for a model request.
+    
+    Args:
+        model: Model name
+        system_prompt: The system prompt
+        user_prompt: The user prompt
+        max_tokens: Maximum tokens for the response
+        temperature: Sampling temperature
+        
+    Returns:
+        Hex digest identifying the request
+    """
+    payload = json.dumps(
+        [model, system_prompt, user_prompt, max_tokens, temperature],
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier response cache with TTL and size-bounded LRU eviction."""
+    
+    def __init__(self,
+                 ttl_seconds: float = CACHE_TTL_SECONDS,
+                 stale_ttl_seconds: float = CACHE_STALE_TTL_SECONDS,
+                 memory_max_entries: int = CACHE_MEMORY_MAX_ENTRIES,
+                 disk_dir: Optional[str] = CACHE_DIR,
+                 disk_max_entries: int = CACHE_DISK_MAX_ENTRIES):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttl_seconds: Time-to-live for cached entries
+            stale_ttl_seconds: How long expired entries are kept as a fallback
+                while the upstream is unavailable
+            memory_max_entries: Maximum number of entries kept in process
+            disk_dir: Directory for the shared on-disk tier (None disables it)
+            disk_max_entries: Maximum number of entries kept on disk
+        """
+        self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.memory_max_entries = memory_max_entries
+        self.disk_max_entries = disk_max_entries
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._disk_path = None
+        
+        if disk_dir:
+            try:
+                os.makedirs(disk_dir, exist_ok=True)
+                self._disk_path = os.path.join(disk_dir, "response_cache.sqlite3")
+                self._init_disk()
+            except Exception as e:
+                print(f"响应缓存磁盘层初始化失败，仅使用内存缓存: {e}")
+                self._disk_path = None
+    
+    def get(self, key: str, allow_stale: bool = False) -> Optional[str]:
+        """
+        Look up a cached response.
+        
+        Args:
+            key: Cache key from make_cache_key
+            allow_stale: Also return entries expired less than
+                stale_ttl_seconds ago
+                
+        Returns:
+            The cached response text or None on a miss
+        """
+        now = time.time()
+        stale_after = now - self.stale_ttl_seconds
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now or (allow_stale and expires_at > stale_after):
+                    self._memory.move_to_end(key)
+                    return value
+                if expires_at <= stale_after:
+                    # Past the stale window, the same bound the disk tier purges at
+                    del self._memory[key]
+        
+        row = self._disk_get(key, now)
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at > now:
+            # The promoted entry keeps the row's expiry instead of starting a fresh TTL
+            self._memory_set(key, value, expires_at)
+            return value
+        return value if allow_stale and expires_at > stale_after else None
+    
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a response in both tiers.
+        
+        Args:
+            key: Cache key from make_cache_key
+            value: Response text to cache
+        """
+        if not value:
+            return
+        now = time.time()
+        self._memory_set(key, value, now + self.ttl_seconds)
+        self._disk_set(key, value, now)
+    
+    def clear(self) -> None:
+        """Remove all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self._disk_path:
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.execute("DELETE FROM responses")
+            except sqlite3.Error as e:
+                print(f"清空响应缓存失败: {e}")
+    
+    def _memory_set(self, key: str, value: str, expires_at: float) -> None:
+        """Insert into the in-process tier, evicting least recently used entries."""
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_max_entries:
+                self._memory.popitem(last=False)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Return the SQLite connection for the current thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._disk_path, timeout=5)
+            self._local.conn = conn
+        return conn
+    
+    def _init_disk(self) -> None:
+        """Create the on-disk table; WAL mode lets several workers share it."""
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)"
+            )
+    
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        """Read a (value, expires_at) row from the on-disk tier."""
+        if not self._disk_path:
+            return None
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            with conn:
+                conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+            return row
+        except sqlite3.Error as e:
+            print(f"读取响应缓存失败: {e}")
+            return None
+    
+    def _disk_set(self, key: str, value: str, now: float) -> None:
+        """Write to the on-disk tier and trim it to its size bound."""
+        if not self._disk_path:
+            return
+        try:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, value, now + self.ttl_seconds, now)
+                )
+                conn.execute(
+                    "DELETE FROM responses WHERE expires_at <= ?", (now - self.stale_ttl_seconds,)
+                )
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.disk_max_entries,)
+                )
+        except sqlite3.Error as e:
+            print(f"写入响应缓存失败: {e}")
+
+
+# Global cache instance
+_cache_instance = None
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the global response cache instance, or None if caching is disabled."""
+    global _cache_instance
+    if not CACHE_ENABLED:
+        return None
+    if _cache_instance is None:
+        _cache_instance = ResponseCache()
+    return _cache_instance
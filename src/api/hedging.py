@@ -0,0 +1,252 @@
+"""
+Request hedging module for the travel assistant application.
+Sends a budgeted duplicate request when the first token is late and keeps the faster one.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+try:
+    from ..config.config import (
+        HEDGING_ENABLED, HEDGE_DELAY_PERCENTILE, HEDGE_DEFAULT_DELAY,
+        HEDGE_MIN_DELAY, HEDGE_MAX_DELAY, HEDGE_MAX_RATIO
+    )
+except ImportError:
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config.config import (
+        HEDGING_ENABLED, HEDGE_DELAY_PERCENTILE, HEDGE_DEFAULT_DELAY,
+        HEDGE_MIN_DELAY, HEDGE_MAX_DELAY, HEDGE_MAX_RATIO
+    )
+
+# Samples needed before the observed percentile replaces the default delay
+MIN_TTFT_SAMPLES = 20
+
+
+class HedgingPolicy:
+    """
+    Decides when to hedge: a percentile-based delay and a token-bucket hedge budget.
+    
+    run_hedged drives a policy through hedge_delay, record_request,
+    record_deadline_miss, try_spend, refund and record_ttft; any object with
+    these methods can race two legs, e.g. router.TTFTDeadline.
+    """
+    
+    def __init__(self,
+                 enabled: bool = HEDGING_ENABLED,
+                 percentile: float = HEDGE_DELAY_PERCENTILE,
+                 default_delay: float = HEDGE_DEFAULT_DELAY,
+                 min_delay: float = HEDGE_MIN_DELAY,
+                 max_delay: float = HEDGE_MAX_DELAY,
+                 max_ratio: float = HEDGE_MAX_RATIO):
+        """
+        Initialize the hedging policy.
+        
+        Args:
+            enabled: Whether hedging is active
+            percentile: Time-to-first-token percentile used as the hedge delay
+            default_delay: Delay used until enough samples are recorded
+            min_delay: Lower bound for the hedge delay
+            max_delay: Upper bound for the hedge delay
+            max_ratio: Maximum hedges as a fraction of requests
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_ratio = max_ratio
+        self._ttft: Deque[float] = deque(maxlen=500)
+        # Each request earns max_ratio tokens and each hedge spends one
+        self._tokens = 1.0
+        self._requests = 0
+        self._late = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+        self._lock = threading.Lock()
+    
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the first token before sending a hedge."""
+        with self._lock:
+            if len(self._ttft) < MIN_TTFT_SAMPLES:
+                delay = self.default_delay
+            else:
+                samples = sorted(self._ttft)
+                delay = samples[min(len(samples) - 1, int(len(samples) * self.percentile))]
+        return min(self.max_delay, max(self.min_delay, delay))
+    
+    def record_request(self) -> None:
+        """Count a request and earn hedge budget for it."""
+        with self._lock:
+            self._requests += 1
+            self._tokens = min(10.0, self._tokens + self.max_ratio)
+    
+    def record_deadline_miss(self) -> None:
+        """Count a request whose first token had not arrived after hedge_delay."""
+        with self._lock:
+            self._late += 1
+    
+    def try_spend(self) -> bool:
+        """Take budget for one hedge; False once hedges would exceed max_ratio of traffic."""
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            self._hedges += 1
+            return True
+    
+    def refund(self) -> None:
+        """Give back the budget taken by try_spend when no hedge could be sent."""
+        with self._lock:
+            self._tokens = min(10.0, self._tokens + 1.0)
+            self._hedges -= 1
+    
+    def record_ttft(self, seconds: float, hedge_won: bool = False) -> None:
+        """Record the winning time to first token."""
+        with self._lock:
+            self._ttft.append(seconds)
+            if hedge_won:
+                self._hedge_wins += 1
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get hedging metrics.
+        
+        Returns:
+            Dictionary with request, late-request, hedge and hedge-win counts and the current delay
+        """
+        delay = self.hedge_delay()
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "late_requests": self._late,
+                "hedges": self._hedges,
+                "hedge_wins": self._hedge_wins,
+                "hedge_delay_seconds": delay,
+            }
+
+
+def run_hedged(primary: Callable[[], Any],
+               hedge: Callable[[], Any],
+               policy: HedgingPolicy,
+               try_acquire: Callable[[], bool],
+               discard: Callable[[Any], None]) -> Any:
+    """
+    Run primary, and race a hedge against it if it is slow.
+    
+    Each leg returns once its first token has arrived and owns an upstream
+    slot while it succeeds. A leg that fails must release its own slot; a
+    leg that succeeds after losing is passed to discard, which closes it and
+    frees its slot.
+    
+    Args:
+        primary: Opens the primary stream
+        hedge: Opens the duplicate stream
+        policy: Hedging policy
+        try_acquire: Takes an upstream slot for the hedge without waiting
+        discard: Closes a losing leg's result and releases its slot
+        
+    Returns:
+        The result of the first leg to produce a token
+    """
+    policy.record_request()
+    started = time.monotonic()
+    cond = threading.Condition()
+    state = {"winner": None, "errors": [], "legs": 1}
+    
+    def run(name: str, leg: Callable[[], Any]) -> None:
+        try:
+            value = leg()
+        except BaseException as e:
+            with cond:
+                state["errors"].append(e)
+                cond.notify_all()
+            return
+        with cond:
+            if state["winner"] is None:
+                state["winner"] = (name, value)
+                cond.notify_all()
+                return
+        discard(value)
+    
+    threading.Thread(target=run, args=("primary", primary), daemon=True).start()
+    
+    with cond:
+        cond.wait_for(lambda: state["winner"] or state["errors"], policy.hedge_delay())
+        waiting = not state["winner"] and not state["errors"]
+    if waiting:
+        policy.record_deadline_miss()
+    if waiting and policy.try_spend():
+        if try_acquire():
+            with cond:
+                state["legs"] = 2
+            threading.Thread(target=run, args=("hedge", hedge), daemon=True).start()
+        else:
+            # No free upstream slot, so no hedge goes out and its budget is returned
+            policy.refund()
+    
+    with cond:
+        cond.wait_for(lambda: state["winner"] or len(state["errors"]) >= state["legs"])
+        if state["winner"] is None:
+            raise state["errors"][0]
+        name, value = state["winner"]
+    
+    policy.record_ttft(time.monotonic() - started, hedge_won=name == "hedge")
+    return value
+
+
+async def async_run_hedged(primary: Callable[[], Awaitable[Any]],
+                           hedge: Callable[[], Awaitable[Any]],
+                           policy: HedgingPolicy,
+                           try_acquire: Callable[[], bool],
+                           discard: Callable[[Any], Awaitable[None]]) -> Any:
+    """
+    Async counterpart of run_hedged; a losing leg still waiting is cancelled.
+    
+    Args:
+        primary: Coroutine function opening the primary stream
+        hedge: Coroutine function opening the duplicate stream
+        policy: Hedging policy
+        try_acquire: Takes an upstream slot for the hedge without waiting
+        discard: Closes a losing leg's result and releases its slot
+        
+    Returns:
+        The result of the first leg to produce a token
+    """
+    policy.record_request()
+    started = time.monotonic()
+    tasks = {asyncio.ensure_future(primary()): "primary"}
+    
+    try:
+        done, _ = await asyncio.wait(set(tasks), timeout=policy.hedge_delay())
+        if not done:
+            policy.record_deadline_miss()
+        if not done and policy.try_spend():
+            if try_acquire():
+                tasks[asyncio.ensure_future(hedge())] = "hedge"
+            else:
+                # No free upstream slot, so no hedge goes out and its budget is returned
+                policy.refund()
+        
+        pending = set(tasks)
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    policy.record_ttft(time.monotonic() - started, hedge_won=tasks[task] == "hedge")
+                    # Extra finishers in the same batch lose as well
+                    for other in done:
+                        if other is not task and other.exception() is None:
+                            await discard(other.result())
+                    return task.result()
+                if first_error is None:
+                    first_error = task.exception()
+        raise first_error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,266 @@
+"""
+Admission control module for the travel assistant application.
+Bounds concurrent upstream model calls with a fair, bounded wait queue.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Deque, Dict, Optional
+try:
+    from ..config.config import UPSTREAM_MAX_CONCURRENCY, UPSTREAM_MAX_QUEUE, UPSTREAM_QUEUE_TIMEOUT
+except ImportError:
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config.config import UPSTREAM_MAX_CONCURRENCY, UPSTREAM_MAX_QUEUE, UPSTREAM_QUEUE_TIMEOUT
+
+DEFAULT_SESSION = "anonymous"
+
+# Session of the request being handled; set by the UI handlers
+_current_session: contextvars.ContextVar = contextvars.ContextVar("current_session", default=DEFAULT_SESSION)
+
+
+def set_current_session(session_id: Optional[str]) -> None:
+    """Record the session making upstream calls in the current context."""
+    _current_session.set(session_id or DEFAULT_SESSION)
+
+
+def get_current_session() -> str:
+    """Return the session making upstream calls in the current context."""
+    return _current_session.get()
+
+
+class AdmissionError(Exception):
+    """Raised when a request cannot be admitted to the upstream model."""
+
+
+class _Waiter:
+    """A queued request waiting for a slot."""
+    
+    __slots__ = ("signal", "granted", "enqueued_at")
+    
+    def __init__(self, signal: Any):
+        self.signal = signal
+        self.granted = False
+        self.enqueued_at = time.monotonic()
+
+
+class _FairLimiterBase:
+    """Shared bookkeeping: slot accounting, per-session round robin and metrics."""
+    
+    def __init__(self,
+                 max_concurrency: int = UPSTREAM_MAX_CONCURRENCY,
+                 max_queue: int = UPSTREAM_MAX_QUEUE,
+                 queue_timeout: float = UPSTREAM_QUEUE_TIMEOUT):
+        """
+        Initialize the limiter.
+        
+        Args:
+            max_concurrency: Maximum number of upstream calls running at once
+            max_queue: Maximum number of requests waiting for a slot
+            queue_timeout: Seconds a request may wait before failing
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._queued = 0
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._admitted = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_samples: Deque[float] = deque(maxlen=1000)
+        self._wait_max = 0.0
+    
+    def _try_admit(self) -> bool:
+        """Take a free slot if nobody is waiting ahead."""
+        if self._active < self.max_concurrency and self._queued == 0:
+            self._active += 1
+            self._record_wait(0.0)
+            return True
+        return False
+    
+    def _enqueue(self, session_id: str, waiter: _Waiter) -> None:
+        """Queue a waiter under its session, or reject when the queue is full."""
+        if self._queued >= self.max_queue:
+            self._rejected += 1
+            raise AdmissionError("当前使用人数较多，请稍后再试")
+        self._queues.setdefault(session_id, deque()).append(waiter)
+        self._queued += 1
+    
+    def _remove(self, session_id: str, waiter: _Waiter) -> None:
+        """Drop a waiter that gave up before being granted a slot."""
+        queue = self._queues.get(session_id)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            self._queued -= 1
+            if not queue:
+                del self._queues[session_id]
+    
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """Pop the next waiter, rotating across sessions so one session cannot starve others."""
+        if not self._queues:
+            return None
+        session_id, queue = next(iter(self._queues.items()))
+        waiter = queue.popleft()
+        self._queued -= 1
+        if queue:
+            self._queues.move_to_end(session_id)
+        else:
+            del self._queues[session_id]
+        return waiter
+    
+    def _record_wait(self, waited: float) -> None:
+        """Record how long an admitted request waited."""
+        self._admitted += 1
+        self._wait_samples.append(waited)
+        self._wait_max = max(self._wait_max, waited)
+    
+    def _timeout_error(self) -> AdmissionError:
+        """Build the error raised when a request waits too long."""
+        self._timed_out += 1
+        return AdmissionError(f"当前请求较多，排队超过{self.queue_timeout:g}秒，请稍后再试")
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get limiter metrics.
+        
+        Returns:
+            Dictionary with active calls, queue depth and wait-time statistics
+        """
+        samples = sorted(self._wait_samples)
+        p95 = samples[int(len(samples) * 0.95) - 1] if samples else 0.0
+        return {
+            "active": self._active,
+            "queue_depth": self._queued,
+            "queued_sessions": len(self._queues),
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "timed_out": self._timed_out,
+            "wait_avg_seconds": sum(samples) / len(samples) if samples else 0.0,
+            "wait_p95_seconds": p95,
+            "wait_max_seconds": self._wait_max,
+        }
+
+
+class ConcurrencyLimiter(_FairLimiterBase):
+    """Thread-based limiter for the synchronous client."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+    
+    def acquire(self, session_id: str = DEFAULT_SESSION) -> None:
+        """
+        Wait for an upstream slot.
+        
+        Args:
+            session_id: Session the request belongs to
+            
+        Raises:
+            AdmissionError: If the queue is full or the wait times out
+        """
+        with self._lock:
+            if self._try_admit():
+                return
+            waiter = _Waiter(threading.Event())
+            self._enqueue(session_id, waiter)
+        
+        waiter.signal.wait(self.queue_timeout)
+        
+        with self._lock:
+            if waiter.granted:
+                self._record_wait(time.monotonic() - waiter.enqueued_at)
+                return
+            self._remove(session_id, waiter)
+            raise self._timeout_error()
+    
+    def try_acquire(self) -> bool:
+        """Take a free slot without waiting; False if none is free."""
+        with self._lock:
+            return self._try_admit()
+    
+    def release(self) -> None:
+        """Hand the slot to the next waiter, or free it."""
+        with self._lock:
+            waiter = self._next_waiter()
+            if waiter is None:
+                self._active -= 1
+                return
+            waiter.granted = True
+            waiter.signal.set()
+    
+    @contextmanager
+    def slot(self, session_id: str = DEFAULT_SESSION):
+        """Context manager holding an upstream slot."""
+        self.acquire(session_id)
+        try:
+            yield
+        finally:
+            self.release()
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Get limiter metrics; see _FairLimiterBase.metrics."""
+        with self._lock:
+            return super().metrics()
+
+
+class AsyncConcurrencyLimiter(_FairLimiterBase):
+    """Asyncio limiter for the async client; all calls must come from one event loop."""
+    
+    async def acquire(self, session_id: str = DEFAULT_SESSION) -> None:
+        """
+        Wait for an upstream slot.
+        
+        Args:
+            session_id: Session the request belongs to
+            
+        Raises:
+            AdmissionError: If the queue is full or the wait times out
+        """
+        if self._try_admit():
+            return
+        waiter = _Waiter(asyncio.get_running_loop().create_future())
+        self._enqueue(session_id, waiter)
+        
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.signal), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not waiter.granted:
+                self._remove(session_id, waiter)
+                raise self._timeout_error()
+        except asyncio.CancelledError:
+            # The caller went away; give back a slot that was granted meanwhile
+            if waiter.granted:
+                self.release()
+            else:
+                self._remove(session_id, waiter)
+            raise
+        
+        self._record_wait(time.monotonic() - waiter.enqueued_at)
+    
+    def try_acquire(self) -> bool:
+        """Take a free slot without waiting; False if none is free."""
+        return self._try_admit()
+    
+    def release(self) -> None:
+        """Hand the slot to the next waiter, or free it."""
+        waiter = self._next_waiter()
+        if waiter is None:
+            self._active -= 1
+            return
+        waiter.granted = True
+        waiter.signal.set_result(None)
+    
+    @asynccontextmanager
+    async def slot(self, session_id: str = DEFAULT_SESSION):
+        """Async context manager holding an upstream slot."""
+        await self.acquire(session_id)
+        try:
+            yield
+        finally:
+            self.release()
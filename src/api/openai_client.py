@@ -3,16 +3,355 @@ OpenAI API client module for the travel assistant application.
 Handles all API communications with the AI model.
 """
 
+import asyncio
+import time
 import openai
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator, AsyncIterator, List, Tuple
 try:
-    from ..config.config import API_KEY, API_BASE, MODEL_NAME, MAX_TOKENS, TEMPERATURE
+    from ..config.config import API_KEY, API_BASE
+    from ..config.config import API_POOL, API_KEYS
+    from ..config.config import DESTINATION_SYSTEM_PROMPT, ITINERARY_SYSTEM_PROMPT, CHECKLIST_SYSTEM_PROMPT
+    from ..config.config import CHECKLIST_FIELDS, CHECKLIST_GROUP_MAX_TOKENS
+    from ..config.config import ITINERARY_OUTLINE_MAX_TOKENS, ITINERARY_BLOCK_MAX_TOKENS, ITINERARY_DAY_MAX_TOKENS
+    from .cache import get_response_cache, make_cache_key
+    from .singleflight import SingleFlight, AsyncSingleFlight
+    from .limiter import ConcurrencyLimiter, AsyncConcurrencyLimiter, AdmissionError, get_current_session
+    from .resilience import RetryPolicy, CircuitBreaker, UpstreamUnavailableError, call_with_retry, async_call_with_retry, _deadline_error
+    from .hedging import HedgingPolicy, run_hedged, async_run_hedged
+    from .pool import EndpointPool, parse_endpoints
+    from .router import ModelRouter, TaskRoute
 except ImportError:
     # Handle direct execution
     import sys
     import os
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from config.config import API_KEY, API_BASE, MODEL_NAME, MAX_TOKENS, TEMPERATURE
+    from config.config import API_KEY, API_BASE
+    from config.config import API_POOL, API_KEYS
+    from config.config import DESTINATION_SYSTEM_PROMPT, ITINERARY_SYSTEM_PROMPT, CHECKLIST_SYSTEM_PROMPT
+    from config.config import CHECKLIST_FIELDS, CHECKLIST_GROUP_MAX_TOKENS
+    from config.config import ITINERARY_OUTLINE_MAX_TOKENS, ITINERARY_BLOCK_MAX_TOKENS, ITINERARY_DAY_MAX_TOKENS
+    from api.cache import get_response_cache, make_cache_key
+    from api.singleflight import SingleFlight, AsyncSingleFlight
+    from api.limiter import ConcurrencyLimiter, AsyncConcurrencyLimiter, AdmissionError, get_current_session
+    from api.resilience import RetryPolicy, CircuitBreaker, UpstreamUnavailableError, call_with_retry, async_call_with_retry, _deadline_error
+    from api.hedging import HedgingPolicy, run_hedged, async_run_hedged
+    from api.pool import EndpointPool, parse_endpoints
+    from api.router import ModelRouter, TaskRoute
+
+
+def build_destination_prompts(season: str,
+                              health_status: str,
+                              budget: str,
+                              interests: str) -> Tuple[str, str]:
+    """Build the system and user prompts for destination recommendations."""
+    user_prompt = f"""
+请根据以下条件推荐适合银发族的国内旅行目的地：
+
+1. 季节：{season}
+2. 健康状况：{health_status}
+3. 预算范围：{budget}
+4. 兴趣偏好：{interests}
+
+请推荐3-5个目的地，并说明推荐理由，考虑以下因素：
+- 气候适宜性
+- 交通便利程度
+- 医疗条件
+- 住宿条件
+- 景点特色
+- 适合老年人的活动
+- 安全因素
+
+请用温暖、耐心的语气，像对待长辈一样详细说明每个推荐地的特点。
+"""
+    
+    return DESTINATION_SYSTEM_PROMPT, user_prompt
+
+
+# Response format read by data.itinerary.parse_trip
+ITINERARY_JSON_FORMAT = """
+请用JSON格式返回，包含以下字段：
+- summary: 行程概述
+- highlights: 行程亮点列表
+- estimated_cost: 预估费用
+- days: 每日安排列表，每项包含：
+  - day: 第几天（数字）
+  - title: 当天主题
+  - activities: 活动列表，每项包含 time、description、location、transport
+  - meals: 餐饮建议列表，每项包含 slot（早餐/午餐/晚餐）、suggestion
+  - hotel: 住宿推荐，包含 name、note
+  - rest: 休息安排
+- tips: 注意事项列表
+- emergency: 应急准备列表
+"""
+
+
+def build_itinerary_prompts(destination: str,
+                            duration: str,
+                            mobility: str,
+                            health_focus: str,
+                            structured: bool = False) -> Tuple[str, str]:
+    """Build the system and user prompts for itinerary planning; structured asks for JSON."""
+    user_prompt = f"""
+请为银发族制定一份详细的旅行行程计划：
+
+1. 目的地：{destination}
+2. 旅行时长：{duration}
+3. 行动能力：{mobility}
+4. 健康关注点：{health_focus}
+
+请制定一份详细的行程计划，包括：
+- 每日具体安排（时间、地点、活动）
+- 交通方式和路线
+- 住宿推荐
+- 餐饮建议
+- 休息安排
+- 注意事项
+- 应急准备
+
+请特别考虑银发族的特点，安排充足的休息时间，避免过于紧凑的行程。
+请用温暖、关怀的语气，像为父母规划旅行一样细心周到。
+"""
+    if structured:
+        user_prompt += ITINERARY_JSON_FORMAT
+    
+    return ITINERARY_SYSTEM_PROMPT, user_prompt
+
+
+def build_itinerary_outline_prompts(destination: str,
+                                    duration: str,
+                                    mobility: str,
+                                    health_focus: str,
+                                    min_days: int,
+                                    max_days: int) -> Tuple[str, str]:
+    """Build the system and user prompts for the day-by-day outline of a long trip."""
+    user_prompt = f"""
+请为银发族的长途旅行先拟定一份逐日行程大纲：
+
+1. 目的地：{destination}
+2. 旅行时长：{duration}（请安排{min_days}到{max_days}天）
+3. 行动能力：{mobility}
+4. 健康关注点：{health_focus}
+
+请每天只写一行，格式为"第N天：所在城市 - 当天主题与主要安排"，N使用阿拉伯数字。
+不要写详细安排或其他内容。请安排充足的休息日，避免连续奔波。
+"""
+    
+    return ITINERARY_SYSTEM_PROMPT, user_prompt
+
+
+def build_itinerary_days_prompts(destination: str,
+                                 duration: str,
+                                 mobility: str,
+                                 health_focus: str,
+                                 outline: str,
+                                 start_day: int,
+                                 end_day: int) -> Tuple[str, str]:
+    """Build the system and user prompts expanding a block of days from the outline."""
+    day_range = f"第{start_day}天" if start_day == end_day else f"第{start_day}天至第{end_day}天"
+    user_prompt = f"""
+以下是一份银发族旅行的逐日行程大纲：
+
+目的地：{destination}
+旅行时长：{duration}
+行动能力：{mobility}
+健康关注点：{health_focus}
+
+{outline}
+
+请只为{day_range}制定详细安排，每天以"第N天"作为标题，包括：
+- 当天具体安排（时间、地点、活动）
+- 交通方式和路线
+- 住宿推荐
+- 餐饮建议
+- 休息安排
+
+不要写开场白、总结或其他日期的内容。
+请用温暖、关怀的语气，像为父母规划旅行一样细心周到。
+"""
+    
+    return ITINERARY_SYSTEM_PROMPT, user_prompt
+
+
+def build_itinerary_notes_prompts(destination: str,
+                                  duration: str,
+                                  mobility: str,
+                                  health_focus: str,
+                                  outline: str) -> Tuple[str, str]:
+    """Build the system and user prompts for the notes closing a long itinerary."""
+    user_prompt = f"""
+以下是一份银发族旅行的逐日行程大纲：
+
+目的地：{destination}
+旅行时长：{duration}
+行动能力：{mobility}
+健康关注点：{health_focus}
+
+{outline}
+
+请不要重复每日安排，只为整个行程写出：
+- 注意事项
+- 应急准备
+
+请用温暖、关怀的语气，像为父母规划旅行一样细心周到。
+"""
+    
+    return ITINERARY_SYSTEM_PROMPT, user_prompt
+
+
+def build_itinerary_day_prompts(destination: str,
+                                duration: str,
+                                mobility: str,
+                                health_focus: str,
+                                day: int,
+                                current_plan: str,
+                                previous_day: str = "",
+                                next_day: str = "",
+                                change_request: str = "") -> Tuple[str, str]:
+    """Build the system and user prompts for regenerating one day of an itinerary."""
+    neighbours = "\n".join(f"- {summary}" for summary in (previous_day, next_day) if summary)
+    neighbour_context = f"\n相邻日期安排（请保持衔接）：\n{neighbours}\n" if neighbours else ""
+    request_context = f"\n修改要求：{change_request}\n" if change_request else ""
+    
+    user_prompt = f"""
+请为银发族重新安排旅行行程中的第{day}天：
+
+目的地：{destination}
+旅行时长：{duration}
+行动能力：{mobility}
+健康关注点：{health_focus}
+{neighbour_context}
+第{day}天原安排：
+{current_plan}
+{request_context}
+请以"第{day}天"作为标题，只写这一天的详细安排，包括时间、地点、活动、交通、住宿、餐饮和休息安排。
+不要写开场白、总结或其他日期的内容。
+请用温暖、关怀的语气，像为父母规划旅行一样细心周到。
+"""
+    
+    return ITINERARY_SYSTEM_PROMPT, user_prompt
+
+
+def build_checklist_prompts(origin: str,
+                            destination: str,
+                            duration: str,
+                            special_needs: str,
+                            itinerary_text: str = "") -> Tuple[str, str]:
+    """Build the system and user prompts for checklist generation."""
+    itinerary_context = f"\n参考行程要点：\n{itinerary_text}" if itinerary_text else ""
+    
+    user_prompt = f"""
+请为银发族生成一份详细的旅行清单：
+
+1. 出发地：{origin}
+2. 目的地：{destination}
+3. 旅行时长：{duration}
+4. 特殊需求：{special_needs}
+{itinerary_context}
+
+请生成一份详细的旅行清单，包括：
+- 证件类（身份证、医保卡、老年证等）
+- 衣物类（根据季节和目的地气候）
+- 药品类（常用药品、应急药品）
+- 生活用品类
+- 电子设备类
+- 财务准备
+- 安全用品
+- 娱乐用品
+- 特殊用品（根据健康状况）
+
+请用JSON格式返回，包含以下字段：
+- documents: 证件类清单
+- clothing: 衣物类清单
+- medications: 药品类清单
+- daily_items: 生活用品清单
+- electronics: 电子设备清单
+- financial: 财务准备清单
+- safety: 安全用品清单
+- entertainment: 娱乐用品清单
+- special_items: 特殊用品清单
+- tips: 温馨提示列表
+
+请用温暖、细致的语气，像为父母准备行李一样周到贴心。
+"""
+    
+    return CHECKLIST_SYSTEM_PROMPT, user_prompt
+
+
+def build_checklist_group_prompts(origin: str,
+                                  destination: str,
+                                  duration: str,
+                                  special_needs: str,
+                                  fields: List[str],
+                                  itinerary_text: str = "") -> Tuple[str, str]:
+    """Build the system and user prompts for one group of checklist categories."""
+    itinerary_context = f"\n参考行程要点：\n{itinerary_text}" if itinerary_text else ""
+    field_lines = "\n".join(f"- {field}: {CHECKLIST_FIELDS[field]}" for field in fields)
+    
+    user_prompt = f"""
+请为银发族生成旅行清单中的以下部分：
+
+1. 出发地：{origin}
+2. 目的地：{destination}
+3. 旅行时长：{duration}
+4. 特殊需求：{special_needs}
+{itinerary_context}
+
+请用JSON格式返回，只包含以下字段，每个字段是字符串列表：
+{field_lines}
+
+请用温暖、细致的语气，像为父母准备行李一样周到贴心。
+"""
+    
+    return CHECKLIST_SYSTEM_PROMPT, user_prompt
+
+
+def _build_messages(system_prompt: str, user_prompt: str) -> list:
+    """Build the chat message list for a request."""
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def _iter_content(stream) -> Iterator[str]:
+    """Yield the non-empty text deltas of a completion stream."""
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        content = chunk.choices[0].delta.content
+        if content:
+            yield content
+
+
+async def _aiter_content(stream) -> AsyncIterator[str]:
+    """Yield the non-empty text deltas of an async completion stream."""
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        content = chunk.choices[0].delta.content
+        if content:
+            yield content
+
+
+def _close_stream(stream) -> None:
+    """Close a completion stream so an abandoned generation stops upstream."""
+    close = getattr(stream, "close", None)
+    if close:
+        close()
+
+
+async def _aclose_stream(stream) -> None:
+    """Close an async completion stream so an abandoned generation stops upstream."""
+    close = getattr(stream, "close", None)
+    if close:
+        await close()
+
+
+def _wrap_error(error: Exception) -> Exception:
+    """Keep admission and availability errors readable; wrap raw API errors."""
+    if isinstance(error, (AdmissionError, UpstreamUnavailableError)):
+        return error
+    return Exception(f"API调用失败: {str(error)}")
 
 
 class OpenAIClient:
@@ -20,24 +359,34 @@ class OpenAIClient:
     
     def __init__(self):
         """Initialize the OpenAI client with configuration."""
-        self.client = None
+        self.pool = None
+        self.cache = get_response_cache()
+        self.flights = SingleFlight()
+        self.limiter = ConcurrencyLimiter()
+        self.retry_policy = RetryPolicy()
+        self.breaker = CircuitBreaker()
+        self.hedging = HedgingPolicy()
+        self.router = ModelRouter()
         self._initialize_client()
     
     def _initialize_client(self):
-        """Initialize the OpenAI client with API key and base URL."""
-        if not API_KEY:
+        """Initialize one OpenAI client per configured endpoint and key."""
+        endpoints = parse_endpoints(API_POOL, API_KEYS, API_BASE, API_KEY)
+        if not endpoints:
             raise ValueError("API密钥未设置。请在.env文件中设置MODEL_API_KEY")
         
-        self.client = openai.OpenAI(
-            api_key=API_KEY,
-            base_url=API_BASE
+        # Retries are handled by call_with_retry, so the SDK's own retries are disabled
+        self.pool = EndpointPool(
+            endpoints,
+            lambda base_url, api_key: openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
         )
     
-    def generate_response(self, 
-                         system_prompt: str, 
-                         user_prompt: str, 
+    def generate_response(self,
+                         system_prompt: str,
+                         user_prompt: str,
                          max_tokens: Optional[int] = None,
-                         temperature: Optional[float] = None) -> str:
+                         temperature: Optional[float] = None,
+                         task: Optional[str] = None) -> str:
         """
         Generate a response using the OpenAI API.
         
@@ -46,6 +395,7 @@ class OpenAIClient:
             user_prompt: The user's input prompt
             max_tokens: Maximum tokens for the response (overrides default)
             temperature: Temperature for response generation (overrides default)
+            task: Task name selecting the model and defaults, e.g. "itinerary"
             
         Returns:
             The generated response text
@@ -53,24 +403,231 @@ class OpenAIClient:
         Raises:
             Exception: If API call fails
         """
+        route = self.router.route(task)
+        max_tokens = max_tokens or route.max_tokens
+        temperature = route.temperature if temperature is None else temperature
+        cache_key = make_cache_key(route.model, system_prompt, user_prompt, max_tokens, temperature)
+        session_id = get_current_session()
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        # Identical concurrent requests wait on the first one instead of calling upstream again
+        return self.flights.do(
+            cache_key,
+            lambda: self._create_response(system_prompt, user_prompt, route, max_tokens, temperature, cache_key, session_id)
+        )
+    
+    def _create_response(self, 
+                         system_prompt: str, 
+                         user_prompt: str, 
+                         route: TaskRoute,
+                         max_tokens: int,
+                         temperature: float,
+                         cache_key: str,
+                         session_id: str) -> str:
+        """Call the routed model with retries and store the result in the cache."""
+        messages = _build_messages(system_prompt, user_prompt)
+        model = self.router.choose_model(route)
+        
+        def attempt(timeout: float) -> str:
+            with self.limiter.slot(session_id):
+                member = self.pool.acquire()
+                started = time.monotonic()
+                try:
+                    response = member.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        timeout=timeout
+                    )
+                except Exception as e:
+                    self.pool.record_failure(member, e)
+                    raise
+                finally:
+                    self.pool.release(member)
+                self.pool.record_success(member, time.monotonic() - started)
+            return response.choices[0].message.content.strip()
+        
         try:
-            response = self.client.chat.completions.create(
-                model=MODEL_NAME,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=max_tokens or MAX_TOKENS,
-                temperature=temperature or TEMPERATURE
+            result = call_with_retry(attempt, self.retry_policy, self.breaker, self.pool.can_fail_over)
+        except Exception as e:
+            stale = self._stale_response(cache_key)
+            if stale is not None:
+                return stale
+            raise _wrap_error(e)
+        
+        # The key names the primary model, so a fallback model's answer is not stored under it
+        if self.cache and model == route.model:
+            self.cache.set(cache_key, result)
+        return result
+    
+    def generate_response_stream(self,
+                                system_prompt: str,
+                                user_prompt: str,
+                                max_tokens: Optional[int] = None,
+                                temperature: Optional[float] = None,
+                                task: Optional[str] = None) -> Iterator[str]:
+        """
+        Generate a response using the OpenAI API in streaming mode.
+        
+        Args:
+            system_prompt: The system prompt to guide the AI behavior
+            user_prompt: The user's input prompt
+            max_tokens: Maximum tokens for the response (overrides default)
+            temperature: Temperature for response generation (overrides default)
+            task: Task name selecting the model and defaults, e.g. "itinerary"
+            
+        Yields:
+            Text chunks as they arrive from the model
+            
+        Raises:
+            Exception: If API call fails
+        """
+        route = self.router.route(task)
+        max_tokens = max_tokens or route.max_tokens
+        temperature = route.temperature if temperature is None else temperature
+        cache_key = make_cache_key(route.model, system_prompt, user_prompt, max_tokens, temperature)
+        session_id = get_current_session()
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+        
+        # Identical concurrent streams share one upstream generation, chunks included
+        yield from self.flights.stream(
+            cache_key,
+            lambda: self._create_stream(system_prompt, user_prompt, route, max_tokens, temperature, cache_key, session_id)
+        )
+    
+    def _create_stream(self, 
+                       system_prompt: str, 
+                       user_prompt: str, 
+                       route: TaskRoute,
+                       max_tokens: int,
+                       temperature: float,
+                       cache_key: str,
+                       session_id: str) -> Iterator[str]:
+        """Stream the routed model with retries and store the complete text in the cache."""
+        messages = _build_messages(system_prompt, user_prompt)
+        model = self.router.choose_model(route)
+        
+        def attempt(timeout: float):
+            # Each opened stream holds a slot until it ends; a failed leg gives its slot back
+            def open_leg(leg_model: str):
+                try:
+                    return self._open_stream(leg_model, messages, max_tokens, temperature, timeout)
+                except BaseException:
+                    self.limiter.release()
+                    raise
+            
+            def open_model():
+                self.limiter.acquire(session_id)
+                if not self.hedging.enabled:
+                    return open_leg(model)
+                # The primary's member already counts as busy, so the hedge goes to another one when there is one
+                return run_hedged(
+                    lambda: open_leg(model), lambda: open_leg(model),
+                    self.hedging, self.limiter.try_acquire, self._discard_stream
+                )
+            
+            if model != route.model or not route.fallback_model or not route.ttft_slo:
+                return open_model()
+            # The faster model joins the race once the primary misses its first-token deadline
+            return run_hedged(
+                open_model, lambda: open_leg(route.fallback_model),
+                self.router.deadline_policy(route, model), self.limiter.try_acquire, self._discard_stream
             )
-            return response.choices[0].message.content.strip()
+        
+        # The deadline covers the whole answer, so a stream that keeps dripping tokens cannot hold its slot forever
+        deadline = time.monotonic() + self.retry_policy.deadline
+        try:
+            stream, chunks, first, member, served_by = call_with_retry(attempt, self.retry_policy, self.breaker, self.pool.can_fail_over)
+        except Exception as e:
+            stale = self._stale_response(cache_key)
+            if stale is not None:
+                yield stale
+                return
+            raise _wrap_error(e)
+        
+        parts = []
+        try:
+            if first:
+                parts.append(first)
+                yield first
+            for content in chunks:
+                if time.monotonic() >= deadline:
+                    raise _deadline_error(self.retry_policy.deadline)
+                parts.append(content)
+                yield content
+        except UpstreamUnavailableError:
+            raise
         except Exception as e:
             raise Exception(f"API调用失败: {str(e)}")
+        finally:
+            self.limiter.release()
+            self.pool.release(member)
+            _close_stream(stream)
+        
+        # Only complete streams from the primary model are cached, so neither an
+        # interrupted answer nor a fallback model's answer is replayed under its key
+        if self.cache and served_by == route.model:
+            self.cache.set(cache_key, "".join(parts).strip())
+    
+    def _open_stream(self, model: str, messages: list, max_tokens: int, temperature: float, timeout: float):
+        """
+        Open a completion stream on the least busy pool member and wait for its first token.
+        
+        Returns:
+            (stream, remaining chunks, first chunk, pool member, model that served it)
+        """
+        member = self.pool.acquire()
+        started = time.monotonic()
+        stream = None
+        try:
+            stream = member.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+                timeout=timeout
+            )
+            chunks = _iter_content(stream)
+            # Retries are only safe until the first token has been passed on
+            first = next(chunks, None)
+        except BaseException as e:
+            if isinstance(e, Exception):
+                self.pool.record_failure(member, e)
+            self.pool.release(member)
+            if stream is not None:
+                _close_stream(stream)
+            raise
+        latency = time.monotonic() - started
+        self.pool.record_success(member, latency)
+        self.router.record_ttft(model, latency)
+        return stream, chunks, first, member, model
+    
+    def _discard_stream(self, opened) -> None:
+        """Close the stream of a losing hedge leg and free its slot and pool member."""
+        stream, _, _, member, _ = opened
+        _close_stream(stream)
+        self.pool.release(member)
+        self.limiter.release()
     
-    def generate_destination_recommendations(self, 
-                                           season: str, 
-                                           health_status: str, 
-                                           budget: str, 
+    def _stale_response(self, cache_key: str) -> Optional[str]:
+        """Return an expired cached answer to serve while the upstream is failing."""
+        if self.cache:
+            return self.cache.get(cache_key, allow_stale=True)
+        return None
+    
+    def generate_destination_recommendations(self,
+                                           season: str,
+                                           health_status: str,
+                                           budget: str,
                                            interests: str) -> str:
         """
         Generate destination recommendations based on user preferences.
@@ -84,38 +641,35 @@ class OpenAIClient:
         Returns:
             Generated destination recommendations
         """
-        try:
-            from ..config.config import DESTINATION_SYSTEM_PROMPT
-        except ImportError:
-            from config.config import DESTINATION_SYSTEM_PROMPT
-        
-        user_prompt = f"""
-请根据以下条件推荐适合银发族的国内旅行目的地：
-
-1. 季节：{season}
-2. 健康状况：{health_status}
-3. 预算范围：{budget}
-4. 兴趣偏好：{interests}
-
-请推荐3-5个目的地，并说明推荐理由，考虑以下因素：
-- 气候适宜性
-- 交通便利程度
-- 医疗条件
-- 住宿条件
-- 景点特色
-- 适合老年人的活动
-- 安全因素
-
-请用温暖、耐心的语气，像对待长辈一样详细说明每个推荐地的特点。
-"""
+        system_prompt, user_prompt = build_destination_prompts(season, health_status, budget, interests)
+        return self.generate_response(system_prompt, user_prompt, task="destination")
+    
+    def stream_destination_recommendations(self,
+                                         season: str,
+                                         health_status: str,
+                                         budget: str,
+                                         interests: str) -> Iterator[str]:
+        """
+        Stream destination recommendations based on user preferences.
         
-        return self.generate_response(DESTINATION_SYSTEM_PROMPT, user_prompt)
+        Args:
+            season: The travel season
+            health_status: User's health status
+            budget: Budget range
+            interests: Selected interests
+            
+        Yields:
+            Text chunks of the recommendations as they arrive
+        """
+        system_prompt, user_prompt = build_destination_prompts(season, health_status, budget, interests)
+        return self.generate_response_stream(system_prompt, user_prompt, task="destination")
     
-    def generate_itinerary_plan(self, 
-                              destination: str, 
-                              duration: str, 
-                              mobility: str, 
-                              health_focus: str) -> str:
+    def generate_itinerary_plan(self,
+                              destination: str,
+                              duration: str,
+                              mobility: str,
+                              health_focus: str,
+                              structured: bool = False) -> str:
         """
         Generate a detailed itinerary plan.
         
@@ -124,42 +678,156 @@ class OpenAIClient:
             duration: Trip duration
             mobility: Mobility status
             health_focus: Health concerns
+            structured: Ask for the JSON format read by data.itinerary.parse_trip
             
         Returns:
             Generated itinerary plan
         """
-        try:
-            from ..config.config import ITINERARY_SYSTEM_PROMPT
-        except ImportError:
-            from config.config import ITINERARY_SYSTEM_PROMPT
+        system_prompt, user_prompt = build_itinerary_prompts(destination, duration, mobility, health_focus, structured)
+        return self.generate_response(system_prompt, user_prompt, task="itinerary")
+    
+    def stream_itinerary_plan(self,
+                            destination: str,
+                            duration: str,
+                            mobility: str,
+                            health_focus: str) -> Iterator[str]:
+        """
+        Stream a detailed itinerary plan.
         
-        user_prompt = f"""
-请为银发族制定一份详细的旅行行程计划：
-
-1. 目的地：{destination}
-2. 旅行时长：{duration}
-3. 行动能力：{mobility}
-4. 健康关注点：{health_focus}
-
-请制定一份详细的行程计划，包括：
-- 每日具体安排（时间、地点、活动）
-- 交通方式和路线
-- 住宿推荐
-- 餐饮建议
-- 休息安排
-- 注意事项
-- 应急准备
-
-请特别考虑银发族的特点，安排充足的休息时间，避免过于紧凑的行程。
-请用温暖、关怀的语气，像为父母规划旅行一样细心周到。
-"""
+        Args:
+            destination: Travel destination
+            duration: Trip duration
+            mobility: Mobility status
+            health_focus: Health concerns
+            
+        Yields:
+            Text chunks of the itinerary plan as they arrive
+        """
+        system_prompt, user_prompt = build_itinerary_prompts(destination, duration, mobility, health_focus)
+        return self.generate_response_stream(system_prompt, user_prompt, task="itinerary")
+    
+    def generate_itinerary_outline(self,
+                                   destination: str,
+                                   duration: str,
+                                   mobility: str,
+                                   health_focus: str,
+                                   min_days: int,
+                                   max_days: int) -> str:
+        """
+        Generate the one-line-per-day outline of a long trip.
+        
+        Args:
+            destination: Travel destination
+            duration: Trip duration
+            mobility: Mobility status
+            health_focus: Health concerns
+            min_days: Fewest days the outline should plan
+            max_days: Most days the outline should plan
+            
+        Returns:
+            Outline text with one "第N天：..." line per day
+        """
+        system_prompt, user_prompt = build_itinerary_outline_prompts(
+            destination, duration, mobility, health_focus, min_days, max_days
+        )
+        return self.generate_response(
+            system_prompt, user_prompt, max_tokens=ITINERARY_OUTLINE_MAX_TOKENS, task="itinerary"
+        )
+    
+    def generate_itinerary_days(self,
+                                destination: str,
+                                duration: str,
+                                mobility: str,
+                                health_focus: str,
+                                outline: str,
+                                start_day: int,
+                                end_day: int) -> str:
+        """
+        Expand a block of days from a long trip's outline.
+        
+        Args:
+            destination: Travel destination
+            duration: Trip duration
+            mobility: Mobility status
+            health_focus: Health concerns
+            outline: The whole day-by-day outline, for continuity
+            start_day: First day of the block
+            end_day: Last day of the block
+            
+        Returns:
+            Detailed plan for the requested days
+        """
+        system_prompt, user_prompt = build_itinerary_days_prompts(
+            destination, duration, mobility, health_focus, outline, start_day, end_day
+        )
+        return self.generate_response(
+            system_prompt, user_prompt, max_tokens=ITINERARY_BLOCK_MAX_TOKENS, task="itinerary"
+        )
+    
+    def generate_itinerary_notes(self,
+                                 destination: str,
+                                 duration: str,
+                                 mobility: str,
+                                 health_focus: str,
+                                 outline: str) -> str:
+        """
+        Generate the precautions and emergency preparations for a long trip.
+        
+        Args:
+            destination: Travel destination
+            duration: Trip duration
+            mobility: Mobility status
+            health_focus: Health concerns
+            outline: The whole day-by-day outline
+            
+        Returns:
+            Notes covering the whole trip
+        """
+        system_prompt, user_prompt = build_itinerary_notes_prompts(
+            destination, duration, mobility, health_focus, outline
+        )
+        return self.generate_response(
+            system_prompt, user_prompt, max_tokens=ITINERARY_BLOCK_MAX_TOKENS, task="itinerary"
+        )
+    
+    def stream_itinerary_day(self,
+                             destination: str,
+                             duration: str,
+                             mobility: str,
+                             health_focus: str,
+                             day: int,
+                             current_plan: str,
+                             previous_day: str = "",
+                             next_day: str = "",
+                             change_request: str = "") -> Iterator[str]:
+        """
+        Stream a replacement for one day of an itinerary.
         
-        return self.generate_response(ITINERARY_SYSTEM_PROMPT, user_prompt)
+        Args:
+            destination: Travel destination
+            duration: Trip duration
+            mobility: Mobility status
+            health_focus: Health concerns
+            day: Day number to regenerate
+            current_plan: The day's current plan
+            previous_day: One-line summary of the day before, including its heading
+            next_day: One-line summary of the day after, including its heading
+            change_request: What the user wants changed
+            
+        Yields:
+            Text chunks of the new day plan as they arrive
+        """
+        system_prompt, user_prompt = build_itinerary_day_prompts(
+            destination, duration, mobility, health_focus, day, current_plan, previous_day, next_day, change_request
+        )
+        return self.generate_response_stream(
+            system_prompt, user_prompt, max_tokens=ITINERARY_DAY_MAX_TOKENS, task="itinerary"
+        )
     
-    def generate_checklist(self, 
-                          origin: str, 
-                          destination: str, 
-                          duration: str, 
+    def generate_checklist(self,
+                          origin: str,
+                          destination: str,
+                          duration: str,
                           special_needs: str,
                           itinerary_text: str = "") -> str:
         """
@@ -175,57 +843,497 @@ class OpenAIClient:
         Returns:
             Generated travel checklist
         """
-        try:
-            from ..config.config import CHECKLIST_SYSTEM_PROMPT
-        except ImportError:
-            from config.config import CHECKLIST_SYSTEM_PROMPT
+        system_prompt, user_prompt = build_checklist_prompts(
+            origin, destination, duration, special_needs, itinerary_text
+        )
+        return self.generate_response(system_prompt, user_prompt, task="checklist")
+    
+    def generate_checklist_group(self,
+                                 origin: str,
+                                 destination: str,
+                                 duration: str,
+                                 special_needs: str,
+                                 fields: List[str],
+                                 itinerary_text: str = "") -> str:
+        """
+        Generate one group of checklist categories with a small token budget.
         
-        itinerary_context = f"\n参考行程：{itinerary_text}" if itinerary_text else ""
+        Args:
+            origin: Departure location
+            destination: Travel destination
+            duration: Trip duration
+            special_needs: Special requirements
+            fields: Checklist fields to generate, e.g. ["documents", "financial"]
+            itinerary_text: Optional itinerary text for context
+            
+        Returns:
+            Generated JSON text for the requested fields
+        """
+        system_prompt, user_prompt = build_checklist_group_prompts(
+            origin, destination, duration, special_needs, fields, itinerary_text
+        )
+        return self.generate_response(
+            system_prompt, user_prompt, max_tokens=CHECKLIST_GROUP_MAX_TOKENS, task="checklist"
+        )
+    
+    def stream_checklist(self,
+                        origin: str,
+                        destination: str,
+                        duration: str,
+                        special_needs: str,
+                        itinerary_text: str = "") -> Iterator[str]:
+        """
+        Stream a comprehensive travel checklist as JSON text.
         
-        user_prompt = f"""
-请为银发族生成一份详细的旅行清单：
-
-1. 出发地：{origin}
-2. 目的地：{destination}
-3. 旅行时长：{duration}
-4. 特殊需求：{special_needs}
-{itinerary_context}
-
-请生成一份详细的旅行清单，包括：
-- 证件类（身份证、医保卡、老年证等）
-- 衣物类（根据季节和目的地气候）
-- 药品类（常用药品、应急药品）
-- 生活用品类
-- 电子设备类
-- 财务准备
-- 安全用品
-- 娱乐用品
-- 特殊用品（根据健康状况）
+        Args:
+            origin: Departure location
+            destination: Travel destination
+            duration: Trip duration
+            special_needs: Special requirements
+            itinerary_text: Optional itinerary text for context
+            
+        Yields:
+            Text chunks of the checklist JSON as they arrive
+        """
+        system_prompt, user_prompt = build_checklist_prompts(
+            origin, destination, duration, special_needs, itinerary_text
+        )
+        return self.generate_response_stream(system_prompt, user_prompt, task="checklist")
 
-请用JSON格式返回，包含以下字段：
-- documents: 证件类清单
-- clothing: 衣物类清单
-- medications: 药品类清单
-- daily_items: 生活用品清单
-- electronics: 电子设备清单
-- financial: 财务准备清单
-- safety: 安全用品清单
-- entertainment: 娱乐用品清单
-- special_items: 特殊用品清单
-- tips: 温馨提示列表
 
-请用温暖、细致的语气，像为父母准备行李一样周到贴心。
-"""
+class AsyncOpenAIClient:
+    """Asyncio OpenAI API client; waiting on the model does not hold a worker thread."""
+    
+    def __init__(self):
+        """Initialize the async OpenAI client with configuration."""
+        self.pool = None
+        self.cache = get_response_cache()
+        self.flights = AsyncSingleFlight()
+        self.limiter = AsyncConcurrencyLimiter()
+        self.retry_policy = RetryPolicy()
+        self.breaker = CircuitBreaker()
+        self.hedging = HedgingPolicy()
+        self.router = ModelRouter()
+        self._initialize_client()
+    
+    def _initialize_client(self):
+        """Initialize one AsyncOpenAI client per configured endpoint and key."""
+        endpoints = parse_endpoints(API_POOL, API_KEYS, API_BASE, API_KEY)
+        if not endpoints:
+            raise ValueError("API密钥未设置。请在.env文件中设置MODEL_API_KEY")
         
-        return self.generate_response(CHECKLIST_SYSTEM_PROMPT, user_prompt)
+        # Retries are handled by call_with_retry, so the SDK's own retries are disabled
+        self.pool = EndpointPool(
+            endpoints,
+            lambda base_url, api_key: openai.AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        )
+    
+    async def generate_response(self,
+                                system_prompt: str,
+                                user_prompt: str,
+                                max_tokens: Optional[int] = None,
+                                temperature: Optional[float] = None,
+                                task: Optional[str] = None) -> str:
+        """
+        Generate a response using the async OpenAI API.
+        
+        Args:
+            system_prompt: The system prompt to guide the AI behavior
+            user_prompt: The user's input prompt
+            max_tokens: Maximum tokens for the response (overrides default)
+            temperature: Temperature for response generation (overrides default)
+            task: Task name selecting the model and defaults, e.g. "itinerary"
+            
+        Returns:
+            The generated response text
+            
+        Raises:
+            Exception: If API call fails
+        """
+        route = self.router.route(task)
+        max_tokens = max_tokens or route.max_tokens
+        temperature = route.temperature if temperature is None else temperature
+        cache_key = make_cache_key(route.model, system_prompt, user_prompt, max_tokens, temperature)
+        session_id = get_current_session()
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        # Identical concurrent requests await the first one instead of calling upstream again
+        return await self.flights.do(
+            cache_key,
+            lambda: self._create_response(system_prompt, user_prompt, route, max_tokens, temperature, cache_key, session_id)
+        )
+    
+    async def _create_response(self, 
+                               system_prompt: str, 
+                               user_prompt: str, 
+                               route: TaskRoute,
+                               max_tokens: int,
+                               temperature: float,
+                               cache_key: str,
+                               session_id: str) -> str:
+        """Call the routed model with retries and store the result in the cache."""
+        messages = _build_messages(system_prompt, user_prompt)
+        model = self.router.choose_model(route)
+        
+        async def attempt(timeout: float) -> str:
+            async with self.limiter.slot(session_id):
+                member = self.pool.acquire()
+                started = time.monotonic()
+                try:
+                    response = await member.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=temperature,
+                        timeout=timeout
+                    )
+                except Exception as e:
+                    self.pool.record_failure(member, e)
+                    raise
+                finally:
+                    self.pool.release(member)
+                self.pool.record_success(member, time.monotonic() - started)
+            return response.choices[0].message.content.strip()
+        
+        try:
+            result = await async_call_with_retry(attempt, self.retry_policy, self.breaker, self.pool.can_fail_over)
+        except Exception as e:
+            stale = self._stale_response(cache_key)
+            if stale is not None:
+                return stale
+            raise _wrap_error(e)
+        
+        # The key names the primary model, so a fallback model's answer is not stored under it
+        if self.cache and model == route.model:
+            self.cache.set(cache_key, result)
+        return result
+    
+    async def generate_response_stream(self,
+                                       system_prompt: str,
+                                       user_prompt: str,
+                                       max_tokens: Optional[int] = None,
+                                       temperature: Optional[float] = None,
+                                       task: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Generate a response using the async OpenAI API in streaming mode.
+        
+        Args:
+            system_prompt: The system prompt to guide the AI behavior
+            user_prompt: The user's input prompt
+            max_tokens: Maximum tokens for the response (overrides default)
+            temperature: Temperature for response generation (overrides default)
+            task: Task name selecting the model and defaults, e.g. "itinerary"
+            
+        Yields:
+            Text chunks as they arrive from the model
+            
+        Raises:
+            Exception: If API call fails
+        """
+        route = self.router.route(task)
+        max_tokens = max_tokens or route.max_tokens
+        temperature = route.temperature if temperature is None else temperature
+        cache_key = make_cache_key(route.model, system_prompt, user_prompt, max_tokens, temperature)
+        session_id = get_current_session()
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+        
+        # Identical concurrent streams share one upstream generation, chunks included
+        async for chunk in self.flights.stream(
+            cache_key,
+            lambda: self._create_stream(system_prompt, user_prompt, route, max_tokens, temperature, cache_key, session_id)
+        ):
+            yield chunk
+    
+    async def _create_stream(self, 
+                             system_prompt: str, 
+                             user_prompt: str, 
+                             route: TaskRoute,
+                             max_tokens: int,
+                             temperature: float,
+                             cache_key: str,
+                             session_id: str) -> AsyncIterator[str]:
+        """Stream the routed model with retries and store the complete text in the cache."""
+        messages = _build_messages(system_prompt, user_prompt)
+        model = self.router.choose_model(route)
+        
+        async def attempt(timeout: float):
+            # Each opened stream holds a slot until it ends; a failed leg gives its slot back
+            async def open_leg(leg_model: str):
+                try:
+                    return await self._open_stream(leg_model, messages, max_tokens, temperature, timeout)
+                except BaseException:
+                    self.limiter.release()
+                    raise
+            
+            async def open_model():
+                await self.limiter.acquire(session_id)
+                if not self.hedging.enabled:
+                    return await open_leg(model)
+                # The primary's member already counts as busy, so the hedge goes to another one when there is one
+                return await async_run_hedged(
+                    lambda: open_leg(model), lambda: open_leg(model),
+                    self.hedging, self.limiter.try_acquire, self._discard_stream
+                )
+            
+            if model != route.model or not route.fallback_model or not route.ttft_slo:
+                return await open_model()
+            # The faster model joins the race once the primary misses its first-token deadline
+            return await async_run_hedged(
+                open_model, lambda: open_leg(route.fallback_model),
+                self.router.deadline_policy(route, model), self.limiter.try_acquire, self._discard_stream
+            )
+        
+        # The deadline covers the whole answer, so a stream that keeps dripping tokens cannot hold its slot forever
+        deadline = time.monotonic() + self.retry_policy.deadline
+        try:
+            stream, chunks, first, member, served_by = await async_call_with_retry(attempt, self.retry_policy, self.breaker, self.pool.can_fail_over)
+        except Exception as e:
+            stale = self._stale_response(cache_key)
+            if stale is not None:
+                yield stale
+                return
+            raise _wrap_error(e)
+        
+        parts = []
+        try:
+            if first:
+                parts.append(first)
+                yield first
+            while True:
+                try:
+                    content = await asyncio.wait_for(chunks.__anext__(), deadline - time.monotonic())
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    raise _deadline_error(self.retry_policy.deadline)
+                parts.append(content)
+                yield content
+        except UpstreamUnavailableError:
+            raise
+        except Exception as e:
+            raise Exception(f"API调用失败: {str(e)}")
+        finally:
+            self.limiter.release()
+            self.pool.release(member)
+            await _aclose_stream(stream)
+        
+        # Only complete streams from the primary model are cached, so neither an
+        # interrupted answer nor a fallback model's answer is replayed under its key
+        if self.cache and served_by == route.model:
+            self.cache.set(cache_key, "".join(parts).strip())
+    
+    async def _open_stream(self, model: str, messages: list, max_tokens: int, temperature: float, timeout: float):
+        """
+        Open a completion stream on the least busy pool member and wait for its first token.
+        
+        Returns:
+            (stream, remaining chunks, first chunk, pool member, model that served it)
+        """
+        member = self.pool.acquire()
+        started = time.monotonic()
+        stream = None
+        try:
+            stream = await member.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True,
+                timeout=timeout
+            )
+            chunks = _aiter_content(stream)
+            # Retries are only safe until the first token has been passed on
+            try:
+                first = await chunks.__anext__()
+            except StopAsyncIteration:
+                first = None
+        except BaseException as e:
+            if isinstance(e, Exception):
+                self.pool.record_failure(member, e)
+            self.pool.release(member)
+            if stream is not None:
+                await _aclose_stream(stream)
+            raise
+        latency = time.monotonic() - started
+        self.pool.record_success(member, latency)
+        self.router.record_ttft(model, latency)
+        return stream, chunks, first, member, model
+    
+    async def _discard_stream(self, opened) -> None:
+        """Close the stream of a losing hedge leg and free its slot and pool member."""
+        stream, _, _, member, _ = opened
+        self.limiter.release()
+        self.pool.release(member)
+        await _aclose_stream(stream)
+    
+    def _stale_response(self, cache_key: str) -> Optional[str]:
+        """Return an expired cached answer to serve while the upstream is failing."""
+        if self.cache:
+            return self.cache.get(cache_key, allow_stale=True)
+        return None
+    
+    async def generate_destination_recommendations(self,
+                                                   season: str,
+                                                   health_status: str,
+                                                   budget: str,
+                                                   interests: str) -> str:
+        """Generate destination recommendations; see OpenAIClient.generate_destination_recommendations."""
+        system_prompt, user_prompt = build_destination_prompts(season, health_status, budget, interests)
+        return await self.generate_response(system_prompt, user_prompt, task="destination")
+    
+    def stream_destination_recommendations(self,
+                                           season: str,
+                                           health_status: str,
+                                           budget: str,
+                                           interests: str) -> AsyncIterator[str]:
+        """Stream destination recommendations; see OpenAIClient.stream_destination_recommendations."""
+        system_prompt, user_prompt = build_destination_prompts(season, health_status, budget, interests)
+        return self.generate_response_stream(system_prompt, user_prompt, task="destination")
+    
+    async def generate_itinerary_plan(self,
+                                      destination: str,
+                                      duration: str,
+                                      mobility: str,
+                                      health_focus: str,
+                                      structured: bool = False) -> str:
+        """Generate an itinerary plan; see OpenAIClient.generate_itinerary_plan."""
+        system_prompt, user_prompt = build_itinerary_prompts(destination, duration, mobility, health_focus, structured)
+        return await self.generate_response(system_prompt, user_prompt, task="itinerary")
+    
+    def stream_itinerary_plan(self,
+                              destination: str,
+                              duration: str,
+                              mobility: str,
+                              health_focus: str) -> AsyncIterator[str]:
+        """Stream an itinerary plan; see OpenAIClient.stream_itinerary_plan."""
+        system_prompt, user_prompt = build_itinerary_prompts(destination, duration, mobility, health_focus)
+        return self.generate_response_stream(system_prompt, user_prompt, task="itinerary")
+    
+    async def generate_itinerary_outline(self,
+                                         destination: str,
+                                         duration: str,
+                                         mobility: str,
+                                         health_focus: str,
+                                         min_days: int,
+                                         max_days: int) -> str:
+        """Generate a long trip's outline; see OpenAIClient.generate_itinerary_outline."""
+        system_prompt, user_prompt = build_itinerary_outline_prompts(
+            destination, duration, mobility, health_focus, min_days, max_days
+        )
+        return await self.generate_response(
+            system_prompt, user_prompt, max_tokens=ITINERARY_OUTLINE_MAX_TOKENS, task="itinerary"
+        )
+    
+    async def generate_itinerary_days(self,
+                                      destination: str,
+                                      duration: str,
+                                      mobility: str,
+                                      health_focus: str,
+                                      outline: str,
+                                      start_day: int,
+                                      end_day: int) -> str:
+        """Expand a block of days; see OpenAIClient.generate_itinerary_days."""
+        system_prompt, user_prompt = build_itinerary_days_prompts(
+            destination, duration, mobility, health_focus, outline, start_day, end_day
+        )
+        return await self.generate_response(
+            system_prompt, user_prompt, max_tokens=ITINERARY_BLOCK_MAX_TOKENS, task="itinerary"
+        )
+    
+    async def generate_itinerary_notes(self,
+                                       destination: str,
+                                       duration: str,
+                                       mobility: str,
+                                       health_focus: str,
+                                       outline: str) -> str:
+        """Generate a long trip's notes; see OpenAIClient.generate_itinerary_notes."""
+        system_prompt, user_prompt = build_itinerary_notes_prompts(
+            destination, duration, mobility, health_focus, outline
+        )
+        return await self.generate_response(
+            system_prompt, user_prompt, max_tokens=ITINERARY_BLOCK_MAX_TOKENS, task="itinerary"
+        )
+    
+    def stream_itinerary_day(self,
+                             destination: str,
+                             duration: str,
+                             mobility: str,
+                             health_focus: str,
+                             day: int,
+                             current_plan: str,
+                             previous_day: str = "",
+                             next_day: str = "",
+                             change_request: str = "") -> AsyncIterator[str]:
+        """Stream a replacement for one itinerary day; see OpenAIClient.stream_itinerary_day."""
+        system_prompt, user_prompt = build_itinerary_day_prompts(
+            destination, duration, mobility, health_focus, day, current_plan, previous_day, next_day, change_request
+        )
+        return self.generate_response_stream(
+            system_prompt, user_prompt, max_tokens=ITINERARY_DAY_MAX_TOKENS, task="itinerary"
+        )
+    
+    async def generate_checklist(self,
+                                 origin: str,
+                                 destination: str,
+                                 duration: str,
+                                 special_needs: str,
+                                 itinerary_text: str = "") -> str:
+        """Generate a travel checklist; see OpenAIClient.generate_checklist."""
+        system_prompt, user_prompt = build_checklist_prompts(
+            origin, destination, duration, special_needs, itinerary_text
+        )
+        return await self.generate_response(system_prompt, user_prompt, task="checklist")
+    
+    async def generate_checklist_group(self,
+                                       origin: str,
+                                       destination: str,
+                                       duration: str,
+                                       special_needs: str,
+                                       fields: List[str],
+                                       itinerary_text: str = "") -> str:
+        """Generate one group of checklist categories; see OpenAIClient.generate_checklist_group."""
+        system_prompt, user_prompt = build_checklist_group_prompts(
+            origin, destination, duration, special_needs, fields, itinerary_text
+        )
+        return await self.generate_response(
+            system_prompt, user_prompt, max_tokens=CHECKLIST_GROUP_MAX_TOKENS, task="checklist"
+        )
+    
+    def stream_checklist(self,
+                         origin: str,
+                         destination: str,
+                         duration: str,
+                         special_needs: str,
+                         itinerary_text: str = "") -> AsyncIterator[str]:
+        """Stream a travel checklist as JSON text; see OpenAIClient.stream_checklist."""
+        system_prompt, user_prompt = build_checklist_prompts(
+            origin, destination, duration, special_needs, itinerary_text
+        )
+        return self.generate_response_stream(system_prompt, user_prompt, task="checklist")
 
 
-# Global client instance
+# Global client instances
 _client_instance = None
+_async_client_instance = None
 
 def get_client() -> OpenAIClient:
     """Get the global OpenAI client instance."""
     global _client_instance
     if _client_instance is None:
         _client_instance = OpenAIClient()
-    return _client_instance
\ No newline at end of file
+    return _client_instance
+
+
+def get_async_client() -> AsyncOpenAIClient:
+    """Get the global async OpenAI client instance."""
+    global _async_client_instance
+    if _async_client_instance is None:
+        _async_client_instance = AsyncOpenAIClient()
+    return _async_client_instance
@@ -0,0 +1,208 @@
+"""
+Endpoint pool module for the travel assistant application.
+Balances model calls across API endpoints and keys, ejecting unhealthy members.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List
+try:
+    from ..config.config import POOL_EJECT_FAILURES, POOL_EJECT_SECONDS
+    from .resilience import is_retryable, retry_after_seconds
+except ImportError:
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config.config import POOL_EJECT_FAILURES, POOL_EJECT_SECONDS
+    from api.resilience import is_retryable, retry_after_seconds
+
+# Status codes meaning this member's key is unusable, not that the request is bad
+MEMBER_FAULT_STATUS_CODES = {401, 403}
+
+
+class PoolMember:
+    """One endpoint and key pair with its load and health bookkeeping."""
+    
+    def __init__(self, base_url: str, api_key: str, client: Any):
+        """
+        Initialize a pool member.
+        
+        Args:
+            base_url: API base URL
+            api_key: API key for this member
+            client: SDK client bound to base_url and api_key
+        """
+        self.base_url = base_url
+        self.client = client
+        # Never keep the full key in names that end up in logs or metrics
+        self.name = f"{base_url}#{api_key[-4:]}"
+        self.outstanding = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.latencies: Deque[float] = deque(maxlen=500)
+
+
+class EndpointPool:
+    """Least-outstanding-requests balancer over endpoint and key pairs."""
+    
+    def __init__(self,
+                 endpoints: List[Dict[str, str]],
+                 client_factory: Callable[[str, str], Any],
+                 eject_failures: int = POOL_EJECT_FAILURES,
+                 eject_seconds: float = POOL_EJECT_SECONDS):
+        """
+        Initialize the pool.
+        
+        Args:
+            endpoints: List of {"base_url": ..., "api_key": ...} entries
+            client_factory: Builds an SDK client from a base URL and key
+            eject_failures: Consecutive failures that take a member out
+            eject_seconds: Seconds an ejected member stays out before it is probed again
+        """
+        self.members = [
+            PoolMember(e["base_url"], e["api_key"], client_factory(e["base_url"], e["api_key"]))
+            for e in endpoints
+        ]
+        self.eject_failures = eject_failures
+        self.eject_seconds = eject_seconds
+        self._next = 0
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> PoolMember:
+        """
+        Pick the healthy member with the fewest outstanding requests.
+        
+        Ties rotate so idle members share the load. If every member is
+        ejected, the one due back soonest is used rather than failing.
+        
+        Returns:
+            The chosen member, counted as outstanding until release()
+        """
+        with self._lock:
+            now = time.monotonic()
+            count = len(self.members)
+            rotated = [self.members[(self._next + i) % count] for i in range(count)]
+            self._next = (self._next + 1) % count
+            
+            healthy = [m for m in rotated if m.ejected_until <= now]
+            if healthy:
+                member = min(healthy, key=lambda m: m.outstanding)
+            else:
+                member = min(rotated, key=lambda m: m.ejected_until)
+            member.outstanding += 1
+            member.requests += 1
+            return member
+    
+    def release(self, member: PoolMember) -> None:
+        """Stop counting a request against the member."""
+        with self._lock:
+            member.outstanding -= 1
+    
+    def record_success(self, member: PoolMember, latency: float) -> None:
+        """
+        Record a healthy response.
+        
+        Args:
+            member: Member that served the request
+            latency: Seconds to the full response, or to the first token when streaming
+        """
+        with self._lock:
+            member.consecutive_failures = 0
+            member.ejected_until = 0.0
+            member.latencies.append(latency)
+    
+    def record_failure(self, member: PoolMember, error: BaseException) -> None:
+        """
+        Record a failed request, ejecting the member when it looks unhealthy.
+        
+        Rate limits with a Retry-After eject the member for that long, and
+        a rejected key (401/403) ejects it at once; other upstream faults
+        eject it after eject_failures in a row. Errors caused by the request
+        itself do not count against the member.
+        
+        Args:
+            member: Member that served the request
+            error: The raised exception
+        """
+        status_code = getattr(error, "status_code", None)
+        if not is_retryable(error) and status_code not in MEMBER_FAULT_STATUS_CODES:
+            return
+        with self._lock:
+            now = time.monotonic()
+            member.errors += 1
+            member.consecutive_failures += 1
+            retry_after = retry_after_seconds(error) if status_code == 429 else None
+            if retry_after:
+                member.ejected_until = max(member.ejected_until, now + retry_after)
+            elif status_code in MEMBER_FAULT_STATUS_CODES or member.consecutive_failures >= self.eject_failures:
+                member.ejected_until = now + self.eject_seconds
+    
+    def can_fail_over(self, error: BaseException) -> bool:
+        """
+        Decide whether a call that failed on one member should move to another.
+        
+        Args:
+            error: The raised exception, already passed to record_failure
+            
+        Returns:
+            True when the error was a rejected key and a healthy member is left
+        """
+        if getattr(error, "status_code", None) not in MEMBER_FAULT_STATUS_CODES:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            return any(member.ejected_until <= now for member in self.members)
+    
+    def metrics(self) -> List[Dict[str, Any]]:
+        """
+        Get per-member metrics.
+        
+        Returns:
+            One dictionary per member with load, error counts, health and latency statistics
+        """
+        with self._lock:
+            now = time.monotonic()
+            result = []
+            for member in self.members:
+                samples = sorted(member.latencies)
+                result.append({
+                    "member": member.name,
+                    "outstanding": member.outstanding,
+                    "requests": member.requests,
+                    "errors": member.errors,
+                    "healthy": member.ejected_until <= now,
+                    "latency_avg_seconds": sum(samples) / len(samples) if samples else 0.0,
+                    "latency_p95_seconds": samples[int(len(samples) * 0.95) - 1] if samples else 0.0,
+                })
+            return result
+
+
+def parse_endpoints(pool_spec: str, keys_spec: str, default_base: str, default_key: str) -> List[Dict[str, str]]:
+    """
+    Build the endpoint list from configuration strings.
+    
+    Args:
+        pool_spec: Comma-separated "base_url|api_key" pairs; wins when set
+        keys_spec: Comma-separated API keys sharing default_base
+        default_base: API base URL used for plain keys
+        default_key: Single API key used when neither list is set
+        
+    Returns:
+        List of {"base_url": ..., "api_key": ...} entries
+    """
+    endpoints = []
+    for entry in pool_spec.split(","):
+        if "|" in entry:
+            base_url, api_key = entry.split("|", 1)
+            if base_url.strip() and api_key.strip():
+                endpoints.append({"base_url": base_url.strip(), "api_key": api_key.strip()})
+    if endpoints:
+        return endpoints
+    
+    keys = [key.strip() for key in keys_spec.split(",") if key.strip()]
+    if not keys and default_key:
+        keys = [default_key]
+    return [{"base_url": default_base, "api_key": key} for key in keys]
@@ -0,0 +1,279 @@
+"""
+Resilience module for the travel assistant application.
+Provides retry with jittered backoff, per-call deadlines and a circuit breaker.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional
+
+import openai
+try:
+    from ..config.config import (
+        UPSTREAM_MAX_RETRIES, UPSTREAM_RETRY_BASE_DELAY, UPSTREAM_RETRY_MAX_DELAY,
+        UPSTREAM_DEADLINE, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RECOVERY_TIMEOUT
+    )
+except ImportError:
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config.config import (
+        UPSTREAM_MAX_RETRIES, UPSTREAM_RETRY_BASE_DELAY, UPSTREAM_RETRY_MAX_DELAY,
+        UPSTREAM_DEADLINE, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RECOVERY_TIMEOUT
+    )
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class UpstreamUnavailableError(Exception):
+    """Raised when the upstream model is unhealthy or the call deadline has passed."""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Decide whether an upstream error is worth retrying.
+    
+    Args:
+        error: Exception raised by the OpenAI SDK
+        
+    Returns:
+        True for timeouts, connection errors, 429 and 5xx responses
+    """
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code in RETRYABLE_STATUS_CODES or (status_code or 0) >= 500
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Read the server's requested delay from a Retry-After header.
+    
+    Args:
+        error: Exception raised by the OpenAI SDK
+        
+    Returns:
+        Delay in seconds, or None if the server did not ask for one
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+    
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Jittered exponential backoff bounded by a per-call deadline."""
+    
+    def __init__(self,
+                 max_retries: int = UPSTREAM_MAX_RETRIES,
+                 base_delay: float = UPSTREAM_RETRY_BASE_DELAY,
+                 max_delay: float = UPSTREAM_RETRY_MAX_DELAY,
+                 deadline: float = UPSTREAM_DEADLINE):
+        """
+        Initialize the retry policy.
+        
+        Args:
+            max_retries: Retries after the first attempt
+            base_delay: Backoff for the first retry in seconds
+            max_delay: Upper bound for a single backoff
+            deadline: Total seconds one call may take, retries included
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+    
+    def backoff(self, retry: int, error: BaseException) -> float:
+        """
+        Delay before the given retry.
+        
+        Args:
+            retry: 1-based retry number
+            error: The error that triggered the retry
+            
+        Returns:
+            Seconds to wait; Retry-After wins over the computed backoff
+        """
+        requested = retry_after_seconds(error)
+        if requested is not None:
+            return requested
+        # Full jitter keeps retrying clients from synchronizing
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (retry - 1))))
+
+
+class CircuitBreaker:
+    """Opens after consecutive upstream failures and fails fast until the recovery timeout."""
+    
+    def __init__(self,
+                 failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 recovery_timeout: float = CIRCUIT_RECOVERY_TIMEOUT):
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open before letting calls probe again
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open."""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return "half_open"
+            return "open"
+    
+    def allow(self) -> bool:
+        """Return True if a call may go upstream."""
+        return self.state != "open"
+    
+    def record_success(self) -> None:
+        """Close the circuit after a healthy upstream response."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+    
+    def record_failure(self) -> None:
+        """Count a failure, opening (or re-opening) the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+def _open_circuit_error() -> UpstreamUnavailableError:
+    return UpstreamUnavailableError("模型服务暂时不可用，请稍后再试")
+
+
+def _deadline_error(deadline: float) -> UpstreamUnavailableError:
+    return UpstreamUnavailableError(f"模型服务响应超时（超过{deadline:g}秒），请稍后再试")
+
+
+def call_with_retry(attempt: Callable[[float], Any],
+                    policy: RetryPolicy,
+                    breaker: CircuitBreaker,
+                    fail_over: Optional[Callable[[BaseException], bool]] = None) -> Any:
+    """
+    Run one upstream call with retries, a deadline and circuit breaking.
+    
+    Args:
+        attempt: Performs one try; receives the seconds left before the deadline
+        policy: Retry policy
+        breaker: Circuit breaker guarding the upstream
+        fail_over: Returns True for an error that only affects the endpoint
+            that raised it, e.g. EndpointPool.can_fail_over; such errors are
+            retried at once without counting against the circuit
+            
+    Returns:
+        The result of the first successful attempt
+        
+    Raises:
+        UpstreamUnavailableError: If the circuit is open or the deadline passes
+        Exception: The last upstream error once retries are exhausted
+    """
+    deadline = time.monotonic() + policy.deadline
+    retry = 0
+    while True:
+        if not breaker.allow():
+            raise _open_circuit_error()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise _deadline_error(policy.deadline)
+        
+        try:
+            result = attempt(remaining)
+        except Exception as e:
+            if fail_over is not None and retry < policy.max_retries and fail_over(e):
+                # Another endpoint can serve the call; the upstream as a whole is fine
+                retry += 1
+                continue
+            if not is_retryable(e):
+                raise
+            breaker.record_failure()
+            retry += 1
+            delay = policy.backoff(retry, e)
+            if retry > policy.max_retries or time.monotonic() + delay >= deadline:
+                raise
+            time.sleep(delay)
+            continue
+        
+        breaker.record_success()
+        return result
+
+
+async def async_call_with_retry(attempt: Callable[[float], Awaitable[Any]],
+                                policy: RetryPolicy,
+                                breaker: CircuitBreaker,
+                                fail_over: Optional[Callable[[BaseException], bool]] = None) -> Any:
+    """
+    Async counterpart of call_with_retry.
+    
+    Args:
+        attempt: Coroutine function performing one try; receives the seconds left
+        policy: Retry policy
+        breaker: Circuit breaker guarding the upstream
+        fail_over: Returns True for an error that only affects the endpoint that raised it
+        
+    Returns:
+        The result of the first successful attempt
+    """
+    deadline = time.monotonic() + policy.deadline
+    retry = 0
+    while True:
+        if not breaker.allow():
+            raise _open_circuit_error()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise _deadline_error(policy.deadline)
+        
+        try:
+            result = await asyncio.wait_for(attempt(remaining), remaining)
+        except asyncio.TimeoutError:
+            breaker.record_failure()
+            raise _deadline_error(policy.deadline)
+        except Exception as e:
+            if fail_over is not None and retry < policy.max_retries and fail_over(e):
+                # Another endpoint can serve the call; the upstream as a whole is fine
+                retry += 1
+                continue
+            if not is_retryable(e):
+                raise
+            breaker.record_failure()
+            retry += 1
+            delay = policy.backoff(retry, e)
+            if retry > policy.max_retries or time.monotonic() + delay >= deadline:
+                raise
+            await asyncio.sleep(delay)
+            continue
+        
+        breaker.record_success()
+        return result
@@ -0,0 +1,192 @@
+"""
+Model routing module for the travel assistant application.
+Picks the model, token budget and temperature per task and falls back to a faster model on slow starts.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+try:
+    from ..config.config import MODEL_NAME, MAX_TOKENS, TEMPERATURE, TASK_MODELS, ROUTER_PROBE_INTERVAL
+except ImportError:
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config.config import MODEL_NAME, MAX_TOKENS, TEMPERATURE, TASK_MODELS, ROUTER_PROBE_INTERVAL
+
+# Samples needed before a model's observed latency affects routing
+MIN_ROUTING_SAMPLES = 5
+# Recent samples kept per model; short so a recovered primary is trusted again quickly
+TTFT_WINDOW = 10
+
+
+class TaskRoute:
+    """Model settings for one task."""
+    
+    __slots__ = ("task", "model", "max_tokens", "temperature", "fallback_model", "ttft_slo")
+    
+    def __init__(self,
+                 task: str,
+                 model: str = MODEL_NAME,
+                 max_tokens: int = MAX_TOKENS,
+                 temperature: float = TEMPERATURE,
+                 fallback_model: Optional[str] = None,
+                 ttft_slo: Optional[float] = None):
+        """
+        Initialize a task route.
+        
+        Args:
+            task: Task name, e.g. "destination"
+            model: Primary model
+            max_tokens: Default max_tokens for the task
+            temperature: Default temperature for the task
+            fallback_model: Faster model used when the primary misses its SLO
+            ttft_slo: Time-to-first-token objective for the primary in seconds
+        """
+        self.task = task
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.fallback_model = fallback_model if fallback_model != model else None
+        self.ttft_slo = ttft_slo
+
+
+class ModelRouter:
+    """Routes tasks to models using each model's observed time to first token."""
+    
+    def __init__(self, task_models: Dict[str, Dict[str, Any]] = TASK_MODELS,
+                 probe_interval: int = ROUTER_PROBE_INTERVAL):
+        """
+        Initialize the router.
+        
+        Args:
+            task_models: Per-task settings keyed by task name
+            probe_interval: While a primary is over its SLO, every Nth request still tries it
+        """
+        self.routes = {task: TaskRoute(task, **settings) for task, settings in task_models.items()}
+        self.default_route = TaskRoute("default")
+        self.probe_interval = probe_interval
+        self._ttft: Dict[str, Deque[float]] = {}
+        self._misses: Dict[str, int] = {}
+        self._routed: Dict[str, int] = {}
+        self._degraded_requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def route(self, task: Optional[str]) -> TaskRoute:
+        """Return the settings for a task, or the global defaults for unknown tasks."""
+        return self.routes.get(task, self.default_route)
+    
+    def choose_model(self, route: TaskRoute) -> str:
+        """
+        Pick the model for one request.
+        
+        The primary is used while its P95 time to first token meets the SLO.
+        Otherwise requests go to the fallback, except for periodic probes
+        that let the primary prove it has recovered.
+        
+        Args:
+            route: Task route
+            
+        Returns:
+            Model name to call
+        """
+        model = route.model
+        if route.fallback_model and route.ttft_slo and self._ttft_p95(route.model) > route.ttft_slo:
+            with self._lock:
+                count = self._degraded_requests.get(route.task, 0) + 1
+                self._degraded_requests[route.task] = count
+            if count % self.probe_interval:
+                model = route.fallback_model
+        with self._lock:
+            self._routed[model] = self._routed.get(model, 0) + 1
+        return model
+    
+    def deadline_policy(self, route: TaskRoute, model: str) -> "TTFTDeadline":
+        """Build the race policy that starts the fallback once the primary misses its SLO."""
+        return TTFTDeadline(self, model, route.ttft_slo)
+    
+    def record_ttft(self, model: str, seconds: float) -> None:
+        """Record a model's time to first token."""
+        with self._lock:
+            self._ttft.setdefault(model, deque(maxlen=TTFT_WINDOW)).append(seconds)
+    
+    def record_miss(self, model: str) -> None:
+        """Record that a model missed its first-token deadline."""
+        with self._lock:
+            self._misses[model] = self._misses.get(model, 0) + 1
+            # A miss counts as an unbounded sample until real ones push it out
+            self._ttft.setdefault(model, deque(maxlen=TTFT_WINDOW)).append(math.inf)
+    
+    def _ttft_p95(self, model: str) -> float:
+        """P95 time to first token, or 0 while there are too few samples."""
+        with self._lock:
+            samples = sorted(self._ttft.get(model, ()))
+        if len(samples) < MIN_ROUTING_SAMPLES:
+            return 0.0
+        return samples[int(len(samples) * 0.95) - 1]
+    
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-model routing metrics.
+        
+        Returns:
+            Dictionary keyed by model with routed requests, deadline misses and P95 time to first token
+        """
+        with self._lock:
+            models = set(self._routed) | set(self._ttft)
+            routed = dict(self._routed)
+            misses = dict(self._misses)
+        return {
+            model: {
+                "routed": routed.get(model, 0),
+                "ttft_misses": misses.get(model, 0),
+                "ttft_p95_seconds": self._ttft_p95(model),
+            }
+            for model in models
+        }
+
+
+class TTFTDeadline:
+    """
+    Race policy for run_hedged: start the fallback model when the primary misses its deadline.
+    
+    It implements the policy interface of hedging.HedgingPolicy with a
+    fixed delay and no budget, since every missed deadline should reach
+    the fallback. Each miss is reported to the router, which uses it to
+    route later requests away from a slow primary.
+    """
+    
+    def __init__(self, router: ModelRouter, model: str, ttft_slo: float):
+        """
+        Initialize the policy for one request.
+        
+        Args:
+            router: Router that records the primary's deadline misses
+            model: Primary model racing against the fallback
+            ttft_slo: Time-to-first-token objective in seconds
+        """
+        self.router = router
+        self.model = model
+        self.ttft_slo = ttft_slo
+    
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the primary's first token before starting the fallback."""
+        return self.ttft_slo
+    
+    def record_request(self) -> None:
+        """Nothing to count; the router counts routed requests itself."""
+    
+    def record_deadline_miss(self) -> None:
+        """Record with the router that the primary missed its first-token deadline."""
+        self.router.record_miss(self.model)
+    
+    def try_spend(self) -> bool:
+        """Always allow the fallback; there is no budget to spend."""
+        return True
+    
+    def refund(self) -> None:
+        """Nothing to give back, as try_spend takes nothing."""
+    
+    def record_ttft(self, seconds: float, hedge_won: bool = False) -> None:
+        """Nothing to record; each leg reports its own latency to the router."""
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""
+Request coalescing module for the travel assistant application.
+Lets concurrent identical model requests share one upstream generation.
+"""
+
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+
+class _Flight:
+    """State of one in-flight request shared by every caller with the same key."""
+    
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.chunks: List[str] = []
+        self.done = False
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        # Callers still reading a stream; the upstream is abandoned when it drops to zero
+        self.subscribers = 0
+        self.abandoned = False
+
+
+class SingleFlight:
+    """Thread-based request coalescing for the synchronous client."""
+    
+    def __init__(self):
+        """Initialize the flight tables."""
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Flight] = {}
+        self._streams: Dict[str, _Flight] = {}
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key.
+        
+        Args:
+            key: Request fingerprint
+            fn: Function producing the result
+            
+        Returns:
+            The result of the leader's call
+            
+        Raises:
+            Exception: Whatever the leader's call raised
+        """
+        with self._lock:
+            flight = self._calls.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._calls[key] = flight
+        
+        if leader:
+            try:
+                flight.result = fn()
+            except BaseException as e:
+                flight.error = e
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                with flight.cond:
+                    flight.done = True
+                    flight.cond.notify_all()
+        else:
+            with flight.cond:
+                flight.cond.wait_for(lambda: flight.done)
+        
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+    
+    def stream(self, key: str, fn: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """
+        Share one streamed generation between all concurrent callers with the same key.
+        
+        The upstream stream is consumed by a producer thread, so a caller that
+        disconnects early does not stall the others. Late joiners first replay
+        the chunks produced so far. Once every caller has disconnected, the
+        upstream iterator is closed at its next chunk, so an abandoned
+        generation stops upstream and is never completed or cached.
+        
+        Args:
+            key: Request fingerprint
+            fn: Function returning the upstream chunk iterator
+            
+        Yields:
+            Text chunks in upstream order
+        """
+        with self._lock:
+            flight = self._streams.get(key)
+            if flight is None:
+                flight = _Flight()
+                self._streams[key] = flight
+                threading.Thread(
+                    target=self._produce, args=(key, flight, fn), daemon=True
+                ).start()
+            flight.subscribers += 1
+        
+        try:
+            index = 0
+            while True:
+                with flight.cond:
+                    flight.cond.wait_for(lambda: len(flight.chunks) > index or flight.done)
+                    new_chunks = flight.chunks[index:]
+                    done = flight.done
+                
+                index += len(new_chunks)
+                for chunk in new_chunks:
+                    yield chunk
+                
+                if done:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+        finally:
+            with self._lock:
+                flight.subscribers -= 1
+                if flight.subscribers == 0 and not flight.done:
+                    flight.abandoned = True
+                    # Later callers start a fresh generation instead of joining the abandoned one
+                    if self._streams.get(key) is flight:
+                        del self._streams[key]
+    
+    def _produce(self, key: str, flight: _Flight, fn: Callable[[], Iterator[str]]) -> None:
+        """Drain the upstream stream into the shared flight until it ends or is abandoned."""
+        upstream = None
+        try:
+            upstream = fn()
+            for chunk in upstream:
+                if flight.abandoned:
+                    break
+                with flight.cond:
+                    flight.chunks.append(chunk)
+                    flight.cond.notify_all()
+        except BaseException as e:
+            flight.error = e
+        finally:
+            # Closing the generator runs the client's cleanup: the stream, slot and pool member are released
+            close = getattr(upstream, "close", None)
+            if close is not None:
+                close()
+            with self._lock:
+                if self._streams.get(key) is flight:
+                    del self._streams[key]
+            with flight.cond:
+                flight.done = True
+                flight.cond.notify_all()
+
+
+class _AsyncFlight:
+    """Streamed request state shared by coroutines with the same key."""
+    
+    def __init__(self):
+        self.cond = asyncio.Condition()
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.producer: Optional[asyncio.Task] = None
+        self.subscribers = 0
+
+
+class AsyncSingleFlight:
+    """Asyncio request coalescing for the async client."""
+    
+    def __init__(self):
+        """Initialize the flight tables."""
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._streams: Dict[str, _AsyncFlight] = {}
+    
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await factory once for all concurrent callers with the same key.
+        
+        The call runs as its own task, so cancelling one caller does not
+        cancel the request for the others.
+        
+        Args:
+            key: Request fingerprint
+            factory: Function returning the awaitable producing the result
+            
+        Returns:
+            The shared result
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
+    
+    async def stream(self, key: str, factory: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        """
+        Share one streamed generation between all concurrent callers with the same key.
+        
+        When the last caller disconnects, the producer task is cancelled, which
+        closes the upstream stream before the answer is complete or cached.
+        
+        Args:
+            key: Request fingerprint
+            factory: Function returning the upstream async chunk iterator
+            
+        Yields:
+            Text chunks in upstream order
+        """
+        flight = self._streams.get(key)
+        if flight is None:
+            flight = _AsyncFlight()
+            self._streams[key] = flight
+            flight.producer = asyncio.ensure_future(self._produce(key, flight, factory))
+        flight.subscribers += 1
+        
+        try:
+            index = 0
+            while True:
+                async with flight.cond:
+                    await flight.cond.wait_for(lambda: len(flight.chunks) > index or flight.done)
+                    new_chunks = flight.chunks[index:]
+                    done = flight.done
+                
+                index += len(new_chunks)
+                for chunk in new_chunks:
+                    yield chunk
+                
+                if done:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                if self._streams.get(key) is flight:
+                    del self._streams[key]
+                flight.producer.cancel()
+    
+    async def _produce(self, key: str, flight: _AsyncFlight,
+                       factory: Callable[[], AsyncIterator[str]]) -> None:
+        """Drain the upstream stream into the shared flight until it ends or is cancelled."""
+        upstream = None
+        try:
+            upstream = factory()
+            async for chunk in upstream:
+                async with flight.cond:
+                    flight.chunks.append(chunk)
+                    flight.cond.notify_all()
+        except Exception as e:
+            flight.error = e
+        finally:
+            aclose = getattr(upstream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            if self._streams.get(key) is flight:
+                del self._streams[key]
+            async with flight.cond:
+                flight.done = True
+                flight.cond.notify_all()
@@ -12,12 +12,142 @@ API_BASE = "https://api-inference.modelscope.cn/v1/"
 MODEL_NAME = "deepseek-ai/DeepSeek-V3.2-Exp"
 MAX_TOKENS = 4096
 TEMPERATURE = 0.7
+FAST_MODEL_NAME = os.getenv("FAST_MODEL_NAME", "Qwen/Qwen2.5-7B-Instruct")
+
+# Per-Task Model Routing
+# ttft_slo: seconds the primary may take to its first token before the fallback takes over
+TASK_MODELS = {
+    "destination": {
+        "model": MODEL_NAME,
+        "max_tokens": 2048,
+        "temperature": TEMPERATURE,
+        "fallback_model": FAST_MODEL_NAME,
+        "ttft_slo": 4.0,
+    },
+    "itinerary": {
+        "model": MODEL_NAME,
+        "max_tokens": MAX_TOKENS,
+        "temperature": TEMPERATURE,
+        "fallback_model": FAST_MODEL_NAME,
+        "ttft_slo": 6.0,
+    },
+    "checklist": {
+        "model": MODEL_NAME,
+        "max_tokens": MAX_TOKENS,
+        "temperature": TEMPERATURE,
+        "fallback_model": FAST_MODEL_NAME,
+        "ttft_slo": 8.0,
+    },
+}
+ROUTER_PROBE_INTERVAL = 5
+
+# API Endpoint Pool: "base_url|key,base_url|key", or several keys for API_BASE
+API_POOL = os.getenv("MODEL_API_POOL", "")
+API_KEYS = os.getenv("MODEL_API_KEYS", "")
+POOL_EJECT_FAILURES = 3
+POOL_EJECT_SECONDS = 30.0
+
+# Response Cache Configuration
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+CACHE_DIR = os.getenv("CACHE_DIR", "cache_data")
+CACHE_TTL_SECONDS = 24 * 60 * 60
+CACHE_STALE_TTL_SECONDS = 7 * 24 * 60 * 60
+CACHE_MEMORY_MAX_ENTRIES = 256
+CACHE_DISK_MAX_ENTRIES = 5000
+
+# Saved Checklist Store: JSON files written there by older versions are imported once
+CHECKLIST_DATA_DIR = os.getenv("CHECKLIST_DATA_DIR", "checklist_data")
+CHECKLIST_DB_PATH = os.getenv("CHECKLIST_DB_PATH", os.path.join(CHECKLIST_DATA_DIR, "checklists.sqlite3"))
+CHECKLIST_HISTORY_LIMIT = 50
+
+# Upstream Admission Control
+UPSTREAM_MAX_CONCURRENCY = int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "8"))
+UPSTREAM_MAX_QUEUE = int(os.getenv("UPSTREAM_MAX_QUEUE", "100"))
+UPSTREAM_QUEUE_TIMEOUT = float(os.getenv("UPSTREAM_QUEUE_TIMEOUT", "30"))
+
+# Upstream Retry and Circuit Breaker
+UPSTREAM_MAX_RETRIES = 3
+UPSTREAM_RETRY_BASE_DELAY = 0.5
+UPSTREAM_RETRY_MAX_DELAY = 8.0
+UPSTREAM_DEADLINE = float(os.getenv("UPSTREAM_DEADLINE", "90"))
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RECOVERY_TIMEOUT = 30.0
+
+# Hedged Streaming Requests
+HEDGING_ENABLED = os.getenv("HEDGING_ENABLED", "false").lower() == "true"
+HEDGE_DELAY_PERCENTILE = 0.95
+HEDGE_DEFAULT_DELAY = 3.0
+HEDGE_MIN_DELAY = 0.5
+HEDGE_MAX_DELAY = 10.0
+HEDGE_MAX_RATIO = 0.1
+
+# Itinerary Context for the Checklist Prompt
+ITINERARY_CONTEXT_TOKEN_BUDGET = 300
+ITINERARY_CONTEXT_CLAUSE_MAX_CHARS = 40
+
+# Hotel Name Extraction: longest name considered and most names returned
+HOTEL_NAME_MAX_CHARS = 24
+MAX_EXTRACTED_HOTELS = 10
+
+# Long Itineraries: an outline first, then blocks of days expanded concurrently
+# Values bound the number of days the outline may plan
+ITINERARY_SPLIT_DAYS = {
+    "10-15天": (10, 15),
+    "15天以上": (16, 20),
+}
+ITINERARY_DAYS_PER_BLOCK = 2
+ITINERARY_OUTLINE_MAX_TOKENS = 1024
+ITINERARY_BLOCK_MAX_TOKENS = 2048
+
+# Single-Day Itinerary Regeneration
+ITINERARY_DAY_MAX_TOKENS = 1024
+ITINERARY_NEIGHBOUR_MAX_CHARS = 120
+
+# Checklist Fan-Out: generate independent category groups concurrently
+CHECKLIST_FANOUT_ENABLED = os.getenv("CHECKLIST_FANOUT_ENABLED", "false").lower() == "true"
+CHECKLIST_GROUP_MAX_TOKENS = 1024
+CHECKLIST_FIELDS = {
+    "documents": "证件类（身份证、医保卡、老年证等）",
+    "clothing": "衣物类（根据季节和目的地气候）",
+    "medications": "药品类（常用药品、应急药品）",
+    "daily_items": "生活用品类",
+    "electronics": "电子设备类",
+    "financial": "财务准备",
+    "safety": "安全用品",
+    "entertainment": "娱乐用品",
+    "special_items": "特殊用品（根据健康状况）",
+    "tips": "温馨提示",
+}
+CHECKLIST_GROUPS = [
+    ["documents", "financial"],
+    ["clothing", "daily_items"],
+    ["medications", "safety", "special_items"],
+    ["electronics", "entertainment"],
+    ["tips"],
+]
+
+# Session Store: itinerary state kept server-side; events pass only a small session reference
+SESSION_TTL_SECONDS = 2 * 60 * 60
+SESSION_STORE_MAX_SESSIONS = 500
+SESSION_STORE_MAX_BYTES = 64 * 1024 * 1024
+# Directory for sessions evicted from memory; empty disables spilling and evicted sessions are dropped
+SESSION_SPILL_DIR = os.getenv("SESSION_SPILL_DIR", "")
+
+# Checklist Prefetch: started speculatively once an itinerary completes
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "false").lower() == "true"
+PREFETCH_MAX_CONCURRENT = int(os.getenv("PREFETCH_MAX_CONCURRENT", "2"))
+PREFETCH_MAX_SESSIONS = 256
+PREFETCH_DEFAULT_ORIGIN = os.getenv("PREFETCH_DEFAULT_ORIGIN", "")
+
+# Payload Size Report: seconds between per-endpoint reports printed while serving (0 disables them)
+PAYLOAD_REPORT_INTERVAL = float(os.getenv("PAYLOAD_REPORT_INTERVAL", "600"))
 
 # Application Settings
 APP_TITLE = "🧳 银发族智能旅行助手"
 APP_DESCRIPTION = "专为中老年朋友设计的温暖贴心的旅行规划伙伴"
 SERVER_HOST = "0.0.0.0"
 SERVER_PORT = 7860
+EVENT_CONCURRENCY_LIMIT = int(os.getenv("EVENT_CONCURRENCY_LIMIT", "64"))
 
 # UI Configuration
 THEME_PRIMARY = "purple"
@@ -91,8 +221,30 @@ CUSTOM_CSS = """
 .gr-button {font-size: 18px !important; padding: 12px 20px !important;}
 .gr-textbox input {font-size: 16px !important;}
 .gr-multiselect {min-height: 120px !important;}
+
+/* Checklist output: styles sent once with the page instead of on every element */
+.tc-checklist {font-family: 'Segoe UI', 'Microsoft YaHei', sans-serif; max-width: 800px; margin: 0 auto; background: #fafafa; padding: 20px; border-radius: 15px;}
+.tc-intro {text-align: center; margin-bottom: 30px;}
+.tc-intro h1 {color: #2c3e50; font-size: 32px; margin-bottom: 10px;}
+.tc-intro p {color: #7f8c8d; font-size: 16px;}
+.tc-section {background: var(--tc-bg, #fff3e0); padding: 20px; border-radius: 10px; margin-bottom: 15px; border-left: 5px solid var(--tc-accent, #e65100);}
+.tc-section h3 {margin: 0 0 15px 0; color: var(--tc-accent, #e65100); font-size: 20px;}
+.tc-section h4 {color: #f57c00; margin: 10px 0 5px 0;}
+.tc-section ul {margin: 0; padding-left: 20px; color: #555;}
+.tc-section li {margin-bottom: 8px; line-height: 1.6;}
+.tc-section ul.tc-platforms {margin: 5px 0;}
+.tc-section ul.tc-platforms li {margin-bottom: 5px; line-height: normal;}
+.tc-section p {margin: 8px 0; color: #555; line-height: 1.6;}
+.tc-text {background: white; padding: 20px; border-radius: 10px; margin-bottom: 15px; border: 1px solid #ddd;}
+.tc-text pre {white-space: pre-wrap; font-family: inherit; margin: 0; color: #555; line-height: 1.6;}
+.tc-pending {text-align: center; color: #7f8c8d; font-size: 15px; padding: 10px;}
+.tc-footer {background: #f5f5f5; padding: 15px; border-radius: 8px; text-align: center; color: #666; font-size: 13px; margin-top: 20px;}
+.tc-footer p {margin: 5px 0;}
 """
 
+# Strip the indentation and line breaks between tags from generated HTML templates
+HTML_MINIFY_ENABLED = os.getenv("HTML_MINIFY_ENABLED", "true").lower() == "true"
+
 # HTML Templates
 LOADING_HTML = """
 <div style="padding: 60px 40px; background: linear-gradient(135deg, #e3f2fd 0%, #f3e5f5 100%); border-radius: 15px; text-align: center; border: 2px dashed #9c27b0;">
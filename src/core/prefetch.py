@@ -0,0 +1,208 @@
+"""
+Speculative checklist prefetch module for the travel assistant application.
+Starts generating a session's checklist as soon as its itinerary is ready.
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Union
+try:
+    from ..config.config import PREFETCH_ENABLED, PREFETCH_MAX_CONCURRENT, PREFETCH_MAX_SESSIONS, PREFETCH_DEFAULT_ORIGIN
+    from ..utils.helpers import normalize_location, canonicalize_request, request_fingerprint
+    from ..data.models import Trip
+    from .travel_functions import generate_checklist_async, _check_checklist_inputs
+except ImportError:
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config.config import PREFETCH_ENABLED, PREFETCH_MAX_CONCURRENT, PREFETCH_MAX_SESSIONS, PREFETCH_DEFAULT_ORIGIN
+    from utils.helpers import normalize_location, canonicalize_request, request_fingerprint
+    from data.models import Trip
+    from core.travel_functions import generate_checklist_async, _check_checklist_inputs
+
+# generate_checklist_async reports failures as text starting with this prefix
+_FAILED_PREFIX = "抱歉"
+
+
+class _Prefetch:
+    """A speculative checklist job and the inputs it was started for."""
+    
+    __slots__ = ("key", "task")
+    
+    def __init__(self, key: str, task: "asyncio.Task"):
+        self.key = key
+        self.task = task
+
+
+class ChecklistPrefetcher:
+    """
+    Per-session cache of checklists generated ahead of the user's click.
+    
+    A job is only used when the click arrives with the same inputs it was
+    started for. Speculative work never queues: once max_concurrent jobs are
+    running, further prefetches are skipped.
+    """
+    
+    def __init__(self,
+                 enabled: bool = PREFETCH_ENABLED,
+                 max_concurrent: int = PREFETCH_MAX_CONCURRENT,
+                 max_sessions: int = PREFETCH_MAX_SESSIONS,
+                 default_origin: str = PREFETCH_DEFAULT_ORIGIN,
+                 generate=generate_checklist_async):
+        """
+        Initialize the prefetcher.
+        
+        Args:
+            enabled: Whether prefetching is switched on
+            max_concurrent: Maximum number of speculative jobs running at once
+            max_sessions: Number of sessions whose result is kept
+            default_origin: Origin used when the user has not entered one yet
+            generate: Coroutine function producing the checklist HTML
+        """
+        self.enabled = enabled
+        self.max_concurrent = max_concurrent
+        self.max_sessions = max_sessions
+        self.default_origin = default_origin
+        self._generate = generate
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, _Prefetch]" = OrderedDict()
+        self._running = 0
+        self._started = 0
+        self._skipped = 0
+        self._hits = 0
+        self._misses = 0
+    
+    def _key(self, origin: str, destination: str, duration: str,
+             special_needs: str, itinerary: Union[str, Trip]) -> str:
+        """Fingerprint of the canonical checklist request."""
+        # A Trip's dataclass repr covers every field, so it fingerprints the parsed itinerary
+        itinerary_text = itinerary if isinstance(itinerary, str) else repr(itinerary)
+        return request_fingerprint(canonicalize_request(
+            "checklist", origin=origin, destination=destination, duration=duration,
+            special_needs=special_needs or "", itinerary=itinerary_text or ""
+        ))
+    
+    def start(self, session_id: str, origin: str, destination: str, duration: str,
+              special_needs: str, itinerary_text: Union[str, Trip]) -> bool:
+        """
+        Start generating a session's checklist in the background.
+        
+        Must be called from the event loop. A job already running or finished
+        for the same inputs is kept; one for other inputs is cancelled.
+        
+        Args:
+            session_id: Session the result is cached under
+            origin: Departure location; defaults to default_origin when empty
+            destination: Travel destination
+            duration: Trip duration
+            special_needs: Special requirements
+            itinerary_text: The completed itinerary, as text or a parsed Trip
+            
+        Returns:
+            True if a new job was started
+        """
+        origin = (origin or "").strip() or self.default_origin
+        if not self.enabled or not session_id or not itinerary_text:
+            return False
+        if _check_checklist_inputs(normalize_location(origin), normalize_location(destination), duration):
+            return False
+        
+        key = self._key(origin, destination, duration, special_needs, itinerary_text)
+        with self._lock:
+            current = self._sessions.get(session_id)
+            if current is not None and current.key == key:
+                return False
+            if self._running >= self.max_concurrent:
+                self._skipped += 1
+                return False
+            self._running += 1
+            self._started += 1
+        
+        task = asyncio.ensure_future(self._generate(origin, destination, duration, special_needs, itinerary_text))
+        task.add_done_callback(self._job_done)
+        
+        with self._lock:
+            previous = self._sessions.pop(session_id, None)
+            self._sessions[session_id] = _Prefetch(key, task)
+            evicted = []
+            while len(self._sessions) > self.max_sessions:
+                evicted.append(self._sessions.popitem(last=False)[1])
+        
+        for prefetch in ([previous] if previous else []) + evicted:
+            prefetch.task.cancel()
+        return True
+    
+    def _job_done(self, task: "asyncio.Task") -> None:
+        """Free the job's concurrency slot."""
+        with self._lock:
+            self._running -= 1
+    
+    async def take(self, session_id: str, origin: str, destination: str, duration: str,
+                   special_needs: str, itinerary_text: Union[str, Trip]) -> Optional[str]:
+        """
+        Get the prefetched checklist for these inputs, waiting if it is still running.
+        
+        Args:
+            session_id: Session the result is cached under
+            origin: Departure location
+            destination: Travel destination
+            duration: Trip duration
+            special_needs: Special requirements
+            itinerary_text: The itinerary passed to the checklist
+            
+        Returns:
+            The checklist HTML, or None when there is no usable prefetch
+        """
+        if not self.enabled or not session_id:
+            return None
+        
+        key = self._key(origin, destination, duration, special_needs, itinerary_text)
+        with self._lock:
+            prefetch = self._sessions.get(session_id)
+            if prefetch is None or prefetch.key != key:
+                self._misses += 1
+                return None
+            self._sessions.move_to_end(session_id)
+        
+        try:
+            # Shielded so a disconnecting caller does not cancel the shared job
+            result = await asyncio.shield(prefetch.task)
+        except asyncio.CancelledError:
+            if not prefetch.task.cancelled():
+                raise
+            result = None
+        except Exception:
+            result = None
+        
+        with self._lock:
+            if not result or result.startswith(_FAILED_PREFIX):
+                if self._sessions.get(session_id) is prefetch:
+                    del self._sessions[session_id]
+                self._misses += 1
+                return None
+            self._hits += 1
+        return result
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of prefetch activity."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "running": self._running,
+                "sessions": len(self._sessions),
+                "started": self._started,
+                "skipped": self._skipped,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+_prefetcher_instance = None
+
+def get_checklist_prefetcher() -> ChecklistPrefetcher:
+    """Get the global checklist prefetcher instance."""
+    global _prefetcher_instance
+    if _prefetcher_instance is None:
+        _prefetcher_instance = ChecklistPrefetcher()
+    return _prefetcher_instance
@@ -3,17 +3,36 @@ Core travel functions module for the travel assistant application.
 Contains the main business logic for travel planning functionality.
 """
 
+import asyncio
+import contextvars
+import dataclasses
 import json
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, AsyncIterator, Optional, Tuple, Union
 try:
-    from ..api.openai_client import get_client
-    from ..utils.helpers import clean_response, validate_inputs, safe_json_parse, format_interests, format_health_focus, is_valid_chinese_location
+    from ..config.config import CHECKLIST_FANOUT_ENABLED, CHECKLIST_GROUPS, ITINERARY_SPLIT_DAYS, ITINERARY_DAYS_PER_BLOCK
+    from ..api.openai_client import get_client, get_async_client
+    from ..utils.json_stream import StreamingJSONObjectParser
+    from ..utils.cleaning import ResponseCleaner
+    from ..utils.templates import Template, escape_items, static_html
+    from ..utils.helpers import clean_response, validate_inputs, safe_json_parse, format_interests, format_health_focus, is_valid_chinese_location, normalize_location, compress_itinerary_context, parse_day_outline
+    from ..utils.helpers import ensure_day_heading, summarize_day
+    from ..data.models import Trip
+    from ..data.itinerary import parse_trip, parse_day_text, render_trip_text, render_day_text, trip_checklist_context
 except ImportError:
     import sys
     import os
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from api.openai_client import get_client
-    from utils.helpers import clean_response, validate_inputs, safe_json_parse, format_interests, format_health_focus, is_valid_chinese_location
+    from config.config import CHECKLIST_FANOUT_ENABLED, CHECKLIST_GROUPS, ITINERARY_SPLIT_DAYS, ITINERARY_DAYS_PER_BLOCK
+    from api.openai_client import get_client, get_async_client
+    from utils.json_stream import StreamingJSONObjectParser
+    from utils.cleaning import ResponseCleaner
+    from utils.templates import Template, escape_items, static_html
+    from utils.helpers import clean_response, validate_inputs, safe_json_parse, format_interests, format_health_focus, is_valid_chinese_location, normalize_location, compress_itinerary_context, parse_day_outline
+    from utils.helpers import ensure_day_heading, summarize_day
+    from data.models import Trip
+    from data.itinerary import parse_trip, parse_day_text, render_trip_text, render_day_text, trip_checklist_context
 
 
 def generate_destination_recommendation(season: str, 
@@ -32,16 +51,9 @@ def generate_destination_recommendation(season: str,
     Returns:
         Formatted destination recommendations
     """
-    # Validate inputs
-    inputs = {
-        'season': season,
-        'health_status': health_status,
-        'budget': budget
-    }
-    
-    errors = validate_inputs(inputs)
-    if errors:
-        return f"输入验证失败: {', '.join(errors.values())}"
+    error = _check_destination_inputs(season, health_status, budget)
+    if error:
+        return error
     
     # Format interests
     interests_str = format_interests(interests)
@@ -56,7 +68,7 @@ def generate_destination_recommendation(season: str,
         )
         
         return clean_response(response)
-        
+    
     except Exception as e:
         return f"抱歉，生成推荐时出现了错误: {str(e)}"
 
@@ -77,7 +89,275 @@ def generate_itinerary_plan(destination: str,
     Returns:
         Formatted itinerary plan
     """
-    # Validate inputs
+    destination = normalize_location(destination)
+    error = _check_itinerary_inputs(destination, duration, mobility)
+    if error:
+        return error
+    
+    # Format health focus
+    health_focus_str = format_health_focus(health_focus)
+    
+    try:
+        client = get_client()
+        if duration in ITINERARY_SPLIT_DAYS:
+            min_days, max_days = ITINERARY_SPLIT_DAYS[duration]
+            outline_days = parse_day_outline(
+                client.generate_itinerary_outline(destination, duration, mobility, health_focus_str, min_days, max_days),
+                max_days
+            )
+            if outline_days:
+                itinerary = ""
+                for itinerary in _expand_itinerary(client, destination, duration, mobility, health_focus_str, outline_days):
+                    pass
+                return itinerary
+        
+        response = client.generate_itinerary_plan(
+            destination=destination,
+            duration=duration,
+            mobility=mobility,
+            health_focus=health_focus_str,
+            structured=True
+        )
+        
+        return _render_structured_itinerary(response, destination, duration)
+    
+    except Exception as e:
+        return f"抱歉，制定行程时出现了错误: {str(e)}"
+
+
+def generate_destination_recommendation_stream(season: str, 
+                                              health_status: str, 
+                                              budget: str, 
+                                              interests: List[str]) -> Iterator[str]:
+    """
+    Stream destination recommendations based on user preferences.
+    
+    Args:
+        season: Travel season
+        health_status: Health status
+        budget: Budget range
+        interests: List of interests
+        
+    Yields:
+        The formatted recommendations received so far
+    """
+    error = _check_destination_inputs(season, health_status, budget)
+    if error:
+        yield error
+        return
+    
+    interests_str = format_interests(interests)
+    
+    try:
+        client = get_client()
+        cleaner = ResponseCleaner()
+        response = ""
+        for chunk in client.stream_destination_recommendations(
+            season=season,
+            health_status=health_status,
+            budget=budget,
+            interests=interests_str
+        ):
+            response += cleaner.feed(chunk)
+            yield response
+        tail = cleaner.flush()
+        if tail:
+            yield response + tail
+    
+    except Exception as e:
+        yield f"抱歉，生成推荐时出现了错误: {str(e)}"
+
+
+def generate_itinerary_plan_stream(destination: str, 
+                                  duration: str, 
+                                  mobility: str, 
+                                  health_focus: List[str]) -> Iterator[str]:
+    """
+    Stream a detailed itinerary plan.
+    
+    Args:
+        destination: Travel destination
+        duration: Trip duration
+        mobility: Mobility status
+        health_focus: List of health concerns
+        
+    Yields:
+        The formatted itinerary received so far
+    """
+    destination = normalize_location(destination)
+    error = _check_itinerary_inputs(destination, duration, mobility)
+    if error:
+        yield error
+        return
+    
+    health_focus_str = format_health_focus(health_focus)
+    
+    try:
+        client = get_client()
+        if duration in ITINERARY_SPLIT_DAYS:
+            min_days, max_days = ITINERARY_SPLIT_DAYS[duration]
+            outline_days = parse_day_outline(
+                client.generate_itinerary_outline(destination, duration, mobility, health_focus_str, min_days, max_days),
+                max_days
+            )
+            if outline_days:
+                yield from _expand_itinerary(client, destination, duration, mobility, health_focus_str, outline_days)
+                return
+        
+        cleaner = ResponseCleaner()
+        response = ""
+        for chunk in client.stream_itinerary_plan(
+            destination=destination,
+            duration=duration,
+            mobility=mobility,
+            health_focus=health_focus_str
+        ):
+            response += cleaner.feed(chunk)
+            yield response
+        tail = cleaner.flush()
+        if tail:
+            yield response + tail
+    
+    except Exception as e:
+        yield f"抱歉，制定行程时出现了错误: {str(e)}"
+
+
+def regenerate_itinerary_day_stream(trip: Optional[Trip],
+                                    day: int,
+                                    destination: str,
+                                    duration: str,
+                                    mobility: str,
+                                    health_focus: List[str],
+                                    change_request: str = "") -> Iterator[Tuple[str, Optional[Trip]]]:
+    """
+    Stream a new plan for one day and splice it into the trip.
+    
+    Only the chosen day is sent to the model, with one-line summaries of
+    the days around it, so an edit costs one day's tokens rather than the
+    whole trip's.
+    
+    Args:
+        trip: The parsed itinerary
+        day: Day number to regenerate
+        destination: Travel destination
+        duration: Trip duration
+        mobility: Mobility status
+        health_focus: List of health concerns
+        change_request: What the user wants changed about this day
+        
+    Yields:
+        (itinerary text, updated trip) with the new day received so far;
+        the day is parsed once it is complete, so the trip is only set on
+        the last item and stays None when the day could not be regenerated
+    """
+    destination = normalize_location(destination)
+    day = int(day or 0)
+    error = _check_regenerate_inputs(trip, day, destination, duration, mobility, change_request)
+    if error:
+        yield error, None
+        return
+    
+    index = trip.find_day(day)
+    # The other days never change, so they are rendered once around the streamed day
+    before, after = _render_around_day(trip, index)
+    try:
+        client = get_client()
+        cleaner = ResponseCleaner()
+        response = ""
+        for chunk in client.stream_itinerary_day(
+            destination=destination,
+            duration=duration,
+            mobility=mobility,
+            health_focus=format_health_focus(health_focus),
+            day=day,
+            change_request=(change_request or "").strip(),
+            **_day_context(trip, index)
+        ):
+            response += cleaner.feed(chunk)
+            yield before + ensure_day_heading(response, day) + after, None
+        response += cleaner.flush()
+        updated = _splice_itinerary_day(trip, index, response)
+        yield before + updated.days[index].text + after, updated
+    
+    except Exception as e:
+        yield f"抱歉，重新生成第{day}天时出现了错误: {str(e)}", None
+
+
+def _check_regenerate_inputs(trip: Optional[Trip], day: int, destination: str,
+                             duration: str, mobility: str, change_request: str) -> Optional[str]:
+    """Validate a single-day regeneration, returning an error message or None."""
+    error = _check_itinerary_inputs(destination, duration, mobility)
+    if error:
+        return error
+    
+    errors = validate_inputs({'change_request': change_request})
+    if errors:
+        return f"输入验证失败: {', '.join(errors.values())}"
+    
+    if trip is None or not trip.days:
+        return "当前行程无法按天拆分，请先制定行程"
+    
+    if trip.find_day(day) < 0:
+        return f"未找到第{day}天的行程"
+    
+    return None
+
+
+def _day_context(trip: Trip, index: int) -> Dict[str, str]:
+    """The day's current plan and compact summaries of its neighbours."""
+    days = trip.days
+    return {
+        "current_plan": render_day_text(days[index]),
+        "previous_day": summarize_day(render_day_text(days[index - 1])) if index > 0 else "",
+        "next_day": summarize_day(render_day_text(days[index + 1])) if index + 1 < len(days) else "",
+    }
+
+
+# Stands in for the regenerated day when rendering the rest of the trip
+_DAY_PLACEHOLDER = "\ue000"
+
+
+def _render_around_day(trip: Trip, index: int) -> Tuple[str, str]:
+    """The trip's text before and after one day, separators included."""
+    days = list(trip.days)
+    days[index] = dataclasses.replace(days[index], text=_DAY_PLACEHOLDER)
+    before, after = render_trip_text(dataclasses.replace(trip, days=days)).split(_DAY_PLACEHOLDER)
+    return before, after
+
+
+def _splice_itinerary_day(trip: Trip, index: int, day_text: str) -> Trip:
+    """Copy of the trip with one day replaced by newly generated, cleaned text."""
+    days = list(trip.days)
+    day = days[index].day
+    days[index] = parse_day_text(day, ensure_day_heading(day_text, day))
+    return dataclasses.replace(trip, days=days)
+
+
+def _render_structured_itinerary(response: str, destination: str, duration: str) -> str:
+    """Render a JSON itinerary as text, or clean the response when it has no day structure."""
+    trip = parse_trip(response, destination, duration)
+    if trip.days:
+        return render_trip_text(trip)
+    return clean_response(response)
+
+
+def _check_destination_inputs(season: str, health_status: str, budget: str) -> Optional[str]:
+    """Validate destination recommendation inputs, returning an error message or None."""
+    inputs = {
+        'season': season,
+        'health_status': health_status,
+        'budget': budget
+    }
+    
+    errors = validate_inputs(inputs)
+    if errors:
+        return f"输入验证失败: {', '.join(errors.values())}"
+    
+    return None
+
+
+def _check_itinerary_inputs(destination: str, duration: str, mobility: str) -> Optional[str]:
+    """Validate itinerary planning inputs, returning an error message or None."""
     inputs = {
         'destination': destination,
         'duration': duration,
@@ -88,33 +368,138 @@ def generate_itinerary_plan(destination: str,
     if errors:
         return f"输入验证失败: {', '.join(errors.values())}"
     
-    # Validate destination
     if not is_valid_chinese_location(destination):
         return "请输入有效的中文地名"
     
-    # Format health focus
-    health_focus_str = format_health_focus(health_focus)
+    return None
+
+
+# A block of days (start, end) of a long itinerary, or None for the closing notes
+ItineraryJob = Optional[Tuple[int, int]]
+
+
+def _itinerary_jobs(day_count: int) -> List[ItineraryJob]:
+    """Split a long trip into blocks of ITINERARY_DAYS_PER_BLOCK days, followed by the notes."""
+    jobs: List[ItineraryJob] = [
+        (start, min(start + ITINERARY_DAYS_PER_BLOCK - 1, day_count))
+        for start in range(1, day_count + 1, ITINERARY_DAYS_PER_BLOCK)
+    ]
+    return jobs + [None]
+
+
+def _itinerary_job_label(job: ItineraryJob) -> str:
+    """Human-readable name of a job for progress and failure notes."""
+    if job is None:
+        return "注意事项与应急准备"
+    start, end = job
+    return f"第{start}天行程" if start == end else f"第{start}-{end}天行程"
+
+
+def _format_outline(outline_days: List[str]) -> str:
+    """Outline lines in the "第N天：..." form the expansion prompts refer to."""
+    return "\n".join(f"第{day}天：{summary}" for day, summary in enumerate(outline_days, 1))
+
+
+def _run_itinerary_job(client, job: ItineraryJob, destination: str, duration: str,
+                       mobility: str, health_focus: str, outline: str):
+    """Call the client for one job; returns a coroutine when client is the async client."""
+    if job is None:
+        return client.generate_itinerary_notes(destination, duration, mobility, health_focus, outline)
+    start, end = job
+    return client.generate_itinerary_days(destination, duration, mobility, health_focus, outline, start, end)
+
+
+def _stitch_itinerary(outline_days: List[str], jobs: List[ItineraryJob], pieces: List[Optional[str]]) -> str:
+    """Join the outline and the expanded pieces in day order; pending pieces show a placeholder."""
+    parts = [f"📅 行程总览（共{len(outline_days)}天）\n{_format_outline(outline_days)}"]
+    for job, piece in zip(jobs, pieces):
+        parts.append(piece if piece is not None else f"⏳ {_itinerary_job_label(job)}生成中……")
+    return clean_response("\n\n".join(parts))
+
+
+def _expand_itinerary(client, destination: str, duration: str, mobility: str,
+                      health_focus: str, outline_days: List[str]) -> Iterator[str]:
+    """
+    Expand a long trip's outline with its blocks of days requested concurrently.
     
-    try:
-        client = get_client()
-        response = client.generate_itinerary_plan(
-            destination=destination,
-            duration=duration,
-            mobility=mobility,
-            health_focus=health_focus_str
-        )
-        
-        return clean_response(response)
+    Each block is a separate short request, so the total time is the outline
+    plus the slowest block however many days the trip has, and no single
+    response has to fit the whole trip into its token budget.
+    
+    Yields:
+        The stitched itinerary once the outline is known, then each time a block finishes
         
-    except Exception as e:
-        return f"抱歉，制定行程时出现了错误: {str(e)}"
+    Raises:
+        Exception: The last block error if every block failed
+    """
+    outline = _format_outline(outline_days)
+    jobs = _itinerary_jobs(len(outline_days))
+    pieces: List[Optional[str]] = [None] * len(jobs)
+    yield _stitch_itinerary(outline_days, jobs, pieces)
+    
+    last_error = None
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        # copy_context carries the caller's session into the worker threads for fair admission
+        futures = {
+            executor.submit(
+                contextvars.copy_context().run, _run_itinerary_job,
+                client, job, destination, duration, mobility, health_focus, outline
+            ): index
+            for index, job in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                pieces[index] = clean_response(future.result())
+            except Exception as e:
+                last_error = e
+                pieces[index] = f"⚠️ {_itinerary_job_label(jobs[index])}生成失败，请稍后重试"
+            yield _stitch_itinerary(outline_days, jobs, pieces)
+    
+    if last_error is not None and all(piece.startswith("⚠️") for piece in pieces):
+        raise last_error
+
+
+async def _expand_itinerary_async(client, destination: str, duration: str, mobility: str,
+                                  health_focus: str, outline_days: List[str]) -> AsyncIterator[str]:
+    """Async counterpart of _expand_itinerary."""
+    outline = _format_outline(outline_days)
+    jobs = _itinerary_jobs(len(outline_days))
+    pieces: List[Optional[str]] = [None] * len(jobs)
+    yield _stitch_itinerary(outline_days, jobs, pieces)
+    
+    tasks = {
+        asyncio.ensure_future(_run_itinerary_job(
+            client, job, destination, duration, mobility, health_focus, outline
+        )): index
+        for index, job in enumerate(jobs)
+    }
+    last_error = None
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = tasks[task]
+                try:
+                    pieces[index] = clean_response(task.result())
+                except Exception as e:
+                    last_error = e
+                    pieces[index] = f"⚠️ {_itinerary_job_label(jobs[index])}生成失败，请稍后重试"
+            yield _stitch_itinerary(outline_days, jobs, pieces)
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    if last_error is not None and all(piece.startswith("⚠️") for piece in pieces):
+        raise last_error
 
 
 def generate_checklist(origin: str, 
                       destination: str, 
                       duration: str, 
                       special_needs: str,
-                      itinerary_text: str = "") -> str:
+                      itinerary_text: Union[str, Trip] = "") -> str:
     """
     Generate a comprehensive travel checklist.
     
@@ -123,12 +508,44 @@ def generate_checklist(origin: str,
         destination: Travel destination
         duration: Trip duration
         special_needs: Special requirements
-        itinerary_text: Optional itinerary for context
+        itinerary_text: Optional itinerary text or parsed Trip; condensed to checklist-relevant facts for the prompt
         
     Returns:
         HTML formatted checklist
     """
-    # Validate inputs
+    # Normalize free-text locations so equivalent requests share cache entries
+    origin = normalize_location(origin)
+    destination = normalize_location(destination)
+    
+    error = _check_checklist_inputs(origin, destination, duration)
+    if error:
+        return error
+    
+    try:
+        client = get_client()
+        itinerary_context = _checklist_context(itinerary_text)
+        if CHECKLIST_FANOUT_ENABLED:
+            checklist_data = {}
+            for checklist_data in _fan_out_checklist(client, origin, destination, duration, special_needs, itinerary_context):
+                pass
+            return format_checklist_html(checklist_data)
+        
+        response = client.generate_checklist(
+            origin=origin,
+            destination=destination,
+            duration=duration,
+            special_needs=special_needs,
+            itinerary_text=itinerary_context
+        )
+        
+        return _format_checklist_response(response)
+    
+    except Exception as e:
+        return f"抱歉，生成清单时出现了错误: {str(e)}"
+
+
+def _check_checklist_inputs(origin: str, destination: str, duration: str) -> Optional[str]:
+    """Validate checklist inputs, returning an error message or None."""
     inputs = {
         'origin': origin,
         'destination': destination,
@@ -146,171 +563,677 @@ def generate_checklist(origin: str,
     if not is_valid_chinese_location(destination):
         return "请输入有效的目的地名称"
     
+    return None
+
+
+def _checklist_context(itinerary: Union[str, Trip]) -> str:
+    """Checklist-relevant facts of an itinerary; a parsed Trip supplies hotels and transport directly."""
+    if isinstance(itinerary, Trip):
+        return trip_checklist_context(itinerary)
+    return compress_itinerary_context(itinerary)
+
+
+def _format_checklist_response(response: str) -> str:
+    """Parse a checklist response as JSON and format it as HTML."""
+    checklist_data = safe_json_parse(response)
+    if checklist_data:
+        return format_checklist_html(checklist_data)
+    
+    # Fallback to text formatting
+    return format_checklist_text(response)
+
+
+def generate_checklist_stream(origin: str, 
+                             destination: str, 
+                             duration: str, 
+                             special_needs: str,
+                             itinerary_text: Union[str, Trip] = "") -> Iterator[str]:
+    """
+    Stream a travel checklist, rendering each category as soon as it is complete.
+    
+    Args:
+        origin: Departure location
+        destination: Travel destination
+        duration: Trip duration
+        special_needs: Special requirements
+        itinerary_text: Optional itinerary text or parsed Trip; condensed to checklist-relevant facts for the prompt
+        
+    Yields:
+        HTML of the checklist sections received so far, then the complete checklist
+    """
+    origin = normalize_location(origin)
+    destination = normalize_location(destination)
+    
+    error = _check_checklist_inputs(origin, destination, duration)
+    if error:
+        yield error
+        return
+    
     try:
         client = get_client()
-        response = client.generate_checklist(
+        itinerary_context = _checklist_context(itinerary_text)
+        yield _render_checklist_progress([])
+        if CHECKLIST_FANOUT_ENABLED:
+            checklist_data = {}
+            for checklist_data in _fan_out_checklist(client, origin, destination, duration, special_needs, itinerary_context):
+                yield _render_checklist_progress(_checklist_sections(checklist_data))
+            yield format_checklist_html(checklist_data)
+            return
+        
+        parser = StreamingJSONObjectParser()
+        sections = []
+        response = ""
+        for chunk in client.stream_checklist(
             origin=origin,
             destination=destination,
             duration=duration,
             special_needs=special_needs,
-            itinerary_text=itinerary_text
+            itinerary_text=itinerary_context
+        ):
+            response += chunk
+            if _add_checklist_sections(parser.feed(chunk), sections):
+                yield _render_checklist_progress(sections)
+        
+        yield _finish_checklist_stream(parser, response)
+    
+    except Exception as e:
+        yield f"抱歉，生成清单时出现了错误: {str(e)}"
+
+
+def _add_checklist_sections(members: List[Any], sections: List[str]) -> bool:
+    """Render newly completed checklist members; return True if any section was added."""
+    added = False
+    for key, value in members:
+        section = render_checklist_member(key, value)
+        if section:
+            sections.append(section)
+            added = True
+    return added
+
+
+def _render_checklist_progress(sections: List[str]) -> str:
+    """Checklist HTML for the sections received so far, with a pending note."""
+    return CHECKLIST_HEADER_HTML + "".join(sections) + CHECKLIST_PENDING_HTML
+
+
+def _finish_checklist_stream(parser: StreamingJSONObjectParser, response: str) -> str:
+    """Final checklist HTML from the whole response, falling back to the members parsed while streaming."""
+    # The whole response is repaired as one value, so it recovers members the streaming parser could not
+    checklist_data = safe_json_parse(response)
+    if checklist_data:
+        return format_checklist_html(checklist_data)
+    if parser.members:
+        return format_checklist_html(dict(parser.members))
+    return format_checklist_text(response)
+
+
+def _checklist_sections(checklist_data: Dict[str, Any]) -> List[str]:
+    """Rendered sections of partial checklist data in display order."""
+    return [render_checklist_member(key, checklist_data.get(key)) for key in CHECKLIST_ORDER]
+
+
+def _fan_out_checklist(client, origin: str, destination: str, duration: str,
+                       special_needs: str, itinerary_context: str) -> Iterator[Dict[str, Any]]:
+    """
+    Generate the checklist category groups concurrently.
+    
+    Each group is a separate short request, so the total time tracks the
+    slowest group rather than one long decode of every category.
+    
+    Yields:
+        The merged checklist data each time another group finishes
+        
+    Raises:
+        Exception: The last group error if no group produced usable data
+    """
+    merged = {}
+    last_error = None
+    with ThreadPoolExecutor(max_workers=len(CHECKLIST_GROUPS)) as executor:
+        # copy_context carries the caller's session into the worker threads for fair admission
+        futures = [
+            executor.submit(
+                contextvars.copy_context().run, client.generate_checklist_group,
+                origin, destination, duration, special_needs, group, itinerary_context
+            )
+            for group in CHECKLIST_GROUPS
+        ]
+        for future in as_completed(futures):
+            try:
+                group_data = safe_json_parse(future.result())
+            except Exception as e:
+                last_error = e
+                continue
+            if group_data:
+                merged.update(group_data)
+                yield dict(merged)
+    
+    if not merged:
+        raise last_error or ValueError("清单内容解析失败")
+
+
+async def _fan_out_checklist_async(client, origin: str, destination: str, duration: str,
+                                   special_needs: str, itinerary_context: str) -> AsyncIterator[Dict[str, Any]]:
+    """Async counterpart of _fan_out_checklist."""
+    tasks = [
+        asyncio.ensure_future(client.generate_checklist_group(
+            origin, destination, duration, special_needs, group, itinerary_context
+        ))
+        for group in CHECKLIST_GROUPS
+    ]
+    merged = {}
+    last_error = None
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                group_data = safe_json_parse(await next_done)
+            except Exception as e:
+                last_error = e
+                continue
+            if group_data:
+                merged.update(group_data)
+                yield dict(merged)
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    if not merged:
+        raise last_error or ValueError("清单内容解析失败")
+
+
+async def generate_destination_recommendation_async(season: str, 
+                                                   health_status: str, 
+                                                   budget: str, 
+                                                   interests: List[str]) -> str:
+    """
+    Generate destination recommendations without blocking a worker thread.
+    
+    Args:
+        season: Travel season
+        health_status: Health status
+        budget: Budget range
+        interests: List of interests
+        
+    Returns:
+        Formatted destination recommendations
+    """
+    error = _check_destination_inputs(season, health_status, budget)
+    if error:
+        return error
+    
+    try:
+        client = get_async_client()
+        response = await client.generate_destination_recommendations(
+            season=season,
+            health_status=health_status,
+            budget=budget,
+            interests=format_interests(interests)
         )
         
-        # Parse JSON response and format as HTML
-        checklist_data = safe_json_parse(response)
-        if checklist_data:
-            return format_checklist_html(checklist_data)
-        else:
-            # Fallback to text formatting
-            return format_checklist_text(response)
+        return clean_response(response)
+    
+    except Exception as e:
+        return f"抱歉，生成推荐时出现了错误: {str(e)}"
+
+
+async def generate_itinerary_plan_async(destination: str, 
+                                       duration: str, 
+                                       mobility: str, 
+                                       health_focus: List[str]) -> str:
+    """
+    Generate a detailed itinerary plan without blocking a worker thread.
+    
+    Args:
+        destination: Travel destination
+        duration: Trip duration
+        mobility: Mobility status
+        health_focus: List of health concerns
+        
+    Returns:
+        Formatted itinerary plan
+    """
+    destination = normalize_location(destination)
+    error = _check_itinerary_inputs(destination, duration, mobility)
+    if error:
+        return error
+    
+    health_focus_str = format_health_focus(health_focus)
+    
+    try:
+        client = get_async_client()
+        if duration in ITINERARY_SPLIT_DAYS:
+            min_days, max_days = ITINERARY_SPLIT_DAYS[duration]
+            outline_days = parse_day_outline(
+                await client.generate_itinerary_outline(destination, duration, mobility, health_focus_str, min_days, max_days),
+                max_days
+            )
+            if outline_days:
+                itinerary = ""
+                async for itinerary in _expand_itinerary_async(client, destination, duration, mobility, health_focus_str, outline_days):
+                    pass
+                return itinerary
+        
+        response = await client.generate_itinerary_plan(
+            destination=destination,
+            duration=duration,
+            mobility=mobility,
+            health_focus=health_focus_str,
+            structured=True
+        )
         
+        return _render_structured_itinerary(response, destination, duration)
+    
     except Exception as e:
-        return f"抱歉，生成清单时出现了错误: {str(e)}"
+        return f"抱歉，制定行程时出现了错误: {str(e)}"
 
 
-def format_checklist_html(data: Dict[str, Any]) -> str:
+async def generate_checklist_async(origin: str, 
+                                  destination: str, 
+                                  duration: str, 
+                                  special_needs: str,
+                                  itinerary_text: Union[str, Trip] = "") -> str:
     """
-    Format checklist data as HTML.
+    Generate a travel checklist without blocking a worker thread.
     
     Args:
-        data: Parsed checklist data
+        origin: Departure location
+        destination: Travel destination
+        duration: Trip duration
+        special_needs: Special requirements
+        itinerary_text: Optional itinerary text or parsed Trip; condensed to checklist-relevant facts for the prompt
         
     Returns:
         HTML formatted checklist
     """
-    html = """
-    <div style="font-family: 'Segoe UI', 'Microsoft YaHei', sans-serif; max-width: 800px; margin: 0 auto; background: #fafafa; padding: 20px; border-radius: 15px;">
-        <div style="text-align: center; margin-bottom: 30px;">
-            <h1 style="color: #2c3e50; font-size: 32px; margin-bottom: 10px;">🎁 专属旅行清单</h1>
-            <p style="color: #7f8c8d; font-size: 16px;">为您的旅行做好充分准备</p>
-        </div>
+    origin = normalize_location(origin)
+    destination = normalize_location(destination)
+    
+    error = _check_checklist_inputs(origin, destination, duration)
+    if error:
+        return error
+    
+    try:
+        client = get_async_client()
+        itinerary_context = _checklist_context(itinerary_text)
+        if CHECKLIST_FANOUT_ENABLED:
+            checklist_data = {}
+            async for checklist_data in _fan_out_checklist_async(client, origin, destination, duration, special_needs, itinerary_context):
+                pass
+            return format_checklist_html(checklist_data)
+        
+        response = await client.generate_checklist(
+            origin=origin,
+            destination=destination,
+            duration=duration,
+            special_needs=special_needs,
+            itinerary_text=itinerary_context
+        )
+        
+        return _format_checklist_response(response)
+    
+    except Exception as e:
+        return f"抱歉，生成清单时出现了错误: {str(e)}"
+
+
+async def generate_destination_recommendation_stream_async(season: str, 
+                                                          health_status: str, 
+                                                          budget: str, 
+                                                          interests: List[str]) -> AsyncIterator[str]:
     """
+    Stream destination recommendations from the async client.
     
-    # Document checklist
-    documents = data.get("documents", [])
-    if documents:
-        html += create_checklist_section("📄 证件类", documents, "#e8f4fd", "#2980b9")
-    
-    # Clothing checklist
-    clothing = data.get("clothing", [])
-    if clothing:
-        html += create_checklist_section("👕 衣物类", clothing, "#fef9e7", "#f39c12")
-    
-    # Medications checklist
-    medications = data.get("medications", [])
-    if medications:
-        html += create_checklist_section("💊 药品类", medications, "#ffe6e6", "#e74c3c")
-    
-    # Daily items checklist
-    daily_items = data.get("daily_items", [])
-    if daily_items:
-        html += create_checklist_section("🧴 生活用品类", daily_items, "#e8f8f5", "#27ae60")
-    
-    # Electronics checklist
-    electronics = data.get("electronics", [])
-    if electronics:
-        html += create_checklist_section("📱 电子设备类", electronics, "#f0f3f4", "#95a5a6")
-    
-    # Financial checklist
-    financial = data.get("financial", [])
-    if financial:
-        html += create_checklist_section("💰 财务准备", financial, "#eafaf1", "#2ecc71")
-    
-    # Safety checklist
-    safety = data.get("safety", [])
-    if safety:
-        html += create_checklist_section("🛡️ 安全用品", safety, "#fadbd8", "#c0392b")
-    
-    # Entertainment checklist
-    entertainment = data.get("entertainment", [])
-    if entertainment:
-        html += create_checklist_section("🎮 娱乐用品", entertainment, "#e8daef", "#8e44ad")
-    
-    # Special items checklist
-    special_items = data.get("special_items", [])
-    if special_items:
-        html += create_checklist_section("⭐ 特殊用品", special_items, "#fdedec", "#e91e63")
-    
-    # Booking guides
-    booking_guides = data.get("booking_guides", {})
-    if booking_guides:
-        html += create_booking_guides_section(booking_guides)
-    
-    # Tips
-    tips = data.get("tips", [])
-    if tips:
-        html += create_tips_section(tips)
-    
-    # Footer
-    html += """
-        <div style="background: #f5f5f5; padding: 15px; border-radius: 8px; text-align: center; color: #666; font-size: 13px; margin-top: 20px;">
-            <p style="margin: 5px 0;">💡 此清单仅供参考，请根据实际情况调整</p>
-        </div>
-    </div>
+    Args:
+        season: Travel season
+        health_status: Health status
+        budget: Budget range
+        interests: List of interests
+        
+    Yields:
+        The formatted recommendations received so far
     """
+    error = _check_destination_inputs(season, health_status, budget)
+    if error:
+        yield error
+        return
     
-    return html
+    try:
+        client = get_async_client()
+        cleaner = ResponseCleaner()
+        response = ""
+        async for chunk in client.stream_destination_recommendations(
+            season=season,
+            health_status=health_status,
+            budget=budget,
+            interests=format_interests(interests)
+        ):
+            response += cleaner.feed(chunk)
+            yield response
+        tail = cleaner.flush()
+        if tail:
+            yield response + tail
+    
+    except Exception as e:
+        yield f"抱歉，生成推荐时出现了错误: {str(e)}"
 
 
-def create_checklist_section(title: str, items: List[str], bg_color: str, title_color: str) -> str:
-    """Create a checklist section HTML."""
-    html = f"""
-    <div style="background: {bg_color}; padding: 20px; border-radius: 10px; margin-bottom: 15px; border-left: 5px solid {title_color};">
-        <h3 style="margin: 0 0 15px 0; color: {title_color}; font-size: 20px;">{title}</h3>
-        <ul style="margin: 0; padding-left: 20px; color: #555;">
+async def generate_itinerary_plan_stream_async(destination: str, 
+                                              duration: str, 
+                                              mobility: str, 
+                                              health_focus: List[str]) -> AsyncIterator[Tuple[str, Optional[Trip]]]:
     """
+    Stream a detailed itinerary plan from the async client.
     
-    for item in items:
-        html += f'<li style="margin-bottom: 8px; line-height: 1.6;">{item}</li>'
+    Args:
+        destination: Travel destination
+        duration: Trip duration
+        mobility: Mobility status
+        health_focus: List of health concerns
+        
+    Yields:
+        (itinerary text, parsed trip); the trip is only set on the last item and is None on failure
+    """
+    destination = normalize_location(destination)
+    error = _check_itinerary_inputs(destination, duration, mobility)
+    if error:
+        yield error, None
+        return
     
-    html += """
-        </ul>
-    </div>
+    health_focus_str = format_health_focus(health_focus)
+    
+    try:
+        client = get_async_client()
+        response = ""
+        if duration in ITINERARY_SPLIT_DAYS:
+            min_days, max_days = ITINERARY_SPLIT_DAYS[duration]
+            outline_days = parse_day_outline(
+                await client.generate_itinerary_outline(destination, duration, mobility, health_focus_str, min_days, max_days),
+                max_days
+            )
+            if outline_days:
+                async for response in _expand_itinerary_async(client, destination, duration, mobility, health_focus_str, outline_days):
+                    yield response, None
+                yield response, parse_trip(response, destination, duration)
+                return
+        
+        cleaner = ResponseCleaner()
+        async for chunk in client.stream_itinerary_plan(
+            destination=destination,
+            duration=duration,
+            mobility=mobility,
+            health_focus=health_focus_str
+        ):
+            response += cleaner.feed(chunk)
+            yield response, None
+        response += cleaner.flush()
+        yield response, parse_trip(response, destination, duration)
+    
+    except Exception as e:
+        yield f"抱歉，制定行程时出现了错误: {str(e)}", None
+
+
+async def generate_checklist_stream_async(origin: str, 
+                                         destination: str, 
+                                         duration: str, 
+                                         special_needs: str,
+                                         itinerary_text: Union[str, Trip] = "") -> AsyncIterator[str]:
     """
+    Stream a travel checklist from the async client; see generate_checklist_stream.
+    
+    Args:
+        origin: Departure location
+        destination: Travel destination
+        duration: Trip duration
+        special_needs: Special requirements
+        itinerary_text: Optional itinerary text or parsed Trip; condensed to checklist-relevant facts for the prompt
+        
+    Yields:
+        HTML of the checklist sections received so far, then the complete checklist
+    """
+    origin = normalize_location(origin)
+    destination = normalize_location(destination)
+    
+    error = _check_checklist_inputs(origin, destination, duration)
+    if error:
+        yield error
+        return
+    
+    try:
+        client = get_async_client()
+        itinerary_context = _checklist_context(itinerary_text)
+        yield _render_checklist_progress([])
+        if CHECKLIST_FANOUT_ENABLED:
+            checklist_data = {}
+            async for checklist_data in _fan_out_checklist_async(client, origin, destination, duration, special_needs, itinerary_context):
+                yield _render_checklist_progress(_checklist_sections(checklist_data))
+            yield format_checklist_html(checklist_data)
+            return
+        
+        parser = StreamingJSONObjectParser()
+        sections = []
+        response = ""
+        async for chunk in client.stream_checklist(
+            origin=origin,
+            destination=destination,
+            duration=duration,
+            special_needs=special_needs,
+            itinerary_text=itinerary_context
+        ):
+            response += chunk
+            if _add_checklist_sections(parser.feed(chunk), sections):
+                yield _render_checklist_progress(sections)
+        
+        yield _finish_checklist_stream(parser, response)
     
-    return html
+    except Exception as e:
+        yield f"抱歉，生成清单时出现了错误: {str(e)}"
 
 
-def create_booking_guides_section(booking_guides: Dict[str, Any]) -> str:
-    """Create booking guides section HTML."""
-    html = """
-    <div style="background: #fff3e0; padding: 20px; border-radius: 10px; margin-bottom: 15px; border-left: 5px solid #e65100;">
-        <h3 style="margin: 0 0 15px 0; color: #e65100; font-size: 20px;">🎫 预订指南</h3>
+async def regenerate_itinerary_day_stream_async(trip: Optional[Trip],
+                                                day: int,
+                                                destination: str,
+                                                duration: str,
+                                                mobility: str,
+                                                health_focus: List[str],
+                                                change_request: str = "") -> AsyncIterator[Tuple[str, Optional[Trip]]]:
     """
+    Stream a new plan for one day from the async client; see regenerate_itinerary_day_stream.
     
-    for category, info in booking_guides.items():
-        if isinstance(info, dict):
-            html += f'<h4 style="color: #f57c00; margin: 10px 0 5px 0;">{info.get("title", category)}</h4>'
-            
-            platforms = info.get('platforms', [])
-            if platforms:
-                html += '<ul style="margin: 5px 0; padding-left: 20px; color: #555;">'
-                for platform in platforms:
-                    html += f'<li style="margin-bottom: 5px;">{platform}</li>'
-                html += '</ul>'
+    Args:
+        trip: The parsed itinerary
+        day: Day number to regenerate
+        destination: Travel destination
+        duration: Trip duration
+        mobility: Mobility status
+        health_focus: List of health concerns
+        change_request: What the user wants changed about this day
+        
+    Yields:
+        (itinerary text, updated trip); the trip is only set on the last item and is None on failure
+    """
+    destination = normalize_location(destination)
+    day = int(day or 0)
+    error = _check_regenerate_inputs(trip, day, destination, duration, mobility, change_request)
+    if error:
+        yield error, None
+        return
     
-    html += """
+    index = trip.find_day(day)
+    # The other days never change, so they are rendered once around the streamed day
+    before, after = _render_around_day(trip, index)
+    try:
+        client = get_async_client()
+        cleaner = ResponseCleaner()
+        response = ""
+        async for chunk in client.stream_itinerary_day(
+            destination=destination,
+            duration=duration,
+            mobility=mobility,
+            health_focus=format_health_focus(health_focus),
+            day=day,
+            change_request=(change_request or "").strip(),
+            **_day_context(trip, index)
+        ):
+            response += cleaner.feed(chunk)
+            yield before + ensure_day_heading(response, day) + after, None
+        response += cleaner.flush()
+        updated = _splice_itinerary_day(trip, index, response)
+        yield before + updated.days[index].text + after, updated
+    
+    except Exception as e:
+        yield f"抱歉，重新生成第{day}天时出现了错误: {str(e)}", None
+
+
+# Checklist categories in display order: key, title, background color, title color
+CHECKLIST_SECTIONS = [
+    ("documents", "📄 证件类", "#e8f4fd", "#2980b9"),
+    ("clothing", "👕 衣物类", "#fef9e7", "#f39c12"),
+    ("medications", "💊 药品类", "#ffe6e6", "#e74c3c"),
+    ("daily_items", "🧴 生活用品类", "#e8f8f5", "#27ae60"),
+    ("electronics", "📱 电子设备类", "#f0f3f4", "#95a5a6"),
+    ("financial", "💰 财务准备", "#eafaf1", "#2ecc71"),
+    ("safety", "🛡️ 安全用品", "#fadbd8", "#c0392b"),
+    ("entertainment", "🎮 娱乐用品", "#e8daef", "#8e44ad"),
+    ("special_items", "⭐ 特殊用品", "#fdedec", "#e91e63"),
+]
+_CHECKLIST_SECTION_STYLES = {key: (title, bg_color, title_color) for key, title, bg_color, title_color in CHECKLIST_SECTIONS}
+CHECKLIST_ORDER = [key for key, _, _, _ in CHECKLIST_SECTIONS] + ["booking_guides", "tips"]
+
+# Checklist markup uses the tc-* classes styled in CUSTOM_CSS, so the styles are not repeated per element
+CHECKLIST_HEADER_HTML = static_html("""
+    <div class="tc-checklist">
+        <div class="tc-intro">
+            <h1>🎁 专属旅行清单</h1>
+            <p>为您的旅行做好充分准备</p>
+        </div>
+    """)
+
+CHECKLIST_FOOTER_HTML = static_html("""
+        <div class="tc-footer">
+            <p>💡 此清单仅供参考，请根据实际情况调整</p>
+        </div>
+    </div>
+    """)
+
+CHECKLIST_PENDING_HTML = static_html("""
+        <div class="tc-pending">⏳ 正在生成更多清单内容...</div>
     </div>
+    """)
+
+
+# The category colors are the only per-section styles, passed as CSS variables
+_CHECKLIST_SECTION_HEAD = Template("""
+    <div class="tc-section" style="--tc-bg: {bg_color}; --tc-accent: {title_color};">
+        <h3>{title}</h3>
+        <ul>
+    """)
+_CHECKLIST_SECTION_TAIL = static_html("""
+        </ul>
+    </div>
+    """)
+_CHECKLIST_ITEM = ("<li>", "</li>")
+
+_BOOKING_GUIDES_HEAD = static_html("""
+    <div class="tc-section">
+        <h3>🎫 预订指南</h3>
+    """)
+_BOOKING_GUIDE = Template("<h4>{title}</h4>{platforms_html}")
+_BOOKING_PLATFORMS = ('<ul class="tc-platforms">', "</ul>")
+_BOOKING_PLATFORM = ("<li>", "</li>")
+
+_TIPS_HEAD = static_html("""
+    <div class="tc-section">
+        <h3>💡 温馨提示</h3>
+    """)
+_TIP = ("<p>• ", "</p>")
+_SECTION_TAIL = static_html("""
+    </div>
+    """)
+
+_CHECKLIST_TEXT = Template("""
+    <div class="tc-checklist">
+        <div class="tc-intro">
+            <h1>🎁 旅行清单</h1>
+            <p>为您的旅行做好充分准备</p>
+        </div>
+        
+        <div class="tc-text">
+            <pre>{text}</pre>
+        </div>
+        
+        <div class="tc-footer">
+            <p>💡 此清单仅供参考，请根据实际情况调整</p>
+        </div>
+    </div>
+    """)
+
+
+def format_checklist_html(data: Dict[str, Any]) -> str:
     """
+    Format checklist data as HTML.
     
-    return html
+    Args:
+        data: Parsed checklist data
+        
+    Returns:
+        HTML formatted checklist
+    """
+    parts = [CHECKLIST_HEADER_HTML]
+    parts.extend(render_checklist_member(key, data.get(key)) for key in CHECKLIST_ORDER)
+    parts.append(CHECKLIST_FOOTER_HTML)
+    return "".join(parts)
 
 
-def create_tips_section(tips: List[str]) -> str:
-    """Create tips section HTML."""
-    html = """
-    <div style="background: #fff3e0; padding: 20px; border-radius: 10px; margin-bottom: 15px; border-left: 5px solid #e65100;">
-        <h3 style="margin: 0 0 15px 0; color: #e65100; font-size: 20px;">💡 温馨提示</h3>
+def render_checklist_member(key: str, value: Any) -> str:
     """
+    Render one top-level checklist member as an HTML section.
     
-    for tip in tips:
-        html += f'<p style="margin: 8px 0; color: #555; line-height: 1.6;">• {tip}</p>'
-    
-    html += """
-    </div>
+    Args:
+        key: Checklist field, e.g. "documents"
+        value: Parsed value of that field
+        
+    Returns:
+        Section HTML, or an empty string for empty or unknown fields
     """
+    if not value:
+        return ""
+    if key in _CHECKLIST_SECTION_STYLES and isinstance(value, list):
+        title, bg_color, title_color = _CHECKLIST_SECTION_STYLES[key]
+        return create_checklist_section(title, value, bg_color, title_color)
+    if key == "booking_guides" and isinstance(value, dict):
+        return create_booking_guides_section(value)
+    if key == "tips" and isinstance(value, list):
+        return create_tips_section(value)
+    return ""
+
+
+@lru_cache(maxsize=64)
+def _checklist_section_head(title: str, bg_color: str, title_color: str) -> str:
+    """Opening markup of a checklist section, rendered once per category."""
+    return _CHECKLIST_SECTION_HEAD.render(title=title, bg_color=bg_color, title_color=title_color)
+
+
+def create_checklist_section(title: str, items: List[str], bg_color: str, title_color: str) -> str:
+    """Create a checklist section HTML."""
+    return "".join((_checklist_section_head(title, bg_color, title_color), escape_items(items, *_CHECKLIST_ITEM), _CHECKLIST_SECTION_TAIL))
+
+
+def create_booking_guides_section(booking_guides: Dict[str, Any]) -> str:
+    """Create booking guides section HTML."""
+    guides = []
+    for category, info in booking_guides.items():
+        if isinstance(info, dict):
+            platforms = info.get('platforms', [])
+            items = escape_items(platforms, *_BOOKING_PLATFORM) if platforms else ""
+            guides.append(_BOOKING_GUIDE.render(
+                title=info.get("title", category),
+                platforms_html=_BOOKING_PLATFORMS[0] + items + _BOOKING_PLATFORMS[1] if items else ""
+            ))
     
-    return html
+    return _BOOKING_GUIDES_HEAD + "".join(guides) + _SECTION_TAIL
+
+
+def create_tips_section(tips: List[str]) -> str:
+    """Create tips section HTML."""
+    return _TIPS_HEAD + escape_items(tips, *_TIP) + _SECTION_TAIL
 
 
 def format_checklist_text(response: str) -> str:
@@ -323,19 +1246,4 @@ def format_checklist_text(response: str) -> str:
     Returns:
         Basic HTML formatted text
     """
-    return f"""
-    <div style="font-family: 'Segoe UI', 'Microsoft YaHei', sans-serif; max-width: 800px; margin: 0 auto; background: #fafafa; padding: 20px; border-radius: 15px;">
-        <div style="text-align: center; margin-bottom: 30px;">
-            <h1 style="color: #2c3e50; font-size: 32px; margin-bottom: 10px;">🎁 旅行清单</h1>
-            <p style="color: #7f8c8d; font-size: 16px;">为您的旅行做好充分准备</p>
-        </div>
-        
-        <div style="background: white; padding: 20px; border-radius: 10px; margin-bottom: 15px; border: 1px solid #ddd;">
-            <pre style="white-space: pre-wrap; font-family: inherit; margin: 0; color: #555; line-height: 1.6;">{clean_response(response)}</pre>
-        </div>
-        
-        <div style="background: #f5f5f5; padding: 15px; border-radius: 8px; text-align: center; color: #666; font-size: 13px; margin-top: 20px;">
-            <p style="margin: 5px 0;">💡 此清单仅供参考，请根据实际情况调整</p>
-        </div>
-    </div>
-    """
\ No newline at end of file
+    return _CHECKLIST_TEXT.render(text=clean_response(response))
\ No newline at end of file
@@ -0,0 +1,282 @@
+"""
+Saved checklist store module for the travel assistant application.
+Keeps saved checklists and itineraries in one SQLite database instead of one JSON file each.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+try:
+    from ..config.config import CHECKLIST_DATA_DIR, CHECKLIST_DB_PATH, CHECKLIST_HISTORY_LIMIT
+except ImportError:
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config.config import CHECKLIST_DATA_DIR, CHECKLIST_DB_PATH, CHECKLIST_HISTORY_LIMIT
+
+# Bumped whenever the schema changes; stored in PRAGMA user_version
+_SCHEMA_VERSION = 1
+# Columns returned by history(); the payload is only read by load()
+_HISTORY_COLUMNS = "id, kind, origin, destination, duration, created_at"
+# Timestamp format of the files written by travel_assistant_improved.py
+_LEGACY_TIMESTAMP = "%Y-%m-%d %H:%M:%S"
+
+
+def _pack(data: Any) -> bytes:
+    """Serialize a payload as compressed JSON."""
+    return zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def _unpack(blob: bytes) -> Any:
+    """Inverse of _pack."""
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def _legacy_record(path: str) -> Optional[Tuple[str, str, str, str, str, Any]]:
+    """
+    Read one JSON file written by an older version.
+    
+    Two layouts exist: data.processors wrote {"metadata": {...}, "checklist": ...}
+    and travel_assistant_improved.py wrote {"id", "destination", "duration",
+    "timestamp", "data"}.
+    
+    Args:
+        path: Path of the JSON file
+        
+    Returns:
+        (id, origin, destination, duration, created_at, payload), or None for
+        files in neither layout
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        return None
+    
+    stem = os.path.splitext(os.path.basename(path))[0]
+    modified = datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+    if "checklist" in data and isinstance(data.get("metadata"), dict):
+        meta = data["metadata"]
+        return (
+            stem, meta.get("origin") or "", meta.get("destination") or "", meta.get("duration") or "",
+            meta.get("created_at") or modified, data["checklist"]
+        )
+    if "data" in data:
+        timestamp = data.get("timestamp") or ""
+        try:
+            created_at = datetime.strptime(timestamp, _LEGACY_TIMESTAMP).isoformat()
+        except ValueError:
+            created_at = timestamp or modified
+        return (
+            str(data.get("id") or stem), "", data.get("destination") or "", data.get("duration") or "",
+            created_at, data["data"]
+        )
+    return None
+
+
+class ChecklistStore:
+    """
+    SQLite store for saved checklists and itineraries.
+    
+    Payloads are stored as compressed JSON blobs next to indexed metadata
+    columns, so listing history reads one index range instead of opening
+    and parsing every saved file.
+    """
+    
+    def __init__(self, db_path: str = CHECKLIST_DB_PATH, legacy_dir: Optional[str] = CHECKLIST_DATA_DIR):
+        """
+        Initialize the store, creating the database on first use.
+        
+        Args:
+            db_path: Path of the SQLite database file
+            legacy_dir: Directory whose JSON files are imported when the
+                database is created (None skips the import)
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._init_db(legacy_dir)
+    
+    def save(self,
+             data: Any,
+             origin: str = "",
+             destination: str = "",
+             duration: str = "",
+             kind: str = "checklist",
+             record_id: Optional[str] = None) -> str:
+        """
+        Save a checklist or itinerary.
+        
+        Args:
+            data: JSON-serializable payload
+            origin: Departure location
+            destination: Travel destination
+            duration: Trip duration
+            kind: "checklist" or "itinerary"
+            record_id: Id to save under; a new one is generated if omitted,
+                an existing record with the same id is replaced
+                
+        Returns:
+            Id of the saved record
+        """
+        record_id = record_id or uuid.uuid4().hex
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO records (id, kind, origin, destination, duration, created_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (record_id, kind, origin or "", destination or "", duration or "",
+                 datetime.now().isoformat(), _pack(data))
+            )
+        return record_id
+    
+    def load(self, record_id: str) -> Optional[Any]:
+        """
+        Load a saved payload by id.
+        
+        Args:
+            record_id: Id returned by save
+            
+        Returns:
+            The payload, or None if there is no such record
+        """
+        row = self._connection().execute(
+            "SELECT payload FROM records WHERE id = ?", (record_id,)
+        ).fetchone()
+        return _unpack(row[0]) if row else None
+    
+    def history(self,
+                limit: int = CHECKLIST_HISTORY_LIMIT,
+                destination: Optional[str] = None,
+                origin: Optional[str] = None,
+                kind: Optional[str] = None,
+                before: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        List saved records, newest first, without reading their payloads.
+        
+        Args:
+            limit: Maximum number of records
+            destination: Only records for this destination
+            origin: Only records from this origin
+            kind: Only records of this kind
+            before: Only records created before this ISO timestamp, for paging
+            
+        Returns:
+            Records with id, kind, origin, destination, duration and created_at
+        """
+        clauses, params = [], []
+        for column, value in (("destination", destination), ("origin", origin), ("kind", kind)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if before is not None:
+            clauses.append("created_at < ?")
+            params.append(before)
+        
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        cursor = self._connection().execute(
+            f"SELECT {_HISTORY_COLUMNS} FROM records{where} ORDER BY created_at DESC, rowid DESC LIMIT ?",
+            params + [limit]
+        )
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    def delete(self, record_id: str) -> bool:
+        """
+        Delete a saved record.
+        
+        Args:
+            record_id: Id returned by save
+            
+        Returns:
+            True if a record was deleted
+        """
+        conn = self._connection()
+        with conn:
+            return conn.execute("DELETE FROM records WHERE id = ?", (record_id,)).rowcount > 0
+    
+    def import_json_dir(self, directory: str) -> int:
+        """
+        Import JSON files written by older versions; files already imported are skipped.
+        
+        Args:
+            directory: Directory holding the JSON files
+            
+        Returns:
+            Number of records imported
+        """
+        if not os.path.isdir(directory):
+            return 0
+        
+        rows = []
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                record = _legacy_record(os.path.join(directory, filename))
+            except (OSError, ValueError) as e:
+                print(f"导入清单文件失败 {filename}: {e}")
+                continue
+            if record:
+                rows.append(record[:-1] + (_pack(record[-1]),))
+        
+        conn = self._connection()
+        with conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO records (id, origin, destination, duration, created_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            return conn.total_changes - before
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Return the SQLite connection for the current thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5)
+            self._local.conn = conn
+        return conn
+    
+    def _init_db(self, legacy_dir: Optional[str]) -> None:
+        """Create the schema; a new database also imports the legacy JSON files once."""
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+            return
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL DEFAULT 'checklist', "
+                "origin TEXT NOT NULL DEFAULT '', destination TEXT NOT NULL DEFAULT '', "
+                "duration TEXT NOT NULL DEFAULT '', created_at TEXT NOT NULL, payload BLOB NOT NULL)"
+            )
+            # Filtered history reads one index range in created_at order
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_records_created ON records(created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_records_destination ON records(destination, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_records_origin ON records(origin, created_at)")
+        
+        # Importing is idempotent, so concurrent first starts are harmless
+        if legacy_dir:
+            imported = self.import_json_dir(legacy_dir)
+            if imported:
+                print(f"已导入 {imported} 条旧版清单记录")
+        conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+
+# Global store instance
+_store_instance = None
+
+
+def get_checklist_store() -> ChecklistStore:
+    """Get the global checklist store instance."""
+    global _store_instance
+    if _store_instance is None:
+        _store_instance = ChecklistStore()
+    return _store_instance
\ No newline at end of file
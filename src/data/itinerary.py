@@ -0,0 +1,185 @@
+"""
+Itinerary parsing and rendering module for the travel assistant application.
+Turns model output into a Trip once, so later steps read fields instead of re-scanning text.
+"""
+
+import re
+try:
+    from ..config.config import ITINERARY_CONTEXT_TOKEN_BUDGET
+    from ..utils.helpers import (
+        clean_response, safe_json_parse, split_itinerary_days, extract_hotels_from_itinerary,
+        compress_itinerary_context, TRANSPORT_KEYWORDS
+    )
+    from .models import Trip, Day, Activity, Meal, Hotel
+except ImportError:
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config.config import ITINERARY_CONTEXT_TOKEN_BUDGET
+    from utils.helpers import (
+        clean_response, safe_json_parse, split_itinerary_days, extract_hotels_from_itinerary,
+        compress_itinerary_context, TRANSPORT_KEYWORDS
+    )
+    from data.models import Trip, Day, Activity, Meal, Hotel
+
+# Markdown decoration around a line's content
+_DECORATION = " \t#*>-•"
+# Day heading prefix, e.g. "第3天：" or "Day 3 -"
+_HEADING_PREFIX = re.compile(r'^(?:第\s*[0-9一二两三四五六七八九十]+\s*天|Day\s*[0-9]+)[\s*]*[：:\-—、，,]?\s*', re.IGNORECASE)
+# Scheduled lines, e.g. "上午：游览西湖" or "09:00-11:00 游船"
+_ACTIVITY_LINE = re.compile(r'^(早上|上午|中午|下午|傍晚|晚上|\d{1,2}[:：]\d{2}(?:\s*[-~至]\s*\d{1,2}[:：]\d{2})?)\s*[：:]?\s*(.+)$')
+_MEAL_LINE = re.compile(r'^(早餐|午餐|晚餐)\s*[：:]\s*(.+)$')
+_REST_LINE = re.compile(r'^(?:休息安排|休息)\s*[：:]\s*(.+)$')
+_HOTEL_LINE = re.compile(r'^(?:住宿推荐|推荐住宿|住宿|入住|下榻|酒店)\s*[：:]\s*(.+)$')
+
+
+def parse_trip(response_text: str, destination: str = "", duration: str = "") -> Trip:
+    """
+    Parse an itinerary response into a Trip.
+    
+    A JSON itinerary (see build_itinerary_prompts(structured=True)) is read
+    field by field. Prose is split into days, and each day keeps its
+    original text alongside the activities, meals and hotel found in it.
+    
+    Args:
+        response_text: Model output
+        destination: Travel destination, used when the response does not name it
+        duration: Trip duration, used when the response does not name it
+        
+    Returns:
+        The parsed trip; days is empty when no day structure was found
+    """
+    data = safe_json_parse(response_text) if "{" in (response_text or "") else None
+    if isinstance(data, dict) and isinstance(data.get("days"), list):
+        return Trip.from_dict(data, destination, duration)
+    
+    segments = split_itinerary_days(clean_response(response_text or ""))
+    return Trip(
+        destination=destination,
+        duration=duration,
+        overview=segments["preamble"],
+        days=[parse_day_text(segment["day"], segment["text"]) for segment in segments["days"]],
+        notes=segments["epilogue"]
+    )
+
+
+def parse_day_text(day: int, day_text: str) -> Day:
+    """
+    Parse the prose of one day.
+    
+    Args:
+        day: Day number
+        day_text: The day's text, starting with its heading
+        
+    Returns:
+        Day with the text kept verbatim and the recognisable fields filled in
+    """
+    lines = [line.strip(_DECORATION) for line in day_text.splitlines()]
+    lines = [line for line in lines if line]
+    title = _HEADING_PREFIX.sub("", lines[0]).strip(_DECORATION) if lines else ""
+    
+    activities, meals, rest, hotel = [], [], "", None
+    for line in lines[1:]:
+        match = _HOTEL_LINE.match(line)
+        if match:
+            hotel = hotel or Hotel(match.group(1).strip())
+            continue
+        match = _MEAL_LINE.match(line)
+        if match:
+            meals.append(Meal(match.group(1), match.group(2).strip()))
+            continue
+        match = _REST_LINE.match(line)
+        if match:
+            rest = rest or match.group(1).strip()
+            continue
+        match = _ACTIVITY_LINE.match(line)
+        if match:
+            description = match.group(2).strip()
+            transport = next((keyword for keyword in TRANSPORT_KEYWORDS if keyword in description), "")
+            activities.append(Activity(match.group(1), description, transport=transport))
+    
+    if hotel is None:
+        hotels = extract_hotels_from_itinerary(day_text, limit=1)
+        hotel = Hotel(hotels[0]) if hotels else None
+    return Day(
+        day=day,
+        title=title,
+        activities=activities,
+        meals=meals,
+        hotel=hotel,
+        rest=rest,
+        text=day_text
+    )
+
+
+def render_day_text(day: Day) -> str:
+    """
+    Render one day as text.
+    
+    Args:
+        day: Day to render
+        
+    Returns:
+        The original text when the day was parsed from prose, otherwise text built from its fields
+    """
+    if day.text:
+        return day.text
+    
+    lines = [f"第{day.day}天：{day.title}" if day.title else f"第{day.day}天"]
+    for activity in day.activities:
+        line = f"- {activity.time}：{activity.description}" if activity.time else f"- {activity.description}"
+        if activity.location:
+            line += f"（{activity.location}）"
+        if activity.transport:
+            line += f"，交通：{activity.transport}"
+        lines.append(line)
+    for meal in day.meals:
+        lines.append(f"- {meal.slot}：{meal.suggestion}" if meal.slot else f"- 餐饮：{meal.suggestion}")
+    if day.hotel:
+        lines.append(f"- 住宿：{day.hotel.name}" + (f"（{day.hotel.note}）" if day.hotel.note else ""))
+    if day.rest:
+        lines.append(f"- 休息安排：{day.rest}")
+    return "\n".join(lines)
+
+
+def render_trip_text(trip: Trip) -> str:
+    """
+    Render a trip as text.
+    
+    Args:
+        trip: Trip to render
+        
+    Returns:
+        Overview, each day and the closing notes separated by blank lines
+    """
+    parts = [trip.overview]
+    if trip.highlights:
+        parts.append("🌟 行程亮点\n" + "\n".join(f"- {item}" for item in trip.highlights))
+    parts.extend(render_day_text(day) for day in trip.days)
+    parts.append(trip.notes)
+    if trip.tips:
+        parts.append("⚠️ 注意事项\n" + "\n".join(f"- {item}" for item in trip.tips))
+    if trip.emergency:
+        parts.append("🚑 应急准备\n" + "\n".join(f"- {item}" for item in trip.emergency))
+    if trip.estimated_cost:
+        parts.append(f"💰 预估费用：{trip.estimated_cost}")
+    return "\n\n".join(part for part in parts if part)
+
+
+def trip_checklist_context(trip: Trip, token_budget: int = ITINERARY_CONTEXT_TOKEN_BUDGET) -> str:
+    """
+    Condense a trip into the facts a packing checklist needs.
+    
+    Hotels and transport come straight from the parsed fields; climate and
+    activity hints are still picked from the rendered text.
+    
+    Args:
+        trip: Parsed trip
+        token_budget: Maximum estimated tokens for the result
+        
+    Returns:
+        Compact multi-line context, or an empty string if nothing relevant was found
+    """
+    return compress_itinerary_context(
+        render_trip_text(trip), token_budget, hotels=trip.hotels(), transports=trip.transports() or None
+    )
@@ -0,0 +1,183 @@
+"""
+Itinerary data model for the travel assistant application.
+Compact slotted classes for a trip and its days, activities, hotels and meals.
+"""
+
+from dataclasses import dataclass, field, fields, asdict
+from typing import Any, Dict, List, Optional
+
+
+def _slotted(cls):
+    """
+    Rebuild a dataclass with __slots__.
+    
+    Equivalent to dataclass(slots=True), which needs Python 3.10. Slotted
+    instances carry no per-instance __dict__, so a long trip with hundreds of
+    activities stays small in session state.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names + ("__dict__", "__weakref__"):
+        namespace.pop(name, None)
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def _text(value: Any) -> str:
+    """Coerce a JSON value to a stripped string."""
+    return "" if value is None else str(value).strip()
+
+
+def _text_list(value: Any) -> List[str]:
+    """Coerce a JSON value to a list of non-empty strings."""
+    if isinstance(value, (list, tuple)):
+        return [_text(item) for item in value if _text(item)]
+    return [_text(value)] if _text(value) else []
+
+
+@_slotted
+@dataclass
+class Meal:
+    """A meal suggestion, e.g. slot "午餐" with the restaurant or dish."""
+    slot: str
+    suggestion: str
+    
+    @classmethod
+    def from_dict(cls, data: Any) -> "Meal":
+        """Build from {"slot": ..., "suggestion": ...} or a bare string."""
+        if isinstance(data, dict):
+            return cls(_text(data.get("slot")), _text(data.get("suggestion") or data.get("name")))
+        return cls("", _text(data))
+
+
+@_slotted
+@dataclass
+class Hotel:
+    """Where the travellers stay for the night."""
+    name: str
+    note: str = ""
+    
+    @classmethod
+    def from_dict(cls, data: Any) -> Optional["Hotel"]:
+        """Build from {"name": ..., "note": ...} or a bare string; None when there is no name."""
+        if isinstance(data, dict):
+            name, note = _text(data.get("name")), _text(data.get("note"))
+        else:
+            name, note = _text(data), ""
+        return cls(name, note) if name else None
+
+
+@_slotted
+@dataclass
+class Activity:
+    """One scheduled item of a day."""
+    time: str
+    description: str
+    location: str = ""
+    transport: str = ""
+    
+    @classmethod
+    def from_dict(cls, data: Any) -> "Activity":
+        """Build from {"time", "description", "location", "transport"} or a bare string."""
+        if isinstance(data, dict):
+            return cls(
+                _text(data.get("time")),
+                _text(data.get("description") or data.get("activity")),
+                _text(data.get("location")),
+                _text(data.get("transport"))
+            )
+        return cls("", _text(data))
+
+
+@_slotted
+@dataclass
+class Day:
+    """
+    One day of a trip.
+    
+    text holds the day exactly as the model wrote it when the itinerary was
+    parsed from prose; renderers then reproduce it verbatim.
+    """
+    day: int
+    title: str = ""
+    activities: List[Activity] = field(default_factory=list)
+    meals: List[Meal] = field(default_factory=list)
+    hotel: Optional[Hotel] = None
+    rest: str = ""
+    text: str = ""
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], default_day: int) -> "Day":
+        """Build from one entry of the "days" list of a JSON itinerary."""
+        meals = data.get("meals") or []
+        if isinstance(meals, dict):
+            meals = [{"slot": slot, "suggestion": suggestion} for slot, suggestion in meals.items()]
+        try:
+            day = int(data.get("day") or default_day)
+        except (TypeError, ValueError):
+            day = default_day
+        return cls(
+            day=day,
+            title=_text(data.get("title")),
+            activities=[Activity.from_dict(item) for item in data.get("activities") or []],
+            meals=[Meal.from_dict(item) for item in meals],
+            hotel=Hotel.from_dict(data.get("hotel")),
+            rest=_text(data.get("rest"))
+        )
+
+
+@_slotted
+@dataclass
+class Trip:
+    """
+    A whole itinerary.
+    
+    overview and notes hold the text before the first day and after the last
+    one when parsed from prose; a JSON itinerary fills summary-style fields
+    (highlights, tips, emergency) instead.
+    """
+    destination: str = ""
+    duration: str = ""
+    overview: str = ""
+    days: List[Day] = field(default_factory=list)
+    highlights: List[str] = field(default_factory=list)
+    tips: List[str] = field(default_factory=list)
+    emergency: List[str] = field(default_factory=list)
+    estimated_cost: str = ""
+    notes: str = ""
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], destination: str = "", duration: str = "") -> "Trip":
+        """Build from a JSON itinerary response."""
+        days = data.get("days") or []
+        return cls(
+            destination=_text(data.get("destination")) or destination,
+            duration=_text(data.get("duration")) or duration,
+            overview=_text(data.get("summary") or data.get("overview")),
+            days=[Day.from_dict(item, index) for index, item in enumerate(days, 1) if isinstance(item, dict)],
+            highlights=_text_list(data.get("highlights")),
+            tips=_text_list(data.get("tips")),
+            emergency=_text_list(data.get("emergency")),
+            estimated_cost=_text(data.get("estimated_cost"))
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict form, e.g. for saving as JSON."""
+        return asdict(self)
+    
+    def hotels(self) -> List[str]:
+        """Distinct hotel names in day order."""
+        return list(dict.fromkeys(day.hotel.name for day in self.days if day.hotel))
+    
+    def transports(self) -> List[str]:
+        """Distinct transport modes used by the activities."""
+        return list(dict.fromkeys(
+            activity.transport for day in self.days for activity in day.activities if activity.transport
+        ))
+    
+    def find_day(self, day: int) -> int:
+        """Index of a day number in days, or -1."""
+        for index, item in enumerate(self.days):
+            if item.day == day:
+                return index
+        return -1
@@ -4,17 +4,24 @@ Contains functions for processing and formatting travel data.
 """
 
 import json
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from typing import Dict, Any, List, Optional, Union
 import os
 
 try:
+    from ..config.config import CHECKLIST_HISTORY_LIMIT
     from ..utils.helpers import sanitize_filename
+    from ..utils.templates import Template, escape, escape_items
+    from .models import Trip
+    from .checklist_store import get_checklist_store
 except ImportError:
     import sys
     import os
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config.config import CHECKLIST_HISTORY_LIMIT
     from utils.helpers import sanitize_filename
+    from utils.templates import Template, escape, escape_items
+    from data.models import Trip
+    from data.checklist_store import get_checklist_store
 
 
 def save_checklist_data(data: Dict[str, Any], 
@@ -22,7 +29,7 @@ def save_checklist_data(data: Dict[str, Any],
                        destination: str, 
                        duration: str) -> Optional[str]:
     """
-    Save checklist data to a JSON file.
+    Save checklist data to the checklist store.
     
     Args:
         data: Checklist data to save
@@ -31,187 +38,208 @@ def save_checklist_data(data: Dict[str, Any],
         duration: Trip duration
         
     Returns:
-        Path to saved file or None if save failed
+        Id of the saved record or None if save failed
     """
     try:
-        # Create data directory if it doesn't exist
-        data_dir = "checklist_data"
-        os.makedirs(data_dir, exist_ok=True)
-        
-        # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_origin = origin.replace(" ", "_").replace("/", "_")[:20]
-        safe_destination = destination.replace(" ", "_").replace("/", "_")[:20]
-        filename = f"checklist_{safe_origin}_to_{safe_destination}_{duration}_{timestamp}.json"
-        
-        # Ensure filename is safe
-        filename = "".join(c for c in filename if c.isalnum() or c in "._-")
-        
-        filepath = os.path.join(data_dir, filename)
-        
-        # Add metadata
-        data_with_metadata = {
-            "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "origin": origin,
-                "destination": destination,
-                "duration": duration,
-                "version": "1.0"
-            },
-            "checklist": data
-        }
-        
-        # Save to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data_with_metadata, f, ensure_ascii=False, indent=2)
-        
-        return filepath
-        
+        return get_checklist_store().save(data, origin=origin, destination=destination, duration=duration)
+    
     except Exception as e:
         print(f"保存清单数据失败: {e}")
         return None
 
 
-def load_checklist_data(filepath: str) -> Optional[Dict[str, Any]]:
+def save_itinerary_data(itinerary: Union[str, Trip], destination: str, duration: str) -> Optional[str]:
     """
-    Load checklist data from a JSON file.
+    Save an itinerary to the checklist store.
     
     Args:
-        filepath: Path to the JSON file
+        itinerary: Itinerary text or parsed Trip
+        destination: Travel destination
+        duration: Trip duration
         
+    Returns:
+        Id of the saved record or None if save failed
+    """
+    try:
+        data = itinerary.to_dict() if isinstance(itinerary, Trip) else {"text": itinerary}
+        return get_checklist_store().save(data, destination=destination, duration=duration, kind="itinerary")
+    
+    except Exception as e:
+        print(f"保存行程数据失败: {e}")
+        return None
+
+
+def load_checklist_data(record_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load checklist data from the checklist store.
+    
+    Args:
+        record_id: Id returned by save_checklist_data; a path to a JSON file
+            saved by an older version is still read directly
+            
     Returns:
         Loaded checklist data or None if load failed
     """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if record_id.endswith(".json") and os.path.isfile(record_id):
+            with open(record_id, 'r', encoding='utf-8') as f:
+                data = json.load(f)
             
-        # Return the checklist data, not the metadata
-        return data.get("checklist", data)
+            # Return the checklist data, not the metadata
+            return data.get("checklist", data)
         
+        return get_checklist_store().load(record_id)
+    
     except Exception as e:
         print(f"加载清单数据失败: {e}")
         return None
 
 
-def format_travel_history(travel_data: List[Dict[str, Any]]) -> str:
+def list_saved_checklists(limit: int = CHECKLIST_HISTORY_LIMIT,
+                          destination: Optional[str] = None,
+                          origin: Optional[str] = None) -> List[Dict[str, str]]:
     """
-    Format travel history data for display.
+    List saved checklists and itineraries, newest first.
     
     Args:
-        travel_data: List of travel records
+        limit: Maximum number of records
+        destination: Only records for this destination
+        origin: Only records from this origin
         
     Returns:
-        Formatted HTML string
+        Records with id, kind, origin, destination, duration and created_at
     """
-    if not travel_data:
-        return "<p>暂无旅行记录</p>"
+    try:
+        return get_checklist_store().history(limit=limit, destination=destination, origin=origin)
     
-    html = """
+    except Exception as e:
+        print(f"读取清单历史失败: {e}")
+        return []
+
+
+_HISTORY_HEAD = """
     <div style="font-family: 'Segoe UI', 'Microsoft YaHei', sans-serif;">
         <h3>旅行历史记录</h3>
         <div style="display: grid; gap: 15px;">
     """
-    
-    for record in travel_data:
-        html += f"""
+_HISTORY_RECORD = Template("""
         <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; border-left: 4px solid #007bff;">
             <div style="display: flex; justify-content: between; align-items: center;">
-                <h4 style="margin: 0 0 10px 0; color: #333;">{record.get('destination', '未知目的地')}</h4>
-                <span style="color: #666; font-size: 14px;">{record.get('date', '未知日期')}</span>
+                <h4 style="margin: 0 0 10px 0; color: #333;">{destination}</h4>
+                <span style="color: #666; font-size: 14px;">{date}</span>
             </div>
-            <p style="margin: 5px 0; color: #555;">出发地: {record.get('origin', '未知')}</p>
-            <p style="margin: 5px 0; color: #555;">时长: {record.get('duration', '未知')}</p>
-            <p style="margin: 5px 0; color: #555;">备注: {record.get('notes', '无')}</p>
+            <p style="margin: 5px 0; color: #555;">出发地: {origin}</p>
+            <p style="margin: 5px 0; color: #555;">时长: {duration}</p>
+            <p style="margin: 5px 0; color: #555;">备注: {notes}</p>
         </div>
-        """
-    
-    html += """
+        """)
+_HISTORY_TAIL = """
         </div>
     </div>
     """
-    
-    return html
 
 
-def process_weather_data(weather_data: Dict[str, Any]) -> str:
+def format_travel_history(travel_data: List[Dict[str, Any]]) -> str:
     """
-    Process weather data and format for display.
+    Format travel history data for display.
     
     Args:
-        weather_data: Raw weather data
+        travel_data: List of travel records
         
     Returns:
-        Formatted weather information HTML
+        Formatted HTML string
     """
-    try:
-        location = weather_data.get("location", "未知地区")
-        current = weather_data.get("current", {})
-        forecast = weather_data.get("forecast", [])
-        
-        html = f"""
+    if not travel_data:
+        return "<p>暂无旅行记录</p>"
+    
+    records = [
+        _HISTORY_RECORD.render(
+            destination=record.get('destination', '未知目的地'),
+            date=record.get('date', '未知日期'),
+            origin=record.get('origin', '未知'),
+            duration=record.get('duration', '未知'),
+            notes=record.get('notes', '无')
+        )
+        for record in travel_data
+    ]
+    return _HISTORY_HEAD + "".join(records) + _HISTORY_TAIL
+
+
+_WEATHER_HEAD = Template("""
         <div style="font-family: 'Segoe UI', 'Microsoft YaHei', sans-serif; background: linear-gradient(135deg, #74b9ff, #0984e3); color: white; padding: 20px; border-radius: 15px;">
             <h3 style="margin: 0 0 15px 0; text-align: center;">🌤️ {location} 天气信息</h3>
             
             <div style="background: rgba(255,255,255,0.2); padding: 15px; border-radius: 10px; margin-bottom: 15px;">
                 <h4 style="margin: 0 0 10px 0;">当前天气</h4>
-                <p style="margin: 5px 0;">温度: {current.get('temperature', '未知')}°C</p>
-                <p style="margin: 5px 0;">天气: {current.get('condition', '未知')}</p>
-                <p style="margin: 5px 0;">湿度: {current.get('humidity', '未知')}%</p>
-                <p style="margin: 5px 0;">风速: {current.get('wind_speed', '未知')} km/h</p>
+                <p style="margin: 5px 0;">温度: {temperature}°C</p>
+                <p style="margin: 5px 0;">天气: {condition}</p>
+                <p style="margin: 5px 0;">湿度: {humidity}%</p>
+                <p style="margin: 5px 0;">风速: {wind_speed} km/h</p>
             </div>
-        """
-        
-        if forecast:
-            html += """
+        """)
+_FORECAST_HEAD = """
             <div style="background: rgba(255,255,255,0.2); padding: 15px; border-radius: 10px;">
                 <h4 style="margin: 0 0 10px 0;">未来预报</h4>
                 <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(120px, 1fr)); gap: 10px;">
             """
-            
-            for day in forecast[:5]:  # Show only 5 days
-                html += f"""
+_FORECAST_DAY = Template("""
                 <div style="background: rgba(255,255,255,0.1); padding: 10px; border-radius: 8px; text-align: center;">
-                    <p style="margin: 0; font-weight: bold;">{day.get('date', '')}</p>
-                    <p style="margin: 5px 0;">{day.get('condition', '未知')}</p>
-                    <p style="margin: 0; font-size: 14px;">{day.get('high', '未知')}° / {day.get('low', '未知')}°</p>
+                    <p style="margin: 0; font-weight: bold;">{date}</p>
+                    <p style="margin: 5px 0;">{condition}</p>
+                    <p style="margin: 0; font-size: 14px;">{high}° / {low}°</p>
                 </div>
-                """
-            
-            html += """
+                """)
+_FORECAST_TAIL = """
                 </div>
             </div>
         """
-        
-        html += """
+_WEATHER_TAIL = """
         </div>
         """
-        
-        return html
-        
-    except Exception as e:
-        return f"<p style='color: red;'>天气数据处理失败: {str(e)}</p>"
 
 
-def format_destination_info(destination_data: Dict[str, Any]) -> str:
+def process_weather_data(weather_data: Dict[str, Any]) -> str:
     """
-    Format destination information for display.
+    Process weather data and format for display.
     
     Args:
-        destination_data: Destination information data
+        weather_data: Raw weather data
         
     Returns:
-        Formatted HTML string
+        Formatted weather information HTML
     """
     try:
-        name = destination_data.get("name", "未知目的地")
-        description = destination_data.get("description", "暂无描述")
-        attractions = destination_data.get("attractions", [])
-        best_time = destination_data.get("best_time", "全年")
-        transportation = destination_data.get("transportation", "")
-        accommodation = destination_data.get("accommodation", [])
+        location = weather_data.get("location", "未知地区")
+        current = weather_data.get("current", {})
+        forecast = weather_data.get("forecast", [])
         
-        html = f"""
+        parts = [_WEATHER_HEAD.render(
+            location=location,
+            temperature=current.get('temperature', '未知'),
+            condition=current.get('condition', '未知'),
+            humidity=current.get('humidity', '未知'),
+            wind_speed=current.get('wind_speed', '未知')
+        )]
+        
+        if forecast:
+            parts.append(_FORECAST_HEAD)
+            for day in forecast[:5]:  # Show only 5 days
+                parts.append(_FORECAST_DAY.render(
+                    date=day.get('date', ''),
+                    condition=day.get('condition', '未知'),
+                    high=day.get('high', '未知'),
+                    low=day.get('low', '未知')
+                ))
+            parts.append(_FORECAST_TAIL)
+        
+        parts.append(_WEATHER_TAIL)
+        return "".join(parts)
+    
+    except Exception as e:
+        return f"<p style='color: red;'>天气数据处理失败: {escape(e)}</p>"
+
+
+_DESTINATION_HEAD = Template("""
         <div style="font-family: 'Segoe UI', 'Microsoft YaHei', sans-serif; background: #f8f9fa; padding: 20px; border-radius: 15px; border: 1px solid #e9ecef;">
             <h2 style="color: #2c3e50; margin: 0 0 20px 0; text-align: center;">🏞️ {name}</h2>
             
@@ -224,73 +252,70 @@ def format_destination_info(destination_data: Dict[str, Any]) -> str:
                 <h4 style="color: #34495e; margin: 0 0 10px 0;">🌸 最佳旅游时间</h4>
                 <p style="color: #555; margin: 0;">{best_time}</p>
             </div>
-        """
-        
-        if transportation:
-            html += f"""
+        """)
+_DESTINATION_TRANSPORT = Template("""
             <div style="background: white; padding: 15px; border-radius: 10px; margin-bottom: 15px;">
                 <h4 style="color: #34495e; margin: 0 0 10px 0;">🚗 交通信息</h4>
                 <p style="color: #555; margin: 0;">{transportation}</p>
             </div>
-            """
-        
-        if attractions:
-            html += """
+            """)
+_ATTRACTIONS_HEAD = """
             <div style="background: white; padding: 15px; border-radius: 10px; margin-bottom: 15px;">
                 <h4 style="color: #34495e; margin: 0 0 10px 0;">🎯 主要景点</h4>
                 <ul style="margin: 0; padding-left: 20px; color: #555;">
             """
-            
-            for attraction in attractions:
-                html += f'<li style="margin-bottom: 5px;">{attraction}</li>'
-            
-            html += """
-                </ul>
-            </div>
-            """
-        
-        if accommodation:
-            html += """
+_ACCOMMODATION_HEAD = """
             <div style="background: white; padding: 15px; border-radius: 10px;">
                 <h4 style="color: #34495e; margin: 0 0 10px 0;">🏨 住宿推荐</h4>
                 <ul style="margin: 0; padding-left: 20px; color: #555;">
             """
-            
-            for hotel in accommodation:
-                html += f'<li style="margin-bottom: 5px;">{hotel}</li>'
-            
-            html += """
+_DESTINATION_LIST_TAIL = """
                 </ul>
             </div>
             """
-        
-        html += """
+_DESTINATION_TAIL = """
         </div>
         """
-        
-        return html
-        
-    except Exception as e:
-        return f"<p style='color: red;'>目的地信息格式化失败: {str(e)}</p>"
+_LIST_ITEM = ('<li style="margin-bottom: 5px;">', '</li>')
 
 
-def create_travel_summary(travel_plan: Dict[str, Any]) -> str:
+def format_destination_info(destination_data: Dict[str, Any]) -> str:
     """
-    Create a travel summary from travel plan data.
+    Format destination information for display.
     
     Args:
-        travel_plan: Travel plan data
+        destination_data: Destination information data
         
     Returns:
-        Formatted summary HTML
+        Formatted HTML string
     """
     try:
-        destination = travel_plan.get("destination", "未知")
-        duration = travel_plan.get("duration", "未知")
-        total_cost = travel_plan.get("estimated_cost", "未估算")
-        highlights = travel_plan.get("highlights", [])
+        name = destination_data.get("name", "未知目的地")
+        description = destination_data.get("description", "暂无描述")
+        attractions = destination_data.get("attractions", [])
+        best_time = destination_data.get("best_time", "全年")
+        transportation = destination_data.get("transportation", "")
+        accommodation = destination_data.get("accommodation", [])
+        
+        parts = [_DESTINATION_HEAD.render(name=name, description=description, best_time=best_time)]
         
-        html = f"""
+        if transportation:
+            parts.append(_DESTINATION_TRANSPORT.render(transportation=transportation))
+        
+        if attractions:
+            parts += [_ATTRACTIONS_HEAD, escape_items(attractions, *_LIST_ITEM), _DESTINATION_LIST_TAIL]
+        
+        if accommodation:
+            parts += [_ACCOMMODATION_HEAD, escape_items(accommodation, *_LIST_ITEM), _DESTINATION_LIST_TAIL]
+        
+        parts.append(_DESTINATION_TAIL)
+        return "".join(parts)
+    
+    except Exception as e:
+        return f"<p style='color: red;'>目的地信息格式化失败: {escape(e)}</p>"
+
+
+_SUMMARY = Template("""
         <div style="font-family: 'Segoe UI', 'Microsoft YaHei', sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 25px; border-radius: 15px; margin-bottom: 20px;">
             <h3 style="margin: 0 0 15px 0; text-align: center; font-size: 24px;">📋 旅行计划摘要</h3>
             
@@ -303,18 +328,40 @@ def create_travel_summary(travel_plan: Dict[str, Any]) -> str:
             <div style="background: rgba(255,255,255,0.1); padding: 15px; border-radius: 10px;">
                 <h4 style="margin: 0 0 10px 0;">🌟 行程亮点</h4>
                 <ul style="margin: 0; padding-left: 20px;">
-        """
-        
-        for highlight in highlights:
-            html += f'<li style="margin-bottom: 5px;">{highlight}</li>'
-        
-        html += """
+        {highlights_html}
                 </ul>
             </div>
         </div>
-        """
+        """)
+
+
+def create_travel_summary(travel_plan: Union[Dict[str, Any], Trip]) -> str:
+    """
+    Create a travel summary from travel plan data.
+    
+    Args:
+        travel_plan: Travel plan data, or a parsed Trip whose fields are read directly
         
-        return html
+    Returns:
+        Formatted summary HTML
+    """
+    try:
+        if isinstance(travel_plan, Trip):
+            travel_plan = {
+                "destination": travel_plan.destination or "未知",
+                "duration": travel_plan.duration or "未知",
+                "estimated_cost": travel_plan.estimated_cost or "未估算",
+                "highlights": travel_plan.highlights or [
+                    f"第{day.day}天：{day.title}" for day in travel_plan.days if day.title
+                ],
+            }
         
+        return _SUMMARY.render(
+            destination=travel_plan.get("destination", "未知"),
+            duration=travel_plan.get("duration", "未知"),
+            total_cost=travel_plan.get("estimated_cost", "未估算"),
+            highlights_html=escape_items(travel_plan.get("highlights", []), *_LIST_ITEM)
+        )
+    
     except Exception as e:
-        return f"<p style='color: red;'>旅行摘要生成失败: {str(e)}</p>"
\ No newline at end of file
+        return f"<p style='color: red;'>旅行摘要生成失败: {escape(e)}</p>"
\ No newline at end of file
@@ -0,0 +1,298 @@
+"""
+Session store module for the travel assistant application.
+Keeps each session's itinerary on the server so UI events only pass a short reference.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+try:
+    from ..config.config import SESSION_TTL_SECONDS, SESSION_STORE_MAX_SESSIONS, SESSION_STORE_MAX_BYTES, SESSION_SPILL_DIR
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config.config import SESSION_TTL_SECONDS, SESSION_STORE_MAX_SESSIONS, SESSION_STORE_MAX_BYTES, SESSION_SPILL_DIR
+
+# References look like "<session id>#<version>"
+_REF_SEPARATOR = "#"
+# Spilled sessions are files named after a hash of the session id
+_SPILL_SUFFIX = ".session"
+# Seconds between sweeps of expired spill files
+_SPILL_SWEEP_INTERVAL = 60
+
+
+class _Session:
+    """A session's stored values and bookkeeping."""
+    
+    __slots__ = ("values", "version", "accessed_at", "size")
+    
+    def __init__(self, values: Dict[str, Any], version: int, accessed_at: float):
+        self.values = values
+        self.version = version
+        self.accessed_at = accessed_at
+        self.size = sum(_sizeof(value) for value in values.values())
+
+
+def _sizeof(value: Any) -> int:
+    """Approximate memory held by a stored value, in bytes."""
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    try:
+        return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def session_of(ref: str) -> str:
+    """
+    Get the session id a reference points to.
+    
+    Args:
+        ref: Reference returned by SessionStore.put
+        
+    Returns:
+        Session id, or an empty string for an empty reference
+    """
+    return (ref or "").rsplit(_REF_SEPARATOR, 1)[0]
+
+
+class SessionStore:
+    """
+    Per-session values kept on the server and referenced from the UI by a short string.
+    
+    Sessions are evicted least recently used first once there are more than
+    max_sessions of them or their values take more than max_bytes, and expire
+    ttl_seconds after their last use. With a spill directory, evicted sessions
+    are written to disk and loaded back on their next use instead of dropped.
+    """
+    
+    def __init__(self,
+                 ttl_seconds: float = SESSION_TTL_SECONDS,
+                 max_sessions: int = SESSION_STORE_MAX_SESSIONS,
+                 max_bytes: int = SESSION_STORE_MAX_BYTES,
+                 spill_dir: Optional[str] = SESSION_SPILL_DIR):
+        """
+        Initialize the store.
+        
+        Args:
+            ttl_seconds: Idle time after which a session expires
+            max_sessions: Maximum number of sessions kept in memory
+            max_bytes: Maximum approximate size of the values kept in memory
+            spill_dir: Directory for sessions evicted from memory (None or empty disables it)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self._resident_bytes = 0
+        self._lock = threading.Lock()
+        self._spill_dir = None
+        self._last_sweep = 0.0
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evicted = 0
+        self._spilled = 0
+        self._loaded = 0
+        
+        if spill_dir:
+            try:
+                os.makedirs(spill_dir, exist_ok=True)
+                self._spill_dir = spill_dir
+            except OSError as e:
+                print(f"会话存储磁盘目录创建失败，淘汰的会话将直接丢弃: {e}")
+    
+    def put(self, session_id: str, **values: Any) -> str:
+        """
+        Store values for a session, merged into the values it already has.
+        
+        Args:
+            session_id: Session id, e.g. the Gradio session hash
+            **values: Values to store, e.g. itinerary="..."
+            
+        Returns:
+            Reference to pass through the UI; it changes on every put, so
+            change listeners on the component holding it fire
+        """
+        now = time.time()
+        with self._lock:
+            session = self._take(session_id, now)
+            merged = dict(session.values) if session else {}
+            merged.update(values)
+            session = _Session(merged, session.version + 1 if session else 1, now)
+            self._insert(session_id, session)
+            self._evict(now)
+            return f"{session_id}{_REF_SEPARATOR}{session.version}"
+    
+    def get(self, ref: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the values of the session a reference points to.
+        
+        Args:
+            ref: Reference returned by put, or a bare session id
+            
+        Returns:
+            A copy of the stored values, or None if the session is unknown or expired
+        """
+        session_id = session_of(ref)
+        if not session_id:
+            return None
+        now = time.time()
+        with self._lock:
+            session = self._take(session_id, now)
+            if session is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            session.accessed_at = now
+            self._insert(session_id, session)
+            self._evict(now)
+            return dict(session.values)
+    
+    def discard(self, session_id: str) -> None:
+        """
+        Remove a session from memory and disk.
+        
+        Args:
+            session_id: Session id
+        """
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._resident_bytes -= session.size
+            if self._spill_dir:
+                try:
+                    os.remove(self._spill_path(session_id))
+                except OSError:
+                    pass
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get session store metrics.
+        
+        Returns:
+            Dictionary with the resident session count and bytes, the limits,
+            and hit, miss, expiry, eviction, spill and load counters
+        """
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "resident_bytes": self._resident_bytes,
+                "max_sessions": self.max_sessions,
+                "max_bytes": self.max_bytes,
+                "spill_enabled": self._spill_dir is not None,
+                "hits": self._hits,
+                "misses": self._misses,
+                "expired": self._expired,
+                "evicted": self._evicted,
+                "spilled": self._spilled,
+                "loaded": self._loaded,
+            }
+    
+    def _take(self, session_id: str, now: float) -> Optional[_Session]:
+        """Remove a live session from memory or disk; call with the lock held."""
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._resident_bytes -= session.size
+        else:
+            session = self._load(session_id)
+        if session is not None and now - session.accessed_at > self.ttl_seconds:
+            self._expired += 1
+            return None
+        return session
+    
+    def _insert(self, session_id: str, session: _Session) -> None:
+        """Add a session as the most recently used one; call with the lock held."""
+        self._sessions[session_id] = session
+        self._resident_bytes += session.size
+    
+    def _evict(self, now: float) -> None:
+        """Expire idle sessions and trim memory to its bounds; the newest session always stays."""
+        while len(self._sessions) > 1:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.accessed_at > self.ttl_seconds:
+                self._expired += 1
+            elif len(self._sessions) > self.max_sessions or self._resident_bytes > self.max_bytes:
+                self._evicted += 1
+                self._spill(session_id, session, now)
+            else:
+                break
+            del self._sessions[session_id]
+            self._resident_bytes -= session.size
+    
+    def _spill_path(self, session_id: str) -> str:
+        """File a spilled session is written to."""
+        name = hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self._spill_dir, name + _SPILL_SUFFIX)
+    
+    def _spill(self, session_id: str, session: _Session, now: float) -> None:
+        """Write an evicted session to disk, if spilling is enabled."""
+        if not self._spill_dir:
+            return
+        path = self._spill_path(session_id)
+        try:
+            data = pickle.dumps((session_id, session.values, session.version, session.accessed_at), pickle.HIGHEST_PROTOCOL)
+            with open(path + ".tmp", "wb") as f:
+                f.write(zlib.compress(data))
+            os.replace(path + ".tmp", path)
+            self._spilled += 1
+        except Exception as e:
+            print(f"会话写入磁盘失败: {e}")
+        
+        if now - self._last_sweep > _SPILL_SWEEP_INTERVAL:
+            self._last_sweep = now
+            self._sweep(now)
+    
+    def _sweep(self, now: float) -> None:
+        """Delete spilled sessions that expired on disk."""
+        try:
+            with os.scandir(self._spill_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(_SPILL_SUFFIX) and now - entry.stat().st_mtime > self.ttl_seconds:
+                        os.remove(entry.path)
+        except OSError as e:
+            print(f"清理磁盘会话失败: {e}")
+    
+    def _load(self, session_id: str) -> Optional[_Session]:
+        """Read a spilled session back and delete its file."""
+        if not self._spill_dir:
+            return None
+        path = self._spill_path(session_id)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.remove(path)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print(f"读取磁盘会话失败: {e}")
+            return None
+        
+        try:
+            stored_id, values, version, accessed_at = pickle.loads(zlib.decompress(data))
+        except Exception as e:
+            print(f"读取磁盘会话失败: {e}")
+            return None
+        if stored_id != session_id:
+            return None
+        self._loaded += 1
+        return _Session(values, version, accessed_at)
+
+
+# Global session store instance
+_store_instance = None
+
+
+def get_session_store() -> SessionStore:
+    """Get the global session store instance."""
+    global _store_instance
+    if _store_instance is None:
+        _store_instance = SessionStore()
+    return _store_instance
\ No newline at end of file
@@ -9,11 +9,12 @@ from typing import Optional, Dict, Any
 
 # Import modules
 try:
-    from .config.config import APP_TITLE, APP_DESCRIPTION, CUSTOM_CSS
+    from .config.config import APP_TITLE, APP_DESCRIPTION, CUSTOM_CSS, EVENT_CONCURRENCY_LIMIT
     from .core.travel_functions import (
-        generate_destination_recommendation,
-        generate_itinerary_plan,
-        generate_checklist
+        generate_destination_recommendation_stream_async,
+        generate_itinerary_plan_stream_async,
+        regenerate_itinerary_day_stream_async,
+        generate_checklist_stream_async
     )
     from .ui.components import (
         create_app_theme,
@@ -22,16 +23,21 @@ try:
         create_itinerary_section,
         create_checklist_section,
         create_footer,
-        create_loading_animation,
-        hide_loading_animation
+        create_page_head,
+        SHOW_LOADING_JS,
+        HIDE_LOADING_JS
     )
-    from .utils.helpers import extract_hotels_from_itinerary
+    from .api.limiter import set_current_session
+    from .core.prefetch import get_checklist_prefetcher
+    from .utils.payload import get_payload_meter
+    from .data.session_store import get_session_store
 except ImportError:
-    from config.config import APP_TITLE, APP_DESCRIPTION, CUSTOM_CSS
+    from config.config import APP_TITLE, APP_DESCRIPTION, CUSTOM_CSS, EVENT_CONCURRENCY_LIMIT
     from core.travel_functions import (
-        generate_destination_recommendation,
-        generate_itinerary_plan,
-        generate_checklist
+        generate_destination_recommendation_stream_async,
+        generate_itinerary_plan_stream_async,
+        regenerate_itinerary_day_stream_async,
+        generate_checklist_stream_async
     )
     from ui.components import (
         create_app_theme,
@@ -40,10 +46,14 @@ except ImportError:
         create_itinerary_section,
         create_checklist_section,
         create_footer,
-        create_loading_animation,
-        hide_loading_animation
+        create_page_head,
+        SHOW_LOADING_JS,
+        HIDE_LOADING_JS
     )
-    from utils.helpers import extract_hotels_from_itinerary
+    from api.limiter import set_current_session
+    from core.prefetch import get_checklist_prefetcher
+    from utils.payload import get_payload_meter
+    from data.session_store import get_session_store
 
 
 def create_app() -> gr.Blocks:
@@ -59,23 +69,31 @@ def create_app() -> gr.Blocks:
         title=APP_TITLE,
         css=CUSTOM_CSS,
         theme=theme,
-        head=["<meta name='viewport' content='width=device-width, initial-scale=1.0'>"]
+        head=create_page_head()
     ) as app:
         
         # Create header
         create_header()
         
-        # State variables for sharing data between tabs
-        itinerary_state = gr.State("")  # Store itinerary content
-        destination_state = gr.State("")  # Store destination for sharing
-        duration_state = gr.State("")  # Store duration for sharing
+        # Itinerary text, parsed Trip, destination and duration live in the server-side session store;
+        # this state only holds the reference to them, which changes whenever a new itinerary is stored
+        session_ref = gr.State("")
         
         with gr.Tab("🌟 目的地推荐"):
             destination_section = create_destination_section()
             
-            # Bind destination recommendation events
+            # Bind destination recommendation events - stream partial text as it arrives
+            async def recommend_destinations(season, health, budget, interests, request: gr.Request):
+                """Stream destination recommendations on behalf of the calling session."""
+                set_current_session(request.session_hash)
+                meter, result = get_payload_meter(), ""
+                async for result in generate_destination_recommendation_stream_async(season, health, budget, interests):
+                    meter.record("destinations")
+                    yield result
+                meter.finish("destinations", result)
+            
             destination_section['button'].click(
-                fn=generate_destination_recommendation,
+                fn=recommend_destinations,
                 inputs=[
                     destination_section['season'],
                     destination_section['health'],
@@ -88,70 +106,129 @@ def create_app() -> gr.Blocks:
         with gr.Tab("📋 行程规划"):
             itinerary_section = create_itinerary_section()
             
-            # Bind itinerary planning events - store result in state
-            def generate_itinerary_with_state(destination, duration, mobility, health_focus):
-                """Generate itinerary and store it in state for checklist sharing."""
-                result = generate_itinerary_plan(destination, duration, mobility, health_focus)
-                return result, result, destination, duration  # Return itinerary, state updates, and shared values
+            # Bind itinerary planning events - stream output, store final result in the session store
+            async def generate_itinerary_with_state(destination, duration, mobility, health_focus, request: gr.Request):
+                """Stream itinerary and store the final result for checklist sharing."""
+                set_current_session(request.session_hash)
+                meter, result, trip = get_payload_meter(), "", None
+                async for result, trip in generate_itinerary_plan_stream_async(destination, duration, mobility, health_focus):
+                    meter.record("itinerary")
+                    yield result, gr.update(), gr.update(), gr.update()  # Only the textbox changes mid-stream
+                meter.finish("itinerary", result)
+                if trip is None:
+                    # Nothing to store or share: keep the previous reference and checklist fields
+                    yield result, gr.update(), gr.update(), gr.update()
+                    return
+                ref = get_session_store().put(
+                    request.session_hash,
+                    itinerary=result,
+                    trip=trip,
+                    destination=destination,
+                    duration=duration
+                )
+                # Return itinerary and its reference; the shared values auto-fill the checklist fields
+                yield result, ref, destination, duration
             
-            itinerary_section['button'].click(
-                fn=generate_itinerary_with_state,
+            # Regenerate one day only - the other days are kept and spliced back around it
+            async def regenerate_itinerary_day(destination, duration, mobility, health_focus, day, change_request, ref, request: gr.Request):
+                """Stream a new plan for one day and update the stored itinerary when it completes."""
+                set_current_session(request.session_hash)
+                stored = get_session_store().get(ref) or {}
+                meter, result, updated_trip = get_payload_meter(), "", None
+                async for result, updated_trip in regenerate_itinerary_day_stream_async(
+                    stored.get("trip"), day, destination, duration, mobility, health_focus, change_request
+                ):
+                    meter.record("itinerary_day")
+                    yield result, gr.update()
+                meter.finish("itinerary_day", result)
+                if updated_trip is None:
+                    # Keep the stored itinerary and show the message above it
+                    yield f"{result}\n\n{stored.get('itinerary', '')}".strip(), gr.update()
+                    return
+                yield result, get_session_store().put(request.session_hash, itinerary=result, trip=updated_trip)
+            
+            itinerary_section['regenerate_button'].click(
+                fn=regenerate_itinerary_day,
                 inputs=[
                     itinerary_section['destination'],
                     itinerary_section['duration'],
                     itinerary_section['mobility'],
-                    itinerary_section['health_focus']
+                    itinerary_section['health_focus'],
+                    itinerary_section['regenerate_day'],
+                    itinerary_section['regenerate_request'],
+                    session_ref
                 ],
                 outputs=[
                     itinerary_section['output'],
-                    itinerary_state,
-                    destination_state,
-                    duration_state
+                    session_ref
                 ]
             )
         
         with gr.Tab("🎁 旅行清单"):
             checklist_section = create_checklist_section()
             
-            # Auto-fill destination and duration when itinerary is generated
-            def auto_fill_checklist_fields(shared_destination, shared_duration):
-                """Auto-fill checklist fields with shared values from itinerary."""
-                return shared_destination, shared_duration
-            
-            # Connect state changes to auto-fill checklist fields
-            destination_state.change(
-                fn=auto_fill_checklist_fields,
-                inputs=[destination_state, duration_state],
+            # Bound here so the itinerary's final update also fills the checklist fields, with no extra event
+            itinerary_section['button'].click(
+                fn=generate_itinerary_with_state,
+                inputs=[
+                    itinerary_section['destination'],
+                    itinerary_section['duration'],
+                    itinerary_section['mobility'],
+                    itinerary_section['health_focus']
+                ],
                 outputs=[
+                    itinerary_section['output'],
+                    session_ref,
                     checklist_section['destination'],
                     checklist_section['duration']
                 ]
             )
             
-            duration_state.change(
-                fn=auto_fill_checklist_fields,
-                inputs=[destination_state, duration_state],
-                outputs=[
-                    checklist_section['destination'],
-                    checklist_section['duration']
-                ]
+            # Start the checklist in the background once an itinerary completes
+            async def prefetch_checklist(origin, needs, ref, request: gr.Request):
+                """Speculatively generate the checklist so the later click returns at once."""
+                set_current_session(request.session_hash)
+                stored = get_session_store().get(ref)
+                if not stored:
+                    return
+                get_checklist_prefetcher().start(
+                    request.session_hash, origin, stored.get("destination", ""), stored.get("duration", ""), needs,
+                    stored.get("trip") or stored.get("itinerary", "")
+                )
+            
+            session_ref.change(
+                fn=prefetch_checklist,
+                inputs=[
+                    checklist_section['origin'],
+                    checklist_section['needs'],
+                    session_ref
+                ],
+                outputs=None
             )
             
-            # Bind checklist generation events - use itinerary state
-            def generate_checklist_with_itinerary(origin, destination, duration, needs, itinerary_content):
-                """Generate checklist with itinerary context."""
-                # Extract hotels from itinerary if available
-                hotels = extract_hotels_from_itinerary(itinerary_content)
+            # Bind checklist generation events - use the stored itinerary
+            async def generate_checklist_with_itinerary(origin, destination, duration, needs, ref, request: gr.Request):
+                """Stream the checklist with itinerary context, one category at a time."""
+                set_current_session(request.session_hash)
                 
-                # Build enhanced special needs with hotel information
-                enhanced_needs = needs
-                if hotels:
-                    hotel_info = f"行程规划中提到的酒店：{', '.join(hotels)}"
-                    enhanced_needs = f"{needs}\n{hotel_info}" if needs else hotel_info
+                # The parsed trip supplies hotels and transport without re-scanning the itinerary text
+                stored = get_session_store().get(ref) or {}
+                itinerary = stored.get("trip") or stored.get("itinerary", "")
+                prefetched = await get_checklist_prefetcher().take(
+                    request.session_hash, origin, destination, duration, needs, itinerary
+                )
+                meter = get_payload_meter()
+                if prefetched:
+                    meter.finish("checklist", prefetched)
+                    yield prefetched
+                    return
                 
-                # Generate checklist and return both loading and output components
-                checklist_result = generate_checklist(origin, destination, duration, enhanced_needs, itinerary_content)
-                return create_loading_animation(), checklist_result
+                # Hotels, transport and climate reach the prompt through the condensed itinerary context
+                checklist_html = ""
+                async for checklist_html in generate_checklist_stream_async(origin, destination, duration, needs, itinerary):
+                    meter.record("checklist")
+                    yield checklist_html
+                meter.finish("checklist", checklist_html)
             
             checklist_section['button'].click(
                 fn=generate_checklist_with_itinerary,
@@ -160,16 +237,17 @@ def create_app() -> gr.Blocks:
                     checklist_section['destination'],
                     checklist_section['duration'],
                     checklist_section['needs'],
-                    itinerary_state
+                    session_ref
                 ],
-                outputs=[
-                    checklist_section['loading_output'],
-                    checklist_section['output']
-                ]
+                outputs=checklist_section['output'],
+                js=SHOW_LOADING_JS  # The overlay is shown in the browser before the request is sent
             ).then(
-                fn=lambda: hide_loading_animation(),
-                outputs=checklist_section['loading_output']
+                fn=None,
+                js=HIDE_LOADING_JS  # Browser-only, also clears the overlay after an error
             )
+            
+            # The overlay stays until the first sections render; browser-only, so no server event per update
+            checklist_section['output'].change(fn=None, js=HIDE_LOADING_JS)
         
         # Create footer
         create_footer()
@@ -182,6 +260,9 @@ def main():
     # Create the application
     app = create_app()
     
+    # Handlers are async, so concurrency is bounded by upstream capacity rather than worker threads
+    app.queue(default_concurrency_limit=EVENT_CONCURRENCY_LIMIT)
+    
     # Launch the application
     app.launch(
         server_name="0.0.0.0",
@@ -190,6 +271,10 @@ def main():
         inbrowser=True,
         debug=False
     )
+    
+    # The meter also prints this report every PAYLOAD_REPORT_INTERVAL seconds while serving;
+    # this one adds the totals over the server's lifetime
+    print(get_payload_meter().report())
 
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ Contains Gradio components and UI-related functions.
 """
 
 import gradio as gr
+import os
 from typing import Dict, Any, List
 try:
     from ..config.config import (
@@ -141,6 +142,24 @@ def create_itinerary_section() -> Dict[str, Any]:
             max_lines=25,
             info="为您量身定制的舒缓行程安排"
         )
+        
+        with gr.Row():
+            regenerate_day = gr.Number(
+                label="🔄 重新规划第几天",
+                value=1,
+                precision=0,
+                minimum=1,
+                scale=1
+            )
+            
+            regenerate_request = gr.Textbox(
+                label="✏️ 修改要求",
+                placeholder="（例如：这一天想安排得轻松一些）",
+                info="只重新安排这一天，其余日期保持不变",
+                scale=2
+            )
+        
+        regenerate_btn = gr.Button("🔄 重新生成这一天", variant="secondary")
     
     return {
         'destination': destination,
@@ -148,7 +167,10 @@ def create_itinerary_section() -> Dict[str, Any]:
         'mobility': mobility,
         'health_focus': health_focus,
         'button': btn,
-        'output': output
+        'output': output,
+        'regenerate_day': regenerate_day,
+        'regenerate_request': regenerate_request,
+        'regenerate_button': regenerate_btn
     }
 
 
@@ -199,7 +221,6 @@ def create_checklist_section() -> Dict[str, Any]:
                     info="例如：高血压、糖尿病、需携带医疗器械等"
                 )
         
-        loading_output = gr.HTML(value="")
         btn = gr.Button("🎯 生成专属清单", variant="primary", size="lg")
         checklist_output = gr.HTML(
             label="✨ 清单内容",
@@ -211,7 +232,6 @@ def create_checklist_section() -> Dict[str, Any]:
         'destination': destination,
         'duration': duration,
         'needs': needs,
-        'loading_output': loading_output,
         'button': btn,
         'output': checklist_output
     }
@@ -229,110 +249,35 @@ def create_footer() -> gr.HTML:
     ''')
 
 
-def create_loading_animation() -> str:
-    """Create loading animation HTML."""
-    return """
-    <script>
-        (function() {
-            // 移除可能存在的旧遮罩
-            const oldOverlay = document.getElementById('app_loading_overlay');
-            if (oldOverlay) {
-                oldOverlay.remove();
-            }
+# Client-side hooks for the loading overlay in static/loading_overlay.js; a js= hook on
+# an event with a server function must hand the inputs through unchanged
+SHOW_LOADING_JS = "(...args) => { window.travelLoading.show(); return args; }"
+HIDE_LOADING_JS = "() => { window.travelLoading.hide(); }"
 
-            // 创建新的全屏遮罩，直接插入到body
-            const overlay = document.createElement('div');
-            overlay.id = 'app_loading_overlay';
-            overlay.innerHTML = `
-                <div style="
-                    position: fixed !important;
-                    top: 0 !important;
-                    left: 0 !important;
-                    width: 100vw !important;
-                    height: 100vh !important;
-                    min-height: 100vh !important;
-                    background-color: rgba(0,0,0,0.85) !important;
-                    z-index: 2147483647 !important;
-                    display: flex !important;
-                    align-items: center !important;
-                    justify-content: center !important;
-                    animation: fadeIn 0.3s ease-in;
-                    pointer-events: all !important;
-                ">
-                    <div style="
-                        background: white;
-                        padding: 80px 100px !important;
-                        border-radius: 25px;
-                        text-align: center;
-                        box-shadow: 0 15px 60px rgba(0,0,0,0.7);
-                        animation: pulse 2s ease-in-out infinite;
-                        max-width: 700px !important;
-                        margin: 40px;
-                    ">
-                        <div style="
-                            width: 120px !important;
-                            height: 120px !important;
-                            margin: 0 auto 40px;
-                            border: 10px solid #f0f0f0;
-                            border-top: 10px solid #667eea;
-                            border-radius: 50%;
-                            animation: spin 1s linear infinite;
-                        "></div>
-                        <h2 style="
-                            font-size: 36px !important;
-                            color: #333;
-                            margin: 0 0 20px 0;
-                            font-weight: bold;
-                        ">正在生成专属清单</h2>
-                        <p style="
-                            font-size: 22px !important;
-                            color: #666;
-                            margin: 0;
-                            line-height: 1.6;
-                        ">AI正在为您精心准备，请稍候...</p>
-                    </div>
-                    <style>
-                        @keyframes spin {
-                            0% { transform: rotate(0deg); }
-                            100% { transform: rotate(360deg); }
-                        }
-                        @keyframes pulse {
-                            0%, 100% { transform: scale(1); }
-                            50% { transform: scale(1.05); }
-                        }
-                        @keyframes fadeIn {
-                            from { opacity: 0; }
-                            to { opacity: 1; }
-                        }
-                        #app_loading_overlay {
-                            position: fixed !important;
-                            top: 0 !important;
-                            left: 0 !important;
-                            width: 100vw !important;
-                            height: 100vh !important;
-                            z-index: 2147483647 !important;
-                        }
-                    </style>
-                </div>
-            `;
-            document.body.appendChild(overlay);
-        })();
-    </script>
-    """
+_STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
 
 
-def hide_loading_animation() -> str:
-    """Create script to hide loading animation."""
-    return """
-    <script>
-        (function() {
-            const overlay = document.getElementById('app_loading_overlay');
-            if (overlay) {
-                overlay.remove();
-            }
-        })();
-    </script>
+def _read_static(name: str) -> str:
+    """Read a file from the static asset directory."""
+    with open(os.path.join(_STATIC_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def create_page_head() -> str:
+    """
+    Create the extra <head> markup of the page.
+    
+    The loading overlay script and styles are sent once with the page, so
+    showing and hiding the overlay costs no server event or payload per click.
+    
+    Returns:
+        Head HTML with the viewport meta tag and the overlay assets
     """
+    return (
+        "<meta name='viewport' content='width=device-width, initial-scale=1.0'>"
+        f"<style>{_read_static('loading_overlay.css')}</style>"
+        f"<script>{_read_static('loading_overlay.js')}</script>"
+    )
 
 
 def create_app_theme() -> gr.themes.Soft:
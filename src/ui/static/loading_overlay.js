@@ -0,0 +1,31 @@
+// Full-screen loading overlay shown while a checklist is generated.
+// Loaded once with the page; events call travelLoading.show() and travelLoading.hide()
+// through their js= hooks, so showing and hiding it needs no server round trip.
+window.travelLoading = (function () {
+    const OVERLAY_ID = "app_loading_overlay";
+
+    function hide() {
+        const overlay = document.getElementById(OVERLAY_ID);
+        if (overlay) {
+            overlay.remove();
+        }
+    }
+
+    function show() {
+        // 移除可能存在的旧遮罩
+        hide();
+
+        // 创建新的全屏遮罩，直接插入到body
+        const overlay = document.createElement("div");
+        overlay.id = OVERLAY_ID;
+        overlay.innerHTML =
+            '<div class="tl-card">' +
+            '<div class="tl-spinner"></div>' +
+            "<h2>正在生成专属清单</h2>" +
+            "<p>AI正在为您精心准备，请稍候...</p>" +
+            "</div>";
+        document.body.appendChild(overlay);
+    }
+
+    return { show: show, hide: hide };
+})();
@@ -0,0 +1,134 @@
+"""
+Response cleaning module for the travel assistant application.
+Strips code fences and thinking blocks from model output, in one pass or chunk by chunk.
+"""
+
+import re
+
+_THINKING_OPEN = "<thinking>"
+_THINKING_CLOSE = "</thinking>"
+_FENCE = "```"
+# Start of anything the cleaner removes
+_TOKEN = re.compile(r'<thinking>|```')
+# Language tag and line break after an opening fence, e.g. "```json\n"
+_FENCE_TAG = re.compile(r'[A-Za-z]{0,16}\n?')
+_BLANK_LINES = re.compile(r'\n{3,}')
+
+# Cleaner states
+_TEXT, _THINKING, _FENCE_TAG_STATE = range(3)
+
+
+class ResponseCleaner:
+    """
+    Incremental cleaner for model output.
+    
+    Removes <thinking>...</thinking> blocks and ``` fences (an opening
+    fence with its language tag and line break, a closing one with the
+    line break before it), collapses runs of blank
+    lines and trims the text. Only a possible partial token and trailing
+    whitespace are held back between chunks; the inside of a thinking block
+    is discarded as it arrives, so nothing close to the whole response is
+    ever buffered. Feeding the text in any chunking gives the same result
+    as cleaning it at once.
+    """
+    
+    def __init__(self):
+        """Initialize a cleaner at the start of a response."""
+        self._state = _TEXT
+        self._pending = ""
+        self._whitespace = ""
+        self._started = False
+        self._open_fence = False
+    
+    def feed(self, chunk: str) -> str:
+        """
+        Consume the next chunk of the response.
+        
+        Args:
+            chunk: Next piece of the streamed response
+            
+        Returns:
+            Cleaned text to append to what was returned so far
+        """
+        buffer = self._pending + chunk if self._pending else chunk
+        self._pending = ""
+        output = []
+        pos = 0
+        length = len(buffer)
+        
+        while pos < length:
+            if self._state == _THINKING:
+                end = buffer.find(_THINKING_CLOSE, pos)
+                if end < 0:
+                    # Only a split closing tag needs to survive until the next chunk
+                    self._pending = buffer[max(pos, length - len(_THINKING_CLOSE) + 1):]
+                    break
+                pos = end + len(_THINKING_CLOSE)
+                self._state = _TEXT
+            
+            elif self._state == _FENCE_TAG_STATE:
+                end = _FENCE_TAG.match(buffer, pos).end()
+                if end == length and not buffer.endswith("\n") and end - pos < 16:
+                    # The tag may continue in the next chunk
+                    self._pending = buffer[pos:]
+                    break
+                pos = end
+                self._state = _TEXT
+            
+            else:
+                match = _TOKEN.search(buffer, pos)
+                if match is None:
+                    keep = _partial_token(buffer, pos)
+                    self._emit(buffer[pos:length - keep], output)
+                    self._pending = buffer[length - keep:]
+                    break
+                self._emit(buffer[pos:match.start()], output)
+                if match.group() == _FENCE:
+                    self._open_fence = not self._open_fence
+                    if self._open_fence:
+                        self._state = _FENCE_TAG_STATE
+                    elif self._whitespace.endswith("\n"):
+                        # The line break before a closing fence goes with it
+                        self._whitespace = self._whitespace[:-1]
+                else:
+                    self._state = _THINKING
+                pos = match.end()
+        
+        # Runs of blank lines never span two outputs, since trailing whitespace is held back
+        return _BLANK_LINES.sub("\n\n", "".join(output))
+    
+    def flush(self) -> str:
+        """
+        Finish the response.
+        
+        Returns:
+            Text held back for a token that never completed; trailing whitespace is dropped
+        """
+        output = []
+        if self._state == _TEXT and self._pending:
+            self._emit(self._pending, output)
+        self.__init__()
+        return _BLANK_LINES.sub("\n\n", "".join(output))
+    
+    def _emit(self, text: str, output: list) -> None:
+        """Queue text, holding trailing whitespace until something follows it."""
+        if not text:
+            return
+        text = self._whitespace + text
+        body = text.rstrip()
+        self._whitespace = text[len(body):]
+        if not self._started:
+            body = body.lstrip()
+            self._started = bool(body)
+        if body:
+            output.append(body)
+
+
+def _partial_token(buffer: str, start: int) -> int:
+    """Length of the longest suffix of buffer[start:] that could begin a token."""
+    for token in (_THINKING_OPEN, _FENCE):
+        for size in range(min(len(token) - 1, len(buffer) - start), 0, -1):
+            if buffer.endswith(token[:size]):
+                return size
+    return 0
+
@@ -3,39 +3,90 @@ Utility functions module for the travel assistant application.
 Contains helper functions for validation, cleaning, and general utilities.
 """
 
+import hashlib
 import json
 import re
+import unicodedata
 from typing import Dict, Any, List, Optional
 try:
     from ..config.config import MAX_INPUT_LENGTH, ALLOWED_SEASONS, ALLOWED_HEALTH_STATUS, ALLOWED_BUDGET, ALLOWED_MOBILITY, ALLOWED_DURATION
+    from ..config.config import INTEREST_OPTIONS, HEALTH_FOCUS_OPTIONS
+    from ..config.config import ITINERARY_CONTEXT_TOKEN_BUDGET, ITINERARY_CONTEXT_CLAUSE_MAX_CHARS, ITINERARY_NEIGHBOUR_MAX_CHARS
+    from ..config.config import HOTEL_NAME_MAX_CHARS, MAX_EXTRACTED_HOTELS
+    from .cleaning import ResponseCleaner
+    from .json_repair import find_json, fenced_json, loads
 except ImportError:
     import sys
     import os
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from config.config import MAX_INPUT_LENGTH, ALLOWED_SEASONS, ALLOWED_HEALTH_STATUS, ALLOWED_BUDGET, ALLOWED_MOBILITY, ALLOWED_DURATION
+    from config.config import INTEREST_OPTIONS, HEALTH_FOCUS_OPTIONS
+    from config.config import ITINERARY_CONTEXT_TOKEN_BUDGET, ITINERARY_CONTEXT_CLAUSE_MAX_CHARS, ITINERARY_NEIGHBOUR_MAX_CHARS
+    from config.config import HOTEL_NAME_MAX_CHARS, MAX_EXTRACTED_HOTELS
+    from utils.cleaning import ResponseCleaner
+    from utils.json_repair import find_json, fenced_json, loads
+
+# Administrative suffixes dropped from free-text locations ("杭州市" -> "杭州")
+LOCATION_SUFFIXES = ("特别行政区", "自治区", "省", "市")
+
+_INTEREST_ORDER = {option: index for index, option in enumerate(INTEREST_OPTIONS)}
+_HEALTH_FOCUS_ORDER = {option: index for index, option in enumerate(HEALTH_FOCUS_OPTIONS)}
+
+# Keywords that mark checklist-relevant facts in an itinerary
+TRANSPORT_KEYWORDS = (
+    "飞机", "航班", "高铁", "动车", "火车", "卧铺", "大巴", "旅游巴士", "自驾", "包车",
+    "出租车", "网约车", "地铁", "公交", "轮渡", "游船", "邮轮", "缆车", "索道", "电瓶车"
+)
+CLIMATE_KEYWORDS = (
+    "气温", "温度", "天气", "气候", "温差", "降雨", "下雨", "雨季", "雨伞", "湿度", "潮湿",
+    "紫外线", "防晒", "日照", "寒冷", "炎热", "保暖", "海拔", "高原", "台风", "℃"
+)
+ACTIVITY_KEYWORDS = (
+    "游览", "参观", "漫步", "散步", "徒步", "登山", "爬山", "泡温泉", "温泉", "乘船", "游船",
+    "观赏", "体验", "品尝", "拍照", "摄影", "海滩", "沙滩", "博物馆", "寺", "古镇", "公园", "演出"
+)
+_CLAUSE_SPLIT = re.compile(r'[。；;！!？?\n]+')
+_CJK_CHAR = re.compile(r'[\u3000-\u303f\u4e00-\u9fff\uff00-\uffef]')
+
+# Day lines of an itinerary outline, e.g. "第3天：杭州 - 游览灵隐寺" or "**第十二天** 休整"
+_OUTLINE_DAY = re.compile(r'^[\s#*>\-]*第\s*([0-9]+|[一二两三四五六七八九十]+)\s*天[\s*]*[：:\-—、，,]?\s*(.*)$')
+# Headings starting a day of a detailed itinerary, e.g. "### 第3天：西湖" or "**Day 3**"
+_DAY_HEADING = re.compile(r'^[\s#*>\-]*(?:第\s*([0-9]+|[一二两三四五六七八九十]+)\s*天|Day\s*([0-9]+))', re.IGNORECASE)
+# Headings of the trip-wide sections after the last day, e.g. "## ⚠️ 注意事项" or "**应急准备：**"
+_EPILOGUE_HEADING = re.compile(r'^[\s#*>\-\d.、]*[^\w\s]*\s*(?:注意事项|应急准备|温馨提示|特别提醒|总结)[^：:，。,.\n]{0,8}[：:]?[\s*]*$')
+_CHINESE_DIGITS = {"一": 1, "二": 2, "两": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
+
+# Hotel kinds: Chinese names end with one, English ones may continue after it ("Hotel Nikko")
+_HOTEL_KEYWORD = re.compile(r'酒店|宾馆|饭店|度假村|客栈|民宿|(?<![A-Za-z])(?:hotel|resort|motel|inn)s?(?![A-Za-z])', re.IGNORECASE)
+# Lead-ins cut off the front of a name ("入住北京饭店" -> "北京饭店")
+_HOTEL_LEAD = re.compile(r'入住|住宿|下榻|预订|预约|推荐|位于|住在|前往|抵达|到达|返回|回到|在')
+# Capitalised words around the keyword of an English name
+_HOTEL_HEAD = re.compile(r"(?:[A-Z][\w'&-]*[ ]+)*$")
+_HOTEL_TAIL = re.compile(r"(?:[ ]+[A-Z][\w'&-]*)*")
+# Characters a hotel name never spans
+_HOTEL_STOP = frozenset("\n\r\t，,。.；;：:！!？?、（）()【】[]《》\"“”‘’|/#*>•-")
+# A keyword right after one of these refers to a hotel without naming it ("回酒店休息")
+_HOTEL_GENERIC = frozenset("回到返住离开在的该本此各")
 
 
 def clean_response(response_text: str) -> str:
     """
     Clean and format the AI response text.
     
+    Thinking blocks and code fences are removed, blank-line runs collapsed
+    and the text trimmed. This is ResponseCleaner run over the whole text;
+    streaming callers feed it chunk by chunk instead.
+    
     Args:
         response_text: Raw response text from AI
         
     Returns:
         Cleaned and formatted response text
     """
-    # Remove markdown formatting
-    response_text = re.sub(r'```json\n?', '', response_text)
-    response_text = re.sub(r'\n?```', '', response_text)
-    
-    # Remove leading/trailing whitespace
-    response_text = response_text.strip()
-    
-    # Remove extra blank lines
-    response_text = re.sub(r'\n{3,}', '\n\n', response_text)
-    
-    return response_text
+    if not response_text:
+        return ""
+    cleaner = ResponseCleaner()
+    return cleaner.feed(response_text) + cleaner.flush()
 
 
 def validate_inputs(inputs: Dict[str, Any]) -> Dict[str, str]:
@@ -51,7 +102,7 @@ def validate_inputs(inputs: Dict[str, Any]) -> Dict[str, str]:
     errors = {}
     
     # Validate text inputs
-    text_fields = ['destination', 'origin', 'special_needs']
+    text_fields = ['destination', 'origin', 'special_needs', 'change_request']
     for field in text_fields:
         if field in inputs and inputs[field]:
             if len(inputs[field]) > MAX_INPUT_LENGTH:
@@ -84,20 +135,34 @@ def safe_json_parse(json_string: str) -> Optional[Dict[str, Any]]:
     """
     Safely parse JSON string with error handling.
     
+    A clean response is decoded directly; otherwise the JSON is located
+    inside the surrounding prose and repaired (trailing commas, curly
+    quotes, a truncated tail) before decoding.
+    
     Args:
         json_string: JSON string to parse
         
     Returns:
-        Parsed dictionary or None if parsing fails
+        Parsed dictionary or None if parsing fails or no object is found
     """
-    try:
-        # Clean the JSON string first
-        json_string = clean_response(json_string)
-        return json.loads(json_string)
-    except json.JSONDecodeError:
-        return None
-    except Exception:
+    if not json_string:
         return None
+    
+    # Clean the JSON string first
+    cleaned = clean_response(json_string)
+    try:
+        data = loads(cleaned)
+        if isinstance(data, dict):
+            return data
+    except ValueError:
+        pass
+    
+    # Cleaning removes the fences, so a ```json block is looked up in the raw response
+    fenced = fenced_json(json_string)
+    located = find_json(clean_response(fenced), objects_only=True) if fenced else None
+    if located is None:
+        located = find_json(cleaned, objects_only=True)
+    return loads(located) if located else None
 
 
 def format_interests(interests: List[str]) -> str:
@@ -110,6 +175,7 @@ def format_interests(interests: List[str]) -> str:
     Returns:
         Formatted string of interests
     """
+    interests = sort_options(interests, _INTEREST_ORDER)
     if not interests:
         return "暂无特别偏好"
     
@@ -126,12 +192,100 @@ def format_health_focus(health_focus: List[str]) -> str:
     Returns:
         Formatted string of health focuses
     """
+    health_focus = sort_options(health_focus, _HEALTH_FOCUS_ORDER)
     if not health_focus:
         return "暂无特别关注点"
     
     return "、".join(health_focus)
 
 
+def sort_options(selected: Optional[List[str]], order: Dict[str, int]) -> List[str]:
+    """
+    Sort multiselect values into their canonical option order.
+    
+    Args:
+        selected: Values in the order the user clicked them
+        order: Mapping of option to its position in the option list
+        
+    Returns:
+        Deduplicated values in option-list order, unknown values last
+    """
+    if not selected:
+        return []
+    
+    unique = {value.strip() for value in selected if value and value.strip()}
+    return sorted(unique, key=lambda value: (order.get(value, len(order)), value))
+
+
+def normalize_location(location: Optional[str]) -> str:
+    """
+    Normalize a free-text location name.
+    
+    Args:
+        location: Location name as typed by the user
+        
+    Returns:
+        Location with full-width characters folded, whitespace removed and
+        a trailing administrative suffix dropped
+    """
+    if not location:
+        return ""
+    
+    location = unicodedata.normalize("NFKC", location)
+    location = re.sub(r'\s+', '', location)
+    
+    for suffix in LOCATION_SUFFIXES:
+        if location.endswith(suffix) and len(location) - len(suffix) >= 2:
+            location = location[:-len(suffix)]
+            break
+    
+    return location
+
+
+def canonicalize_request(task: str, **fields: Any) -> Dict[str, Any]:
+    """
+    Build the canonical form of a user request.
+    
+    Multiselect lists are sorted into option order and location fields are
+    normalized, so equivalent inputs produce identical prompts.
+    
+    Args:
+        task: Request type ("destination", "itinerary" or "checklist")
+        **fields: Raw request fields
+        
+    Returns:
+        Canonical request dictionary including the task name
+    """
+    canonical: Dict[str, Any] = {"task": task}
+    
+    for name, value in fields.items():
+        if name == "interests":
+            value = sort_options(value, _INTEREST_ORDER)
+        elif name == "health_focus":
+            value = sort_options(value, _HEALTH_FOCUS_ORDER)
+        elif name in ("destination", "origin"):
+            value = normalize_location(value)
+        elif isinstance(value, str):
+            value = unicodedata.normalize("NFKC", value).strip()
+        canonical[name] = value
+    
+    return canonical
+
+
+def request_fingerprint(canonical_request: Dict[str, Any]) -> str:
+    """
+    Create a compact fingerprint for a canonical request.
+    
+    Args:
+        canonical_request: Output of canonicalize_request
+        
+    Returns:
+        16-character hex fingerprint
+    """
+    payload = json.dumps(canonical_request, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize a filename by removing invalid characters.
@@ -174,25 +328,15 @@ def truncate_text(text: str, max_length: int = 1000) -> str:
 
 def extract_json_from_text(text: str) -> Optional[str]:
     """
-    Extract JSON content from text that might contain JSON.
+    Extract the first JSON object or array from text.
     
     Args:
-        text: Text that might contain JSON
+        text: Text that may contain JSON
         
     Returns:
-        Extracted JSON string or None
+        Extracted (and if needed repaired) JSON string or None
     """
-    # Look for JSON-like content between curly braces
-    json_match = re.search(r'\{[\s\S]*\}', text)
-    if json_match:
-        return json_match.group(0)
-    
-    # Look for JSON-like content between square brackets
-    json_match = re.search(r'\[[\s\S]*\]', text)
-    if json_match:
-        return json_match.group(0)
-    
-    return None
+    return find_json(text)
 
 
 def is_valid_chinese_location(location: str) -> bool:
@@ -227,43 +371,266 @@ def is_valid_chinese_location(location: str) -> bool:
     return True
 
 
-def extract_hotels_from_itinerary(itinerary_text: str) -> List[str]:
+def _hotel_name_at(text: str, match: "re.Match") -> str:
+    """The hotel name around one keyword hit, or "" when the hit names no hotel."""
+    start, end = match.span()
+    left = start
+    bound = max(0, start - HOTEL_NAME_MAX_CHARS)
+    while left > bound and text[left - 1] not in _HOTEL_STOP:
+        left -= 1
+    leads = [lead.end() for lead in _HOTEL_LEAD.finditer(text, left, start)]
+    if leads:
+        left = leads[-1]
+    prefix = text[left:start].strip()
+    
+    if match.group().isascii():
+        left = _HOTEL_HEAD.search(text, left, start).start()
+        prefix = text[left:start].strip()
+        end = _HOTEL_TAIL.match(text, end, min(len(text), end + HOTEL_NAME_MAX_CHARS)).end()
+        if not prefix and end == match.end():
+            return ""
+    elif len(prefix) < 2 or prefix[-1] in _HOTEL_GENERIC:
+        return ""
+    return text[left:end].strip()
+
+
+def extract_hotels_from_itinerary(itinerary_text: str, limit: int = MAX_EXTRACTED_HOTELS) -> List[str]:
     """
-    Extract hotel information from itinerary content.
+    Extract hotel names from itinerary content.
+    
+    The text is scanned once for hotel keywords and each hit is widened to
+    a bounded span: back to the nearest punctuation but never more than
+    HOTEL_NAME_MAX_CHARS characters, with lead-ins such as "入住" cut off.
+    The work per hit is bounded, so long single-line output stays linear.
+    Mentions that name no hotel ("回酒店休息") are skipped, and a name
+    contained in a longer one is merged into it.
     
     Args:
         itinerary_text: Itinerary content to extract hotels from
+        limit: Maximum number of names to return
         
     Returns:
-        List of hotel names found in the itinerary
+        List of hotel names in order of first appearance
     """
     if not itinerary_text:
         return []
     
-    hotels = []
-    
-    # Hotel extraction patterns - comprehensive matching
-    hotel_patterns = [
-        r'(?:入住|住宿|下榻)[：:]\s*([^\n，,。.]+)',  # 入住: 名称
-        r'(?:酒店|宾馆|度假村|客栈)[：:]\s*([^\n，,。.]+)',  # 酒店: 名称
-        r'推荐(?:酒店|住宿)[：:]\s*([^\n，,。.]+)',  # 推荐酒店: 名称
-        r'([^\n，,。.]*(?:酒店|宾馆|度假村|客栈)[^\n，,。.]*)',  # 包含酒店关键词
-        r'([^\n，,。.]*(?:Hotel|Resort|Inn|Motel)[^\n，,。.]*)',  # 英文酒店关键词
-        r'(?:位于|在)([^\n，,。.]*(?:酒店|宾馆|度假村|客栈)[^\n，,。.]*)',  # 位置描述
-        r'(?:预订|预约)([^\n，,。.]*(?:酒店|宾馆|度假村|客栈)[^\n，,。.]*)',  # 预订描述
+    names = {}
+    for match in _HOTEL_KEYWORD.finditer(itinerary_text):
+        name = _hotel_name_at(itinerary_text, match)
+        if name:
+            names.setdefault(name, None)
+            # Enough candidates to fill the limit after merging
+            if len(names) >= limit * 4:
+                break
+    
+    return _drop_contained(list(names))[:limit]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheaply estimate the token count of mixed Chinese text.
+    
+    Common tokenizers spend at most about one token per Chinese character
+    or full-width punctuation mark and about one per four other characters,
+    so this slightly overestimates rather than overruns a budget.
+    
+    Args:
+        text: Text to measure
+        
+    Returns:
+        Estimated number of tokens
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK_CHAR.findall(text))
+    other = len(text) - cjk - text.count(" ") - text.count("\n")
+    return cjk + (max(other, 0) + 3) // 4
+
+
+def _drop_contained(items: List[str]) -> List[str]:
+    """Drop items that are substrings of another item."""
+    kept = []
+    for item in sorted(items, key=len, reverse=True):
+        if not any(item in other for other in kept):
+            kept.append(item)
+    # Restore first-appearance order
+    return [item for item in items if item in kept]
+
+
+def _keyword_clauses(clauses: List[str], keywords: tuple) -> List[str]:
+    """Return the clauses mentioning any keyword, trimmed and deduplicated."""
+    found = []
+    for clause in clauses:
+        if any(keyword in clause for keyword in keywords):
+            clause = clause.strip(" -•*#·、，,：:\t")
+            if clause:
+                found.append(truncate_text(clause, ITINERARY_CONTEXT_CLAUSE_MAX_CHARS))
+    return _drop_contained(list(dict.fromkeys(found)))
+
+
+def compress_itinerary_context(itinerary_text: str,
+                               token_budget: int = ITINERARY_CONTEXT_TOKEN_BUDGET,
+                               hotels: Optional[List[str]] = None,
+                               transports: Optional[List[str]] = None) -> str:
+    """
+    Condense an itinerary into the facts a packing checklist needs.
+    
+    Hotels, transport modes, climate hints and activities are pulled out,
+    deduplicated and added in that priority order until the token budget
+    is reached.
+    
+    Args:
+        itinerary_text: Full itinerary text
+        token_budget: Maximum estimated tokens for the result
+        hotels: Hotel names already known, e.g. from a parsed Trip; extracted from the text when None
+        transports: Transport modes already known; detected in the text when None
+        
+    Returns:
+        Compact multi-line context, or an empty string if nothing relevant was found
+    """
+    if not itinerary_text:
+        return ""
+    
+    clauses = [clause.strip() for clause in _CLAUSE_SPLIT.split(itinerary_text) if clause.strip()]
+    if hotels is None:
+        hotels = extract_hotels_from_itinerary(itinerary_text)
+    if transports is None:
+        transports = [keyword for keyword in TRANSPORT_KEYWORDS if keyword in itinerary_text]
+    
+    sections = [
+        ("住宿", "、", hotels),
+        ("交通", "、", transports),
+        ("气候", "；", _keyword_clauses(clauses, CLIMATE_KEYWORDS)),
+        ("活动", "；", _keyword_clauses(clauses, ACTIVITY_KEYWORDS)),
     ]
     
-    for pattern in hotel_patterns:
-        matches = re.findall(pattern, itinerary_text, re.IGNORECASE)
-        hotels.extend(matches)
+    lines = []
+    used = 0
+    for label, separator, facts in sections:
+        kept = []
+        for fact in facts:
+            line = f"{label}：{separator.join(kept + [fact])}"
+            if used + estimate_tokens(line) > token_budget:
+                break
+            kept.append(fact)
+        if kept:
+            line = f"{label}：{separator.join(kept)}"
+            used += estimate_tokens(line)
+            lines.append(line)
+    
+    return "\n".join(lines)
+
+
+def _parse_day_number(numeral: str) -> int:
+    """Convert a day numeral such as "12", "十二" or "二十" to an int."""
+    if numeral.isdigit():
+        return int(numeral)
+    tens, _, units = numeral.partition("十")
+    if "十" not in numeral:
+        return _CHINESE_DIGITS.get(numeral, 0)
+    return _CHINESE_DIGITS.get(tens, 1) * 10 + _CHINESE_DIGITS.get(units, 0)
+
+
+def parse_day_outline(outline_text: str, max_days: int) -> List[str]:
+    """
+    Extract the per-day summaries from an itinerary outline.
     
-    # Additional extraction for specific formats
-    # Look for patterns like "- 酒店名称" or "• 酒店名称"
-    list_patterns = re.findall(r'[-•]\s*([^\n，,。.]*(?:酒店|宾馆|度假村|客栈)[^\n，,。.]*)', itinerary_text, re.IGNORECASE)
-    hotels.extend(list_patterns)
+    Days are returned in day order; a repeated day keeps its first
+    summary. Lines that do not start a day are ignored.
     
-    # Clean and deduplicate
-    hotels = [hotel.strip() for hotel in hotels if hotel.strip()]
-    hotels = list(dict.fromkeys(hotels))[:10]  # Remove duplicates and limit to 10
+    Args:
+        outline_text: Outline with one "第N天：..." line per day
+        max_days: Maximum number of days to return
+        
+    Returns:
+        Summaries for day 1, 2, ... (without the "第N天" prefix)
+    """
+    days = {}
+    for line in (outline_text or "").splitlines():
+        match = _OUTLINE_DAY.match(line)
+        if not match:
+            continue
+        day = _parse_day_number(match.group(1))
+        summary = match.group(2).strip().strip("*").strip()
+        if 0 < day <= max_days and day not in days:
+            days[day] = summary
+    return [days[day] for day in sorted(days)]
+
+
+def split_itinerary_days(itinerary_text: str) -> Dict[str, Any]:
+    """
+    Split an itinerary into the text before the first day, one segment per day, and the closing sections.
+    
+    Day headings must count up from day 1; a heading for day 1 starts the
+    sequence again, so an overview listing every day is kept in the preamble
+    when the detailed days follow it.
+    
+    Args:
+        itinerary_text: Itinerary as generated
+        
+    Returns:
+        {"preamble": str, "days": [{"day": int, "text": str}, ...], "epilogue": str}
+    """
+    lines = (itinerary_text or "").split("\n")
+    starts = []
+    for index, line in enumerate(lines):
+        match = _DAY_HEADING.match(line)
+        if not match:
+            continue
+        day = _parse_day_number(match.group(1) or match.group(2))
+        if day == 1:
+            starts = [(index, day)]
+        elif starts and day > starts[-1][1]:
+            starts.append((index, day))
+    
+    if not starts:
+        return {"preamble": itinerary_text or "", "days": [], "epilogue": ""}
+    
+    end = len(lines)
+    for index in range(starts[-1][0] + 1, len(lines)):
+        if _EPILOGUE_HEADING.match(lines[index]):
+            end = index
+            break
+    
+    stops = [index for index, _ in starts[1:]] + [end]
+    return {
+        "preamble": "\n".join(lines[:starts[0][0]]).strip(),
+        "days": [
+            {"day": day, "text": "\n".join(lines[start:stop]).strip()}
+            for (start, day), stop in zip(starts, stops)
+        ],
+        "epilogue": "\n".join(lines[end:]).strip(),
+    }
+
+
+def ensure_day_heading(day_text: str, day: int) -> str:
+    """
+    Make sure a regenerated day starts with its "第N天" heading.
+    
+    Args:
+        day_text: Text of one day
+        day: Day number
+        
+    Returns:
+        The text, prefixed with a heading when it does not start with one for this day
+    """
+    match = _DAY_HEADING.match(day_text)
+    if match and _parse_day_number(match.group(1) or match.group(2)) == day:
+        return day_text
+    return f"第{day}天\n{day_text}"
+
+
+def summarize_day(day_text: str, max_chars: int = ITINERARY_NEIGHBOUR_MAX_CHARS) -> str:
+    """
+    Condense a day segment to one line, used as context for its neighbours.
     
-    return hotels
\ No newline at end of file
+    Args:
+        day_text: Text of one day
+        max_chars: Maximum length of the summary
+        
+    Returns:
+        The day's lines joined with "；" and truncated
+    """
+    lines = [line.strip(" #*-\t") for line in day_text.splitlines()]
+    return truncate_text("；".join(line for line in lines if line), max_chars)
@@ -0,0 +1,218 @@
+"""
+JSON location and repair module for the travel assistant application.
+Finds the JSON value inside a model response and fixes the defects models commonly produce.
+"""
+
+import json
+import re
+from typing import Any, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Characters that matter outside strings: quotes (straight or curly), brackets and commas
+_STRUCTURE = re.compile(r'["“”{}\[\],:]')
+# Characters that matter inside a string
+_STRING_SPECIAL = re.compile(r'[\\"“”\n\r]')
+# A scalar cut off by truncation, e.g. "tru" or "12." at the very end
+_PARTIAL_SCALAR = re.compile(r'[:,\[{]\s*([\w.+-]+)\s*$')
+_COMPLETE_SCALAR = re.compile(r'^(?:true|false|null|-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)$')
+# Candidates tried before giving up, so prose full of braces stays linear
+_MAX_CANDIDATES = 3
+# Body of a ```json block; an unclosed block runs to the end of a truncated response
+_FENCED_JSON = re.compile(r'```json[ \t]*\n(.*?)(?:```|\Z)', re.DOTALL | re.IGNORECASE)
+
+
+def loads(text: str) -> Any:
+    """
+    Decode JSON with orjson when it is installed, otherwise the standard library.
+    
+    Raises:
+        ValueError: If the text is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def fenced_json(text: str) -> Optional[str]:
+    """
+    Get the body of the first ```json block in text.
+    
+    Args:
+        text: Model response
+        
+    Returns:
+        The text inside the block, or None if there is no ```json block
+    """
+    match = _FENCED_JSON.search(text or "")
+    return match.group(1) if match else None
+
+
+def find_json(text: str, objects_only: bool = False) -> Optional[str]:
+    """
+    Locate the first JSON value in text and repair it.
+    
+    A ```json block is tried first, since the model marked it as the
+    answer. Otherwise the text is scanned once from the first bracket (only
+    braces with objects_only), tracking strings so brackets and quotes
+    inside them are ignored. On the way, trailing
+    commas are dropped, curly quotes used as string delimiters become
+    straight ones and raw line breaks in strings are escaped. If the
+    response was cut off, the open string and brackets are closed and a
+    dangling key or partial value is removed.
+    
+    Args:
+        text: Model response, possibly with prose or fences around the JSON
+        objects_only: Skip values that are not objects, e.g. a bracketed
+            "[3]" in the prose before the real answer
+            
+    Returns:
+        JSON text that parses, or None if no value could be recovered
+    """
+    if not text:
+        return None
+    
+    fenced = fenced_json(text)
+    if fenced:
+        located = _scan(fenced, objects_only)
+        if located is not None:
+            return located
+    return _scan(text, objects_only)
+
+
+def _scan(text: str, objects_only: bool) -> Optional[str]:
+    """Try up to _MAX_CANDIDATES values in text; returns the first that parses."""
+    start = _next_bracket(text, 0, objects_only)
+    for _ in range(_MAX_CANDIDATES):
+        if start < 0:
+            return None
+        candidate, end = _repair(text, start)
+        try:
+            value = loads(candidate)
+            if not objects_only or isinstance(value, dict):
+                return candidate
+        except ValueError:
+            pass
+        start = _next_bracket(text, max(end, start + 1), objects_only)
+    return None
+
+
+def _next_bracket(text: str, start: int, objects_only: bool = False) -> int:
+    """Index of the next opening brace (or bracket, unless objects_only) at or after start, or -1."""
+    if objects_only:
+        return text.find("{", start)
+    brace, bracket = text.find("{", start), text.find("[", start)
+    if brace < 0 or bracket < 0:
+        return max(brace, bracket)
+    return min(brace, bracket)
+
+
+def _repair(text: str, start: int) -> tuple:
+    """Scan one value starting at an opening bracket; returns (repaired text, index scanned to)."""
+    out: List[str] = []
+    closers: List[str] = []
+    # Per open bracket: whether the next string is an object key
+    expect_key: List[bool] = []
+    comma = -1
+    # Start in out of the last key, kept while the key still awaits its value
+    key_start = -1
+    key_pending = False
+    open_string = False
+    pos = start
+    length = len(text)
+    
+    while pos < length:
+        match = _STRUCTURE.search(text, pos)
+        end = match.start() if match else length
+        segment = text[pos:end]
+        if segment.strip():
+            comma = -1
+        out.append(segment)
+        if match is None:
+            pos = length
+            break
+        char = match.group()
+        pos = match.end()
+        
+        if char in '"“”':
+            if expect_key[-1]:
+                key_start = len(out)
+                key_pending = True
+            comma = -1
+            pos, closed = _copy_string(text, pos, char, out)
+            if not closed:
+                open_string = True
+                break
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+            expect_key.append(char == "{")
+            comma = -1
+            out.append(char)
+        elif char in "}]":
+            if comma >= 0:
+                # Trailing comma before a closing bracket
+                out[comma] = ""
+                comma = -1
+            # The expected closer also fixes a mismatched one
+            out.append(closers.pop())
+            expect_key.pop()
+            if not closers:
+                return "".join(out), pos
+        elif char == ",":
+            comma = len(out)
+            out.append(char)
+            expect_key[-1] = closers[-1] == "}"
+        else:
+            out.append(char)
+            expect_key[-1] = False
+            key_pending = False
+    
+    if key_pending:
+        # A key whose value never arrived
+        del out[key_start:]
+    elif open_string:
+        out.append('"')
+    return _close_truncated("".join(out).rstrip(), out, key_start, closers), pos
+
+
+def _copy_string(text: str, pos: int, opener: str, out: List[str]) -> tuple:
+    """Copy a string body to out as a straight-quoted string; returns (position after it, whether it closed)."""
+    closing = '"' if opener == '"' else '”“"'
+    out.append('"')
+    length = len(text)
+    while pos < length:
+        match = _STRING_SPECIAL.search(text, pos)
+        if match is None:
+            out.append(text[pos:])
+            return length, False
+        out.append(text[pos:match.start()])
+        char = match.group()
+        pos = match.end()
+        if char == "\\":
+            if pos == length:
+                return length, False
+            out.append(text[pos - 1:pos + 1])
+            pos += 1
+        elif char in closing:
+            out.append('"')
+            return pos, True
+        elif char == "\n":
+            out.append("\\n")
+        elif char != "\r":
+            out.append(char)
+    return length, False
+
+
+def _close_truncated(repaired: str, out: List[str], key_start: int, closers: List[str]) -> str:
+    """Finish a value that was cut off by dropping a partial member and closing the open brackets."""
+    partial = _PARTIAL_SCALAR.search(repaired)
+    if partial and not _COMPLETE_SCALAR.match(partial.group(1)):
+        repaired = repaired[:partial.start(1)].rstrip()
+    if repaired.endswith(":"):
+        repaired = "".join(out[:key_start]).rstrip()
+    if repaired.endswith(","):
+        repaired = repaired[:-1].rstrip()
+    return repaired + "".join(reversed(closers))
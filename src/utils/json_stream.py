@@ -0,0 +1,174 @@
+"""
+Incremental JSON parsing module for the travel assistant application.
+Emits the members of a streamed JSON object as soon as each one is complete.
+"""
+
+from typing import Any, List, Tuple
+try:
+    from .json_repair import loads, find_json
+except ImportError:
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.json_repair import loads, find_json
+
+# Parser states
+_SEEK, _KEY, _COLON, _VALUE_START, _VALUE, _DONE = range(6)
+
+
+class StreamingJSONObjectParser:
+    """
+    Incremental parser for a top-level JSON object arriving in chunks.
+    
+    Text before the opening brace (prose, a ```json fence) is skipped. Each
+    top-level member is returned from feed() once its value is complete,
+    e.g. as soon as the closing bracket of a category array arrives. Every
+    character is scanned once, so feeding a whole response costs linear time.
+    """
+    
+    def __init__(self):
+        """Initialize an empty parser."""
+        self._buffer = ""
+        self._pos = 0
+        self._state = _SEEK
+        self._key = ""
+        self._value_start = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self.members: List[Tuple[str, Any]] = []
+    
+    @property
+    def done(self) -> bool:
+        """True once the closing brace of the top-level object has been seen."""
+        return self._state == _DONE
+    
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Consume the next chunk of text.
+        
+        Args:
+            chunk: Next piece of the streamed response
+            
+        Returns:
+            (key, value) pairs of the members completed by this chunk
+        """
+        if self._state == _DONE:
+            return []
+        self._buffer += chunk
+        completed = []
+        buffer = self._buffer
+        pos = self._pos
+        length = len(buffer)
+        
+        while pos < length and self._state != _DONE:
+            char = buffer[pos]
+            
+            if self._state == _SEEK:
+                found = buffer.find("{", pos)
+                if found < 0:
+                    pos = length
+                    break
+                pos = found + 1
+                self._state = _KEY
+            
+            elif self._state == _KEY:
+                if char == '"':
+                    end = self._string_end(buffer, pos + 1)
+                    if end < 0:
+                        break
+                    try:
+                        self._key = loads(buffer[pos:end + 1])
+                    except ValueError:
+                        self._key = buffer[pos + 1:end]
+                    pos = end + 1
+                    self._state = _COLON
+                elif char == "}":
+                    pos += 1
+                    self._state = _DONE
+                else:
+                    pos += 1
+            
+            elif self._state == _COLON:
+                pos += 1
+                if char == ":":
+                    self._state = _VALUE_START
+            
+            elif self._state == _VALUE_START:
+                if char.isspace():
+                    pos += 1
+                    continue
+                self._value_start = pos
+                self._depth = 0
+                self._in_string = False
+                self._escaped = False
+                self._state = _VALUE
+            
+            else:
+                pos += 1
+                if self._in_string:
+                    if self._escaped:
+                        self._escaped = False
+                    elif char == "\\":
+                        self._escaped = True
+                    elif char == '"':
+                        self._in_string = False
+                        if self._depth == 0:
+                            self._complete(buffer[self._value_start:pos], completed)
+                elif char == '"':
+                    self._in_string = True
+                elif char in "[{":
+                    self._depth += 1
+                elif char in "]}":
+                    if self._depth == 0:
+                        # Closing brace of the top-level object ends a scalar value
+                        self._complete(buffer[self._value_start:pos - 1], completed)
+                        self._state = _DONE
+                        continue
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._complete(buffer[self._value_start:pos], completed)
+                elif char == "," and self._depth == 0:
+                    self._complete(buffer[self._value_start:pos - 1], completed)
+        
+        # Drop consumed text so the buffer only holds the member being parsed
+        if self._state in (_SEEK, _KEY, _COLON, _VALUE_START, _DONE):
+            self._buffer = buffer[pos:]
+            self._pos = 0
+        else:
+            self._buffer = buffer[self._value_start:]
+            self._pos = pos - self._value_start
+            self._value_start = 0
+        return completed
+    
+    def _complete(self, raw_value: str, completed: List[Tuple[str, Any]]) -> None:
+        """Decode a finished member value, repairing it if needed, and queue it."""
+        self._state = _KEY
+        raw_value = raw_value.strip()
+        if not raw_value:
+            return
+        try:
+            value = loads(raw_value)
+        except ValueError:
+            # e.g. a trailing comma inside a category array
+            repaired = find_json(raw_value)
+            if repaired is None:
+                return
+            value = loads(repaired)
+        member = (self._key, value)
+        self.members.append(member)
+        completed.append(member)
+    
+    @staticmethod
+    def _string_end(buffer: str, start: int) -> int:
+        """Index of the quote closing a string that starts at start, or -1 if not yet received."""
+        escaped = False
+        for index in range(start, len(buffer)):
+            char = buffer[index]
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                return index
+        return -1
@@ -0,0 +1,137 @@
+"""
+Payload size module for the travel assistant application.
+Records how much each endpoint sends to the browser so output size can be watched per endpoint.
+"""
+
+import threading
+import time
+from typing import Any, Dict
+try:
+    from ..config.config import PAYLOAD_REPORT_INTERVAL
+except ImportError:
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config.config import PAYLOAD_REPORT_INTERVAL
+
+
+class _EndpointPayload:
+    """Running totals for one endpoint."""
+    
+    __slots__ = ("updates", "responses", "total_bytes", "max_bytes", "last_bytes")
+    
+    def __init__(self):
+        self.updates = 0
+        self.responses = 0
+        self.total_bytes = 0
+        self.max_bytes = 0
+        self.last_bytes = 0
+
+
+class PayloadMeter:
+    """
+    Per-endpoint sizes of the responses sent to the browser.
+    
+    Streaming handlers call record() for every intermediate update, which
+    only counts it, and finish() with the final value, whose UTF-8 size is
+    what the user ends up downloading for that response. While the server
+    runs, finish() prints report() at most once per report_interval.
+    """
+    
+    def __init__(self, report_interval: float = PAYLOAD_REPORT_INTERVAL):
+        """
+        Initialize an empty meter.
+        
+        Args:
+            report_interval: Minimum seconds between printed reports (0 disables them)
+        """
+        self.report_interval = report_interval
+        self._endpoints: Dict[str, _EndpointPayload] = {}
+        self._last_report = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _get(self, endpoint: str) -> _EndpointPayload:
+        """Totals for an endpoint, created on first use; call with the lock held."""
+        payload = self._endpoints.get(endpoint)
+        if payload is None:
+            payload = self._endpoints[endpoint] = _EndpointPayload()
+        return payload
+    
+    def record(self, endpoint: str) -> None:
+        """
+        Count an intermediate streamed update.
+        
+        Args:
+            endpoint: Endpoint name, e.g. "checklist"
+        """
+        with self._lock:
+            self._get(endpoint).updates += 1
+    
+    def finish(self, endpoint: str, value: Any) -> None:
+        """
+        Record the final response of an event.
+        
+        Args:
+            endpoint: Endpoint name, e.g. "checklist"
+            value: Final text or HTML sent for the event
+        """
+        size = len(str(value or "").encode("utf-8"))
+        now = time.monotonic()
+        with self._lock:
+            payload = self._get(endpoint)
+            payload.responses += 1
+            payload.total_bytes += size
+            payload.last_bytes = size
+            payload.max_bytes = max(payload.max_bytes, size)
+            due = self.report_interval > 0 and now - self._last_report >= self.report_interval
+            if due:
+                self._last_report = now
+        if due:
+            print(self.report())
+    
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-endpoint payload metrics.
+        
+        Returns:
+            Dictionary keyed by endpoint with update and response counts and
+            the average, largest and latest response size in bytes
+        """
+        with self._lock:
+            return {
+                endpoint: {
+                    "updates": payload.updates,
+                    "responses": payload.responses,
+                    "avg_bytes": payload.total_bytes // payload.responses if payload.responses else 0,
+                    "max_bytes": payload.max_bytes,
+                    "last_bytes": payload.last_bytes,
+                }
+                for endpoint, payload in self._endpoints.items()
+            }
+    
+    def report(self) -> str:
+        """
+        Format the metrics as a short text report, one line per endpoint.
+        
+        Returns:
+            Report text
+        """
+        lines = ["响应体积统计:"]
+        for endpoint, values in sorted(self.metrics().items()):
+            lines.append(
+                f"  {endpoint}: {values['responses']} 次响应, {values['updates']} 次流式更新, "
+                f"平均 {values['avg_bytes'] / 1024:.1f}KB, 最大 {values['max_bytes'] / 1024:.1f}KB"
+            )
+        return "\n".join(lines)
+
+
+# Global payload meter instance
+_payload_meter_instance = None
+
+
+def get_payload_meter() -> PayloadMeter:
+    """Get the global payload meter instance."""
+    global _payload_meter_instance
+    if _payload_meter_instance is None:
+        _payload_meter_instance = PayloadMeter()
+    return _payload_meter_instance
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+HTML template module for the travel assistant application.
+Compiled templates that build output with a single join and escape model text in one pass.
+"""
+
+import re
+from typing import Any, Sequence
+try:
+    from ..config.config import HTML_MINIFY_ENABLED
+except ImportError:
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from config.config import HTML_MINIFY_ENABLED
+
+# Placeholders look like {name}; a name ending in _html takes trusted, already rendered HTML
+_FIELD = re.compile(r'\{(\w+)\}')
+# "&" first so the other entities are not escaped twice
+_ENTITIES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#x27;"))
+# Joins items for escape_items; dropped from the items themselves if present
+_SEPARATOR = "\x00"
+# Whitespace with a line break between tags or fields, or at either end of the markup
+_LAYOUT_WHITESPACE = re.compile(r'(?:^|(?<=[>}]))\s*\n\s*(?=[<{]|$)')
+# Preformatted blocks keep their whitespace
+_PRE_BLOCK = re.compile(r'(<pre\b.*?</pre>)', re.S | re.I)
+
+
+def _escape_text(text: str) -> str:
+    """Replace the special characters present in text; most text has none and is returned as is."""
+    for char, entity in _ENTITIES:
+        if char in text:
+            text = text.replace(char, entity)
+    return text
+
+
+def escape(value: Any) -> str:
+    """
+    Escape a value for HTML text or attribute content.
+    
+    Args:
+        value: Value to escape; None becomes an empty string
+        
+    Returns:
+        Escaped text
+    """
+    if value is None:
+        return ""
+    return _escape_text(str(value))
+
+
+def escape_items(items: Sequence[Any], before: str, after: str) -> str:
+    """
+    Escape a list of items and wrap each one, e.g. in <li> tags.
+    
+    The items are joined once and escaped as one string, then the
+    separators are swapped for the wrapping markup in one replace, so the
+    cost is a few C-level passes instead of Python work per item.
+    
+    Args:
+        items: Items to render
+        before: Markup before each item
+        after: Markup after each item
+        
+    Returns:
+        The wrapped items concatenated, or an empty string for no items
+    """
+    if not items:
+        return ""
+    try:
+        joined = _SEPARATOR.join(items)
+    except TypeError:
+        joined = _SEPARATOR.join("" if item is None else str(item) for item in items)
+    if joined.count(_SEPARATOR) != len(items) - 1:
+        joined = _SEPARATOR.join(("" if item is None else str(item)).replace(_SEPARATOR, "") for item in items)
+    return "".join((before, _escape_text(joined).replace(_SEPARATOR, after + before), after))
+
+
+def minify_html(markup: str) -> str:
+    """
+    Remove the indentation and line breaks used to lay out markup in source.
+    
+    Only whitespace that contains a line break and sits between tags is
+    dropped, which does not change how block-level markup renders;
+    <pre> blocks are left untouched.
+    
+    Args:
+        markup: HTML markup, possibly containing {name} placeholders
+        
+    Returns:
+        Minified markup
+    """
+    pieces = _PRE_BLOCK.split(markup)
+    pieces[0::2] = [_LAYOUT_WHITESPACE.sub("", piece) for piece in pieces[0::2]]
+    return "".join(pieces)
+
+
+def static_html(markup: str) -> str:
+    """Prepare fixed markup once at import time, minified if HTML_MINIFY_ENABLED is set."""
+    return minify_html(markup) if HTML_MINIFY_ENABLED else markup
+
+
+class Template:
+    """
+    An HTML template compiled once into its literal parts and fields.
+    
+    The source is minified at compile time when HTML_MINIFY_ENABLED is set,
+    so rendered output carries no layout whitespace at no per-render cost.
+    
+    render() escapes every value except fields whose name ends in _html and
+    joins the parts in a single pass, so no intermediate copies of the
+    (mostly static, inline-styled) markup are made.
+    """
+    
+    __slots__ = ("_literals", "_fields")
+    
+    def __init__(self, source: str):
+        """
+        Compile a template.
+        
+        Args:
+            source: Markup with {name} placeholders
+        """
+        pieces = _FIELD.split(static_html(source))
+        self._literals = pieces[0::2]
+        self._fields = [(name, name.endswith("_html")) for name in pieces[1::2]]
+    
+    def render(self, **values: Any) -> str:
+        """
+        Fill in the fields.
+        
+        Args:
+            **values: A value for every field of the template
+            
+        Returns:
+            Rendered HTML
+        """
+        literals = self._literals
+        parts = [literals[0]]
+        for index, (name, trusted) in enumerate(self._fields, 1):
+            value = values[name]
+            parts.append(value if trusted else escape(value))
+            parts.append(literals[index])
+        return "".join(parts)
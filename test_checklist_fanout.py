@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for parallel checklist generation.
+Tests that category groups run concurrently and merge into one checklist.
+"""
+
+import sys
+import os
+import asyncio
+import json
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from config.config import CHECKLIST_GROUPS, CHECKLIST_FIELDS
+from core.travel_functions import _fan_out_checklist, _fan_out_checklist_async, format_checklist_html
+
+
+def group_response(fields):
+    return "```json\n" + json.dumps({field: [f"{field}物品"] for field in fields}, ensure_ascii=False) + "\n```"
+
+
+class SlowClient:
+    """Client whose every group call takes the same time."""
+    
+    def generate_checklist_group(self, origin, destination, duration, special_needs, fields, itinerary_text=""):
+        time.sleep(0.2)
+        if fields == ["tips"]:
+            raise RuntimeError("上游错误")
+        return group_response(fields)
+
+
+class SlowAsyncClient:
+    async def generate_checklist_group(self, origin, destination, duration, special_needs, fields, itinerary_text=""):
+        await asyncio.sleep(0.2)
+        return group_response(fields)
+
+
+def test_groups_cover_schema():
+    """Test that the groups cover every checklist field exactly once."""
+    print("🔍 测试分组覆盖...")
+    
+    fields = [field for group in CHECKLIST_GROUPS for field in group]
+    assert sorted(fields) == sorted(CHECKLIST_FIELDS), "分组应恰好覆盖全部清单字段"
+    
+    print("✅ 分组覆盖测试通过")
+
+
+def test_sync_fan_out():
+    """Test that groups run concurrently and a failed group is skipped."""
+    print("\n🔍 测试同步并行生成...")
+    
+    started = time.monotonic()
+    results = list(_fan_out_checklist(SlowClient(), "北京", "杭州", "3-5天", "无", ""))
+    elapsed = time.monotonic() - started
+    
+    assert elapsed < 0.2 * len(CHECKLIST_GROUPS) / 2, f"耗时应接近最慢的分组，实际 {elapsed:.2f}秒"
+    assert len(results) == len(CHECKLIST_GROUPS) - 1, "每完成一个分组应输出一次"
+    merged = results[-1]
+    assert "tips" not in merged and merged["documents"] == ["documents物品"]
+    assert "documents物品" in format_checklist_html(merged)
+    
+    print("✅ 同步并行生成测试通过")
+
+
+def test_async_fan_out():
+    """Test the async fan-out merges every group."""
+    print("\n🔍 测试异步并行生成...")
+    
+    async def run():
+        return [data async for data in _fan_out_checklist_async(SlowAsyncClient(), "北京", "杭州", "3-5天", "无", "")]
+    
+    started = time.monotonic()
+    results = asyncio.run(run())
+    assert time.monotonic() - started < 0.5
+    assert set(results[-1]) == set(CHECKLIST_FIELDS)
+    
+    print("✅ 异步并行生成测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_groups_cover_schema()
+        test_sync_fan_out()
+        test_async_fan_out()
+        print("\n🎉 所有并行清单测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for speculative checklist prefetch.
+Tests that a prefetched checklist is reused only for matching inputs.
+"""
+
+import sys
+import os
+import asyncio
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.prefetch import ChecklistPrefetcher
+
+ITINERARY = "第一天：抵达杭州，入住西湖国宾馆。"
+
+
+class FakeGenerate:
+    """Records calls and returns a checklist after a short delay."""
+    
+    def __init__(self, result="<div>清单</div>"):
+        self.calls = 0
+        self.result = result
+    
+    async def __call__(self, origin, destination, duration, special_needs, itinerary_text):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return f"{self.result}{origin}"
+
+
+def test_hit_and_miss():
+    """Test that the click reuses the prefetch and other inputs miss."""
+    print("🔍 测试预取命中...")
+    
+    async def run():
+        generate = FakeGenerate()
+        prefetcher = ChecklistPrefetcher(enabled=True, max_concurrent=2, max_sessions=8, default_origin="北京", generate=generate)
+        
+        assert prefetcher.start("s1", "", "杭州", "3-5天", "无", ITINERARY), "应以默认出发地启动预取"
+        assert not prefetcher.start("s1", "北京", "杭州", "3-5天", "无", ITINERARY), "相同输入不应重复预取"
+        
+        # Waits for the job still in flight
+        assert await prefetcher.take("s1", "北京", "杭州", "3-5天", "无", ITINERARY) == "<div>清单</div>北京"
+        assert await prefetcher.take("s1", "北京市", "杭州 ", "3-5天", "无", ITINERARY) == "<div>清单</div>北京", "等价输入应命中同一预取"
+        assert await prefetcher.take("s1", "上海", "杭州", "3-5天", "无", ITINERARY) is None, "出发地不同不应命中"
+        assert await prefetcher.take("s2", "北京", "杭州", "3-5天", "无", ITINERARY) is None, "其他会话不应命中"
+        assert generate.calls == 1
+        
+        metrics = prefetcher.metrics()
+        assert metrics["hits"] == 2 and metrics["misses"] == 2 and metrics["running"] == 0
+    
+    asyncio.run(run())
+    print("✅ 预取命中测试通过")
+
+
+def test_concurrency_cap():
+    """Test that prefetches beyond the cap are skipped, not queued."""
+    print("\n🔍 测试并发上限...")
+    
+    async def run():
+        generate = FakeGenerate()
+        prefetcher = ChecklistPrefetcher(enabled=True, max_concurrent=2, max_sessions=8, default_origin="北京", generate=generate)
+        
+        started = [prefetcher.start(f"s{i}", "北京", "杭州", "3-5天", "无", ITINERARY) for i in range(4)]
+        assert started == [True, True, False, False], f"超过上限的预取应被跳过，实际 {started}"
+        await asyncio.sleep(0.1)
+        assert prefetcher.start("s3", "北京", "杭州", "3-5天", "无", ITINERARY), "任务完成后应释放名额"
+        assert prefetcher.metrics()["skipped"] == 2
+    
+    asyncio.run(run())
+    print("✅ 并发上限测试通过")
+
+
+def test_failures_and_switch():
+    """Test that failed prefetches fall through and the switch disables prefetch."""
+    print("\n🔍 测试失败回退与开关...")
+    
+    async def run():
+        failing = FakeGenerate(result="抱歉，生成清单时出现了错误: 超时")
+        prefetcher = ChecklistPrefetcher(enabled=True, max_concurrent=2, max_sessions=8, default_origin="北京", generate=failing)
+        prefetcher.start("s1", "北京", "杭州", "3-5天", "无", ITINERARY)
+        assert await prefetcher.take("s1", "北京", "杭州", "3-5天", "无", ITINERARY) is None, "失败结果不应返回"
+        assert prefetcher.metrics()["sessions"] == 0
+        
+        disabled = ChecklistPrefetcher(enabled=False, generate=FakeGenerate())
+        assert not disabled.start("s1", "北京", "杭州", "3-5天", "无", ITINERARY)
+        
+        no_origin = ChecklistPrefetcher(enabled=True, default_origin="", generate=FakeGenerate())
+        assert not no_origin.start("s1", "", "杭州", "3-5天", "无", ITINERARY), "缺少出发地时不应预取"
+    
+    asyncio.run(run())
+    print("✅ 失败回退与开关测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_hit_and_miss()
+        test_concurrency_cap()
+        test_failures_and_switch()
+        print("\n🎉 所有清单预取测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for the SQLite checklist store.
+Tests saving and loading, indexed history listing and importing both legacy JSON layouts.
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from data.checklist_store import ChecklistStore
+
+
+def test_save_and_load():
+    """Test that payloads round-trip and are stored compressed."""
+    print("🔍 测试清单保存与读取...")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = ChecklistStore(os.path.join(tmp_dir, "store.sqlite3"), legacy_dir=None)
+        data = {"documents": ["身份证", "医保卡"] * 50, "tips": ["注意防晒"]}
+        record_id = store.save(data, origin="北京", destination="杭州", duration="3天")
+        assert store.load(record_id) == data
+        assert store.load("missing") is None
+        
+        conn = store._connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal", "应使用WAL模式"
+        blob = conn.execute("SELECT payload FROM records WHERE id = ?", (record_id,)).fetchone()[0]
+        assert len(blob) < len(json.dumps(data, ensure_ascii=False).encode("utf-8")) / 2, "载荷应压缩存储"
+        
+        assert store.delete(record_id) and not store.delete(record_id)
+    
+    print("✅ 清单保存与读取测试通过")
+
+
+def test_history():
+    """Test history order, filters and that listing uses the indexes."""
+    print("\n🔍 测试历史记录查询...")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = ChecklistStore(os.path.join(tmp_dir, "store.sqlite3"), legacy_dir=None)
+        for index, destination in enumerate(["杭州", "三亚", "杭州"]):
+            store.save({"n": index}, origin="北京", destination=destination, duration="3天", record_id=f"r{index}")
+        
+        assert [record["id"] for record in store.history()] == ["r2", "r1", "r0"], "应按时间倒序"
+        assert [record["id"] for record in store.history(destination="杭州")] == ["r2", "r0"]
+        assert [record["id"] for record in store.history(limit=1)] == ["r2"]
+        assert store.history(before=store.history()[0]["created_at"])[0]["id"] == "r1"
+        assert "payload" not in store.history()[0], "列表不应读取载荷"
+        
+        conn = store._connection()
+        for where in ("", " WHERE destination = '杭州'", " WHERE origin = '北京'"):
+            plan = " ".join(str(row) for row in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT id FROM records{where} ORDER BY created_at DESC, rowid DESC LIMIT 10"
+            ))
+            assert "USING INDEX" in plan and "TEMP B-TREE" not in plan, f"查询应走索引: {plan}"
+    
+    print("✅ 历史记录查询测试通过")
+
+
+def test_import_legacy_json():
+    """Test that both legacy JSON layouts are imported once."""
+    print("\n🔍 测试旧版JSON导入...")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_dir = os.path.join(tmp_dir, "checklist_data")
+        os.makedirs(legacy_dir)
+        with open(os.path.join(legacy_dir, "checklist_北京_to_杭州_3天_20240101_080000.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "metadata": {"created_at": "2024-01-01T08:00:00", "origin": "北京", "destination": "杭州", "duration": "3天"},
+                "checklist": {"documents": ["身份证"]}
+            }, f, ensure_ascii=False)
+        with open(os.path.join(legacy_dir, "abc123.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "id": "abc123", "destination": "三亚", "duration": "一周左右",
+                "timestamp": "2024-02-01 09:30:00", "data": {"checklist": []}
+            }, f, ensure_ascii=False)
+        with open(os.path.join(legacy_dir, "broken.json"), "w", encoding="utf-8") as f:
+            f.write("{不是JSON")
+        
+        db_path = os.path.join(legacy_dir, "store.sqlite3")
+        store = ChecklistStore(db_path, legacy_dir=legacy_dir)
+        history = store.history()
+        assert [record["id"] for record in history] == ["abc123", "checklist_北京_to_杭州_3天_20240101_080000"]
+        assert history[0]["created_at"] == "2024-02-01T09:30:00" and history[1]["origin"] == "北京"
+        assert store.load("abc123") == {"checklist": []}
+        
+        assert store.import_json_dir(legacy_dir) == 0, "重复导入应跳过已有记录"
+        assert len(ChecklistStore(db_path, legacy_dir=legacy_dir).history()) == 2, "已迁移的库不应再次导入"
+    
+    print("✅ 旧版JSON导入测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_save_and_load()
+        test_history()
+        test_import_legacy_json()
+        print("\n🎉 所有清单存储测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
\ No newline at end of file
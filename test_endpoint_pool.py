@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for the endpoint pool.
+Tests least-outstanding balancing, ejection of unhealthy members, failing over from a rejected key and configuration parsing.
+"""
+
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from api.pool import EndpointPool, parse_endpoints
+from api.resilience import RetryPolicy, CircuitBreaker, call_with_retry
+
+
+class FakeError(Exception):
+    """Upstream error carrying a status code."""
+    
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+def make_pool(count=3, **kwargs):
+    endpoints = [{"base_url": f"https://api{i}.example.com/v1/", "api_key": f"key-000{i}"} for i in range(count)]
+    return EndpointPool(endpoints, lambda base_url, api_key: base_url, **kwargs)
+
+
+def test_least_outstanding():
+    """Test that requests go to the least busy member."""
+    print("🔍 测试最少未完成请求均衡...")
+    
+    pool = make_pool()
+    members = [pool.acquire() for _ in range(3)]
+    assert len({m.name for m in members}) == 3, "空闲成员应轮流分担请求"
+    
+    pool.release(members[1])
+    assert pool.acquire() is members[1], "应选择未完成请求最少的成员"
+    
+    print("✅ 负载均衡测试通过")
+
+
+def test_ejection():
+    """Test that failing members are taken out and request errors are ignored."""
+    print("\n🔍 测试异常成员摘除...")
+    
+    pool = make_pool(count=2, eject_failures=2, eject_seconds=60)
+    bad = pool.members[0]
+    
+    pool.record_failure(bad, FakeError(400))
+    pool.record_failure(bad, FakeError(400))
+    assert all(m["healthy"] for m in pool.metrics()), "请求本身的错误不应摘除成员"
+    
+    pool.record_failure(bad, FakeError(503))
+    pool.record_failure(bad, FakeError(401))
+    assert not pool.metrics()[0]["healthy"], "连续失败的成员应被摘除"
+    
+    for _ in range(5):
+        member = pool.acquire()
+        assert member is not bad, "被摘除的成员不应再接收请求"
+        pool.release(member)
+    
+    pool.record_success(bad, 0.2)
+    assert pool.metrics()[0]["healthy"]
+    assert pool.metrics()[0]["latency_avg_seconds"] == 0.2
+    
+    print("✅ 成员摘除测试通过")
+
+
+def test_fail_over():
+    """Test that a rejected key is retried on another member while one is healthy."""
+    print("\n🔍 测试密钥失效后切换成员...")
+    
+    def call(pool):
+        def attempt(timeout):
+            member = pool.acquire()
+            try:
+                if member.client.startswith("https://api0"):
+                    error = FakeError(401)
+                    pool.record_failure(member, error)
+                    raise error
+                return member.client
+            finally:
+                pool.release(member)
+        return call_with_retry(attempt, RetryPolicy(base_delay=0), CircuitBreaker(), pool.can_fail_over)
+    
+    pool = make_pool(count=2)
+    pool._next = 0  # the bad member is picked first
+    assert call(pool) == "https://api1.example.com/v1/", "应改由健康成员处理"
+    assert not pool.metrics()[0]["healthy"], "密钥失效的成员应立即摘除"
+    assert not pool.can_fail_over(FakeError(500)), "其他错误不应按成员故障处理"
+    
+    try:
+        call(make_pool(count=1))
+        assert False, "没有其他可用成员时应抛出原错误"
+    except FakeError as e:
+        assert e.status_code == 401
+    
+    print("✅ 成员切换测试通过")
+
+
+def test_parse_endpoints():
+    """Test building the pool from configuration strings."""
+    print("\n🔍 测试接口池配置解析...")
+    
+    endpoints = parse_endpoints("https://a/v1/|k1, https://b/v1/|k2", "", "https://default/", "k0")
+    assert endpoints == [
+        {"base_url": "https://a/v1/", "api_key": "k1"},
+        {"base_url": "https://b/v1/", "api_key": "k2"},
+    ]
+    assert parse_endpoints("", "k1,k2", "https://default/", "k0") == [
+        {"base_url": "https://default/", "api_key": "k1"},
+        {"base_url": "https://default/", "api_key": "k2"},
+    ]
+    assert parse_endpoints("", "", "https://default/", "k0") == [{"base_url": "https://default/", "api_key": "k0"}]
+    assert parse_endpoints("", "", "https://default/", "") == []
+    
+    print("✅ 配置解析测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_least_outstanding()
+        test_ejection()
+        test_fail_over()
+        test_parse_endpoints()
+        print("\n🎉 所有接口池测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
@@ -12,11 +12,9 @@ def test_checklist_function():
     # Import the function
     try:
         from src.core.travel_functions import generate_checklist
-        from src.ui.components import create_loading_animation
         from src.utils.helpers import extract_hotels_from_itinerary
     except ImportError:
         from core.travel_functions import generate_checklist
-        from ui.components import create_loading_animation
         from utils.helpers import extract_hotels_from_itinerary
     
     # Test data
@@ -51,10 +49,8 @@ def test_checklist_function():
             hotel_info = f"行程规划中提到的酒店：{', '.join(hotels)}"
             enhanced_needs = f"{needs}\n{hotel_info}" if needs else hotel_info
         
-        # Generate checklist and return both loading and output components
-        checklist_result = generate_checklist(origin, destination, duration, enhanced_needs, itinerary_content)
-        loading_animation = create_loading_animation()
-        return loading_animation, checklist_result
+        # Generate checklist; the loading overlay is shown and hidden in the browser
+        return generate_checklist(origin, destination, duration, enhanced_needs, itinerary_content)
     
     print("测试参数:")
     print(f"出发地: {test_origin}")
@@ -65,19 +61,16 @@ def test_checklist_function():
     
     # Test the function
     try:
-        loading_result, checklist_result = generate_checklist_with_itinerary(
+        checklist_result = generate_checklist_with_itinerary(
             test_origin, test_destination, test_duration, test_needs, test_itinerary
         )
         
         print(f"\n✅ 函数执行成功!")
-        print(f"返回类型: {type(loading_result)}, {type(checklist_result)}")
-        print(f"加载动画长度: {len(loading_result)} 字符")
+        print(f"返回类型: {type(checklist_result)}")
         print(f"清单结果长度: {len(checklist_result)} 字符")
         
         # Verify return structure
-        assert isinstance(loading_result, str), "加载动画应该是字符串"
         assert isinstance(checklist_result, str), "清单结果应该是字符串"
-        assert len(loading_result) > 0, "加载动画不应为空"
         assert len(checklist_result) > 0, "清单结果不应为空"
         
         print("✅ 返回结构验证通过!")
@@ -103,7 +96,7 @@ if __name__ == "__main__":
     success = test_checklist_function()
     if success:
         print("\n🎉 修复验证成功!")
-        print("🎉 清单生成功能现在可以正确返回两个值")
+        print("🎉 清单生成功能现在可以正确返回清单内容")
     else:
         print("\n❌ 修复验证失败!")
         sys.exit(1)
\ No newline at end of file
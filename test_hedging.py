@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for hedged requests.
+Tests the hedge delay, the hedge budget and that the faster leg wins.
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from api.hedging import HedgingPolicy, run_hedged, async_run_hedged
+
+
+def test_delay_and_budget():
+    """Test the percentile delay and that hedges stay within the ratio."""
+    print("🔍 测试对冲延迟与预算...")
+    
+    policy = HedgingPolicy(enabled=True, default_delay=2.0, min_delay=0.1, max_delay=5.0, max_ratio=0.1)
+    assert policy.hedge_delay() == 2.0, "样本不足时应使用默认延迟"
+    
+    for i in range(100):
+        policy.record_ttft(i / 100)
+    assert abs(policy.hedge_delay() - 0.95) < 0.02, f"应使用P95首字延迟，实际 {policy.hedge_delay()}"
+    
+    hedges = 0
+    for _ in range(100):
+        policy.record_request()
+        if policy.try_spend():
+            hedges += 1
+    assert hedges <= 11, f"对冲次数应不超过请求数的10%，实际 {hedges}"
+    
+    print("✅ 对冲延迟与预算测试通过")
+
+
+def test_sync_hedge_wins():
+    """Test that a slow primary loses to the hedge and is discarded."""
+    print("\n🔍 测试同步对冲...")
+    
+    policy = HedgingPolicy(enabled=True, default_delay=0.05, min_delay=0.01)
+    discarded = []
+    
+    def slow_primary():
+        time.sleep(0.3)
+        return "主请求"
+    
+    result = run_hedged(slow_primary, lambda: "对冲请求", policy, lambda: True, discarded.append)
+    assert result == "对冲请求"
+    time.sleep(0.4)
+    assert discarded == ["主请求"], "落后的请求应被关闭"
+    
+    result = run_hedged(lambda: "主请求", lambda: "对冲请求", policy, lambda: True, discarded.append)
+    assert result == "主请求", "首字及时到达时不应发出对冲"
+    assert policy.metrics()["hedges"] == 1
+    
+    def slow():
+        time.sleep(0.1)
+        return "主请求"
+    
+    starved = HedgingPolicy(enabled=True, default_delay=0.02, min_delay=0.01, max_ratio=0.0)
+    assert run_hedged(slow, lambda: "对冲请求", starved, lambda: False, discarded.append) == "主请求"
+    assert starved.metrics()["hedges"] == 0, "未能获取槽位时不应计为对冲"
+    assert starved.try_spend(), "未发出的对冲应退还预算"
+    
+    print("✅ 同步对冲测试通过")
+
+
+def test_async_hedge_cancels_loser():
+    """Test that the async loser still waiting is cancelled."""
+    print("\n🔍 测试异步对冲...")
+    
+    policy = HedgingPolicy(enabled=True, default_delay=0.05, min_delay=0.01)
+    cancelled = []
+    
+    async def slow_primary():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+        return "主请求"
+    
+    async def hedge():
+        return "对冲请求"
+    
+    async def discard(value):
+        pass
+    
+    async def run():
+        result = await async_run_hedged(slow_primary, hedge, policy, lambda: True, discard)
+        await asyncio.sleep(0.01)
+        return result
+    
+    assert asyncio.run(run()) == "对冲请求"
+    assert cancelled == [1], "落后的请求应被取消"
+    
+    print("✅ 异步对冲测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_delay_and_budget()
+        test_sync_hedge_wins()
+        test_async_hedge_cancels_loser()
+        print("\n🎉 所有对冲请求测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for the HTML template renderer.
+Tests escaping of model-supplied text and the checklist and info sections built from templates.
+"""
+
+import sys
+import os
+import io
+import time
+import contextlib
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.templates import Template, escape, escape_items, minify_html
+from utils.payload import PayloadMeter
+from config.config import CUSTOM_CSS
+from data.processors import format_destination_info, create_travel_summary
+import core.travel_functions as travel_functions
+
+
+def test_template():
+    """Test that fields are escaped unless marked as HTML."""
+    print("🔍 测试模板渲染...")
+    
+    template = Template('<p title="{title}">{text}</p>{extra_html}')
+    assert template.render(title='"a"', text="<b>&</b>", extra_html="<br>") == \
+        '<p title="&quot;a&quot;">&lt;b&gt;&amp;&lt;/b&gt;</p><br>'
+    assert escape(None) == "" and escape(3) == "3"
+    assert escape_items(["a<", "b", None], "<li>", "</li>") == "<li>a&lt;</li><li>b</li><li></li>"
+    assert escape_items(["带\x00分隔符", "x"], "<li>", "</li>") == "<li>带分隔符</li><li>x</li>", "条目中的分隔符不应拆出新条目"
+    assert escape_items([], "<li>", "</li>") == ""
+    
+    print("✅ 模板渲染测试通过")
+
+
+def test_sections_escape_model_text():
+    """Test that checklist and info sections escape what the model wrote."""
+    print("\n🔍 测试内容转义...")
+    
+    data = {
+        "documents": ["身份证", "<script>alert(1)</script>"],
+        "booking_guides": {"hotel": {"title": "酒店<预订>", "platforms": ["携程"]}},
+        "tips": ["温度>30℃时注意防暑"],
+    }
+    page = travel_functions.format_checklist_html(data)
+    assert "<script>" not in page and "&lt;script&gt;" in page
+    assert "酒店&lt;预订&gt;" in page and "温度&gt;30℃时注意防暑" in page
+    assert page.count("📄 证件类") == 1 and '<ul class="tc-platforms"><li>携程</li></ul>' in page
+    
+    travel_functions._checklist_section_head.cache_clear()
+    for _ in range(3):
+        travel_functions.format_checklist_html(data)
+    assert travel_functions._checklist_section_head.cache_info().hits == 2, "类别标题应只渲染一次"
+    
+    assert "&lt;img" in travel_functions.format_checklist_text("<img src=x>")
+    assert "西湖&amp;灵隐" in format_destination_info({"name": "杭州", "attractions": ["西湖&灵隐"]})
+    assert "<i>" not in create_travel_summary({"highlights": ["<i>夜游</i>"]})
+    
+    print("✅ 内容转义测试通过")
+
+
+def test_minify_html():
+    """Test that layout whitespace between tags is removed and text is kept."""
+    print("\n🔍 测试HTML压缩...")
+    
+    markup = """
+    <div class="a">
+        <p>第一天 上午</p>
+        {items_html}
+        <pre>保留
+   缩进</pre>
+    </div>
+    """
+    assert minify_html(markup) == '<div class="a"><p>第一天 上午</p>{items_html}<pre>保留\n   缩进</pre></div>'
+    assert minify_html("<b>a</b> <i>b</i>") == "<b>a</b> <i>b</i>", "同一行内的空格不应删除"
+    
+    print("✅ HTML压缩测试通过")
+
+
+def test_class_based_checklist():
+    """Test that checklist markup only uses classes defined in CUSTOM_CSS."""
+    print("\n🔍 测试清单类名样式...")
+    
+    page = travel_functions.format_checklist_html({
+        "documents": ["身份证"] * 20,
+        "booking_guides": {"hotel": {"title": "酒店", "platforms": ["携程"]}},
+        "tips": ["注意防晒"],
+    })
+    assert page.count("style=") == 1, "只有类别颜色使用内联样式"
+    assert "<li>身份证</li>" in page and "\n" not in page
+    for name in ("tc-checklist", "tc-intro", "tc-section", "tc-platforms", "tc-footer", "tc-pending", "tc-text"):
+        assert f".{name}" in CUSTOM_CSS, f"CUSTOM_CSS 缺少 .{name}"
+    
+    print("✅ 清单类名样式测试通过")
+
+
+def test_payload_meter():
+    """Test per-endpoint payload accounting."""
+    print("\n🔍 测试响应体积统计...")
+    
+    meter = PayloadMeter(report_interval=0)
+    for _ in range(3):
+        meter.record("checklist")
+    meter.finish("checklist", "清单")
+    meter.finish("checklist", "ab")
+    metrics = meter.metrics()["checklist"]
+    assert metrics["updates"] == 3 and metrics["responses"] == 2
+    assert metrics["max_bytes"] == 6 and metrics["last_bytes"] == 2 and metrics["avg_bytes"] == 4
+    assert "checklist" in meter.report()
+    
+    periodic = PayloadMeter(report_interval=0.05)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        periodic.finish("itinerary", "行程")
+        time.sleep(0.06)
+        periodic.finish("itinerary", "行程")
+        periodic.finish("itinerary", "行程")
+    assert output.getvalue().count("响应体积统计") == 1, "运行期间应按间隔输出统计"
+    
+    print("✅ 响应体积统计测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_template()
+        test_sections_escape_model_text()
+        test_minify_html()
+        test_class_based_checklist()
+        test_payload_meter()
+        print("\n🎉 所有模板渲染测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for itinerary context compression.
+Tests that the checklist prompt gets deduplicated facts within a token budget.
+"""
+
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import time
+
+from utils.helpers import compress_itinerary_context, estimate_tokens, extract_hotels_from_itinerary
+
+ITINERARY = """
+第一天：乘高铁抵达杭州，入住西湖国宾馆。下午漫步西湖，早晚温差较大，注意保暖。
+第二天：游览灵隐寺，午餐品尝杭帮菜。晚上住宿：西湖国宾馆。
+第三天：乘游船游览西湖，白天紫外线较强，注意防晒。乘出租车前往高铁站返程。
+"""
+
+
+def test_extracts_facts():
+    """Test that hotels, transport, climate and activities are kept once."""
+    print("🔍 测试行程要点提取...")
+    
+    context = compress_itinerary_context(ITINERARY)
+    lines = dict(line.split("：", 1) for line in context.split("\n"))
+    
+    assert lines["住宿"] == "西湖国宾馆", f"酒店应去重后只出现一次，实际 {lines['住宿']}"
+    assert lines["交通"] == "高铁、出租车、游船"
+    assert "注意保暖" in lines["气候"] and "注意防晒" in lines["气候"]
+    assert "游览灵隐寺" in lines["活动"]
+    
+    print("✅ 行程要点提取测试通过")
+
+
+def test_token_budget():
+    """Test that long itineraries are cut to the budget."""
+    print("\n🔍 测试令牌预算...")
+    
+    long_itinerary = "\n".join(
+        f"第{day}天：游览景点{day}号公园，入住酒店{day}号宾馆，当天气温{day}℃。" for day in range(1, 31)
+    )
+    context = compress_itinerary_context(long_itinerary, token_budget=120)
+    assert estimate_tokens(context) <= 120, f"应不超过预算，实际 {estimate_tokens(context)}"
+    assert context.startswith("住宿："), "预算不足时应优先保留住宿信息"
+    assert estimate_tokens(context) < estimate_tokens(long_itinerary) / 4
+    
+    assert compress_itinerary_context("") == ""
+    assert estimate_tokens("杭州 West Lake") == 2 + 2
+    
+    print("✅ 令牌预算测试通过")
+
+
+def test_hotel_names():
+    """Test that hotel names are cut to the name itself and merged."""
+    print("\n🔍 测试酒店名称提取...")
+    
+    text = "抵达北京，入住北京饭店。\n- 推荐酒店：北京香格里拉大酒店\n- 香格里拉大酒店步行可达\n午后回酒店休息，附近的饭店用餐。"
+    assert extract_hotels_from_itinerary(text) == ["北京饭店", "北京香格里拉大酒店"]
+    assert extract_hotels_from_itinerary("Stay at Hilton Garden Inn, back to hotel.") == ["Hilton Garden Inn"]
+    assert extract_hotels_from_itinerary("", limit=1) == []
+    
+    started = time.perf_counter()
+    extract_hotels_from_itinerary("早上出发沿湖慢慢散步欣赏风景" * 8000)
+    assert time.perf_counter() - started < 1, "无标点长文本不应出现回溯爆炸"
+    
+    print("✅ 酒店名称提取测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_extracts_facts()
+        test_token_budget()
+        test_hotel_names()
+        print("\n🎉 所有行程压缩测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
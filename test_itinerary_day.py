@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test script for single-day itinerary regeneration.
+Tests splitting an itinerary into days and splicing one regenerated day back in.
+"""
+
+import sys
+import os
+import asyncio
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.helpers import split_itinerary_days, summarize_day
+from data.itinerary import parse_trip, render_trip_text
+import core.travel_functions as travel_functions
+
+ITINERARY = """您好！以下是为您定制的杭州行程。
+
+## 第一天：抵达杭州
+- 上午：乘高铁抵达
+- 注意事项：带好身份证
+
+## 第二天：西湖
+- 上午：乘游船游览西湖
+- 下午：回酒店休息
+
+## 第三天：灵隐寺
+- 上午：游览灵隐寺
+
+## ⚠️ 注意事项
+1. 多喝水
+
+## 应急准备：
+拨打120"""
+
+
+class FakeClient:
+    """Records the day prompt arguments and streams a fixed day plan."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def stream_itinerary_day(self, **kwargs):
+        self.calls.append(kwargs)
+        yield "上午：在酒店"
+        yield "附近散步"
+
+
+def test_split_and_join():
+    """Test that days, preamble and closing sections are separated."""
+    print("🔍 测试按天拆分...")
+    
+    segments = split_itinerary_days(ITINERARY)
+    assert [day["day"] for day in segments["days"]] == [1, 2, 3]
+    assert segments["preamble"] == "您好！以下是为您定制的杭州行程。"
+    assert "注意事项：带好身份证" in segments["days"][0]["text"], "当天的注意事项不应被当作结尾部分"
+    assert segments["epilogue"].startswith("## ⚠️ 注意事项") and "应急准备" in segments["epilogue"]
+    assert render_trip_text(parse_trip(ITINERARY)) == ITINERARY
+    
+    overview = "📅 行程总览\n第1天：抵达\n第2天：西湖\n\n第1天：抵达杭州\n乘高铁\n\n第2天：西湖\n游船"
+    segments = split_itinerary_days(overview)
+    assert segments["preamble"].endswith("第2天：西湖"), "总览应保留在开头部分"
+    assert [day["text"] for day in segments["days"]] == ["第1天：抵达杭州\n乘高铁", "第2天：西湖\n游船"]
+    
+    assert split_itinerary_days("暂无安排")["days"] == []
+    assert summarize_day("## 第二天：西湖\n- 上午：游船\n- 下午：休息") == "第二天：西湖；上午：游船；下午：休息"
+    
+    print("✅ 按天拆分测试通过")
+
+
+def test_regenerate_day():
+    """Test that only the chosen day is requested and spliced back in."""
+    print("\n🔍 测试单日重新生成...")
+    
+    client = FakeClient()
+    travel_functions.get_client = lambda: client
+    trip = parse_trip(ITINERARY, "杭州", "3-5天")
+    
+    frames = list(travel_functions.regenerate_itinerary_day_stream(
+        trip, 2, "杭州", "3-5天", "行走自如", ["饮食清淡"], "安排轻松一些"
+    ))
+    text, updated = frames[-1]
+    
+    assert len(client.calls) == 1
+    call = client.calls[0]
+    assert call["day"] == 2 and call["change_request"] == "安排轻松一些"
+    assert call["current_plan"].startswith("## 第二天：西湖")
+    assert call["previous_day"].startswith("第一天：抵达杭州") and call["next_day"] == "第三天：灵隐寺；上午：游览灵隐寺"
+    
+    assert "第2天\n上午：在酒店附近散步" in text, "新的一天应带标题插回原位"
+    assert "乘游船" not in text and "游览灵隐寺" in text and "拨打120" in text
+    assert [day.day for day in updated.days] == [1, 2, 3]
+    assert updated.days[1].activities[0].description == "在酒店附近散步"
+    assert trip.days[1].text.startswith("## 第二天"), "原行程不应被修改"
+    assert text == render_trip_text(updated), "流式拼接的文本应与完整渲染一致"
+    assert "第2天\n上午：在酒店" in frames[0][0] and "游览灵隐寺" in frames[0][0]
+    assert all(frame[1] is None for frame in frames[:-1]), "当天生成完毕后才解析"
+    
+    message, failed = list(travel_functions.regenerate_itinerary_day_stream(
+        trip, 5, "杭州", "3-5天", "行走自如", ["饮食清淡"]
+    ))[-1]
+    assert failed is None and message == "未找到第5天的行程"
+    assert list(travel_functions.regenerate_itinerary_day_stream(
+        None, 1, "杭州", "3-5天", "行走自如", []
+    ))[-1][1] is None
+    
+    print("✅ 单日重新生成测试通过")
+
+
+def test_itinerary_stream_outcome():
+    """Test that the itinerary stream only returns a trip for a real itinerary."""
+    print("\n🔍 测试行程流式结果...")
+    
+    class FakeAsyncClient:
+        def __init__(self, fail):
+            self.fail = fail
+        
+        async def stream_itinerary_plan(self, **kwargs):
+            yield "## 第一天：抵达杭州\n"
+            if self.fail:
+                raise RuntimeError("上游错误")
+            yield "- 上午：乘高铁抵达"
+    
+    async def collect(fail):
+        travel_functions.get_async_client = lambda: FakeAsyncClient(fail)
+        return [frame async for frame in travel_functions.generate_itinerary_plan_stream_async(
+            "杭州", "3-5天", "行走自如", []
+        )]
+    
+    frames = asyncio.run(collect(False))
+    text, trip = frames[-1]
+    assert all(frame[1] is None for frame in frames[:-1]), "行程生成完毕后才解析"
+    assert trip is not None and [day.day for day in trip.days] == [1]
+    assert text.endswith("乘高铁抵达")
+    
+    message, failed = asyncio.run(collect(True))[-1]
+    assert failed is None, "生成失败时不应返回行程"
+    assert message.startswith("抱歉，制定行程时出现了错误")
+    
+    print("✅ 行程流式结果测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_split_and_join()
+        test_regenerate_day()
+        test_itinerary_stream_outcome()
+        print("\n🎉 所有单日重新生成测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
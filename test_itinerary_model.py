@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script for the structured itinerary model.
+Tests parsing JSON and prose itineraries, rendering, and downstream field access.
+"""
+
+import sys
+import os
+import copy
+import json
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from data.models import Trip, Day, Activity, Hotel, Meal
+from data.itinerary import parse_trip, render_trip_text, trip_checklist_context
+from data.processors import create_travel_summary
+
+JSON_ITINERARY = {
+    "summary": "杭州三日慢游",
+    "highlights": ["西湖游船", "灵隐祈福"],
+    "estimated_cost": "约3000元",
+    "days": [
+        {
+            "day": 1,
+            "title": "抵达杭州",
+            "activities": [{"time": "下午", "description": "入住休整", "location": "西湖边", "transport": "高铁"}],
+            "meals": [{"slot": "晚餐", "suggestion": "杭帮菜"}],
+            "hotel": {"name": "西湖国宾馆", "note": "湖景房"},
+            "rest": "午后小憩"
+        },
+        {
+            "day": 2,
+            "title": "西湖<游船>",
+            "activities": ["上午乘游船"],
+            "meals": {"午餐": "楼外楼"},
+            "hotel": "西湖国宾馆"
+        }
+    ],
+    "tips": ["多喝水"],
+    "emergency": ["随身携带常用药"]
+}
+
+PROSE_ITINERARY = """以下是为您定制的行程。
+
+## 第一天：抵达杭州
+- 上午：乘高铁抵达
+- 午餐：杭帮菜
+- 住宿：西湖国宾馆
+
+## 第二天：灵隐寺
+- 09:00-11:00：游览灵隐寺
+- 休息安排：午后回酒店休息
+
+## 注意事项
+多喝水"""
+
+
+def test_slots():
+    """Test that the model classes are slotted and copy cleanly."""
+    print("🔍 测试紧凑数据结构...")
+    
+    for cls in (Trip, Day, Activity, Hotel, Meal):
+        assert "__slots__" in cls.__dict__, f"{cls.__name__} 应使用 __slots__"
+    day = Day(1, activities=[Activity("上午", "散步")])
+    assert not hasattr(day, "__dict__")
+    assert Day(2).activities is not Day(3).activities, "默认列表不应共享"
+    assert copy.deepcopy(day) == day
+    
+    print("✅ 紧凑数据结构测试通过")
+
+
+def test_parse_json():
+    """Test that a JSON itinerary is read field by field."""
+    print("\n🔍 测试JSON行程解析...")
+    
+    trip = parse_trip("```json\n" + json.dumps(JSON_ITINERARY, ensure_ascii=False) + "\n```", "杭州", "3-5天")
+    assert trip.destination == "杭州" and trip.overview == "杭州三日慢游"
+    assert [day.day for day in trip.days] == [1, 2]
+    assert trip.days[0].activities[0].transport == "高铁"
+    assert trip.days[1].meals == [Meal("午餐", "楼外楼")]
+    assert trip.hotels() == ["西湖国宾馆"] and trip.transports() == ["高铁"]
+    
+    text = render_trip_text(trip)
+    assert "第1天：抵达杭州" in text and "- 下午：入住休整（西湖边），交通：高铁" in text
+    assert "- 住宿：西湖国宾馆（湖景房）" in text and "⚠️ 注意事项\n- 多喝水" in text
+    
+    summary = create_travel_summary(trip)
+    assert "约3000元" in summary and "西湖游船" in summary
+    
+    print("✅ JSON行程解析测试通过")
+
+
+def test_parse_prose():
+    """Test that prose is split into days with recognisable fields."""
+    print("\n🔍 测试文本行程解析...")
+    
+    trip = parse_trip(PROSE_ITINERARY, "杭州", "3-5天")
+    assert trip.overview == "以下是为您定制的行程。" and trip.notes == "## 注意事项\n多喝水"
+    first, second = trip.days
+    assert first.title == "抵达杭州" and first.activities[0].transport == "高铁"
+    assert first.meals == [Meal("午餐", "杭帮菜")] and first.hotel == Hotel("西湖国宾馆")
+    assert second.activities[0].time == "09:00-11:00" and second.rest == "午后回酒店休息"
+    assert render_trip_text(trip) == PROSE_ITINERARY, "文本行程应原样还原"
+    
+    context = trip_checklist_context(trip)
+    assert context.startswith("住宿：西湖国宾馆\n交通：高铁")
+    
+    assert create_travel_summary(trip).count("第") >= 2, "没有亮点时应以每日主题作为摘要"
+    assert parse_trip("抱歉，无法生成行程").days == []
+    
+    print("✅ 文本行程解析测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_slots()
+        test_parse_json()
+        test_parse_prose()
+        print("\n🎉 所有行程数据模型测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
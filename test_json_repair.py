@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for JSON location and repair.
+Tests that JSON wrapped in prose or damaged by the model still parses on the first try.
+"""
+
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.helpers import safe_json_parse, extract_json_from_text
+from utils.json_repair import find_json
+
+
+def test_locate():
+    """Test that the JSON is found by bracket matching, not greedily."""
+    print("🔍 测试JSON定位...")
+    
+    response = '好的，清单如下：\n{"documents": ["身份证{原件}"], "tips": ["多喝水"]}\n如需调整{随时}告诉我。'
+    assert safe_json_parse(response) == {"documents": ["身份证{原件}"], "tips": ["多喝水"]}
+    assert extract_json_from_text("说明{不是JSON}之后 [1, 2]") == "[1, 2]", "无效片段后应继续查找"
+    assert safe_json_parse("没有JSON") is None and safe_json_parse("") is None
+    
+    prose_bracket = '清单如下（共[3]类）：\n```json\n{"documents":["身份证"]}\n```'
+    assert safe_json_parse(prose_bracket) == {"documents": ["身份证"]}, "正文中的方括号不应被当作结果"
+    bracketed_prose = '根据[您的需求]、[目的地气候]和[行程]，清单如下：\n```json\n{"documents": ["身份证"]}\n```'
+    assert safe_json_parse(bracketed_prose) == {"documents": ["身份证"]}, "正文中的多个方括号不应耗尽查找次数"
+    braced_prose = '示例{a}、{b}、{c}不是答案：\n```json\n{"tips": ["多喝水"]}\n```'
+    assert safe_json_parse(braced_prose) == {"tips": ["多喝水"]}, "应优先使用json代码块"
+    assert safe_json_parse("[1, 2]") is None and safe_json_parse("共[3]类") is None, "非对象的JSON应返回None"
+    
+    print("✅ JSON定位测试通过")
+
+
+def test_repair():
+    """Test trailing commas, curly quotes, raw line breaks and truncated tails."""
+    print("\n🔍 测试JSON修复...")
+    
+    assert safe_json_parse('{"a": [1, 2,], "b": "x",}') == {"a": [1, 2], "b": "x"}
+    assert safe_json_parse('{“documents”: [“身份证”, “医保卡（原件）”]}') == {"documents": ["身份证", "医保卡（原件）"]}
+    assert safe_json_parse('{"tips": ["医保卡（“原件”）"]}') == {"tips": ["医保卡（“原件”）"]}, "字符串内的中文引号应保留"
+    assert safe_json_parse('{"tips": ["带\n伞"]}') == {"tips": ["带\n伞"]}
+    
+    truncated = '{"documents": ["身份证"], "clothing": ["外套", "雨'
+    assert safe_json_parse(truncated) == {"documents": ["身份证"], "clothing": ["外套", "雨"]}
+    assert find_json('{"documents": ["身份证"], "clothing"') == '{"documents": ["身份证"]}', "缺少值的键应丢弃"
+    assert find_json('{"days": 5, "ok": tru') == '{"days": 5}', "不完整的字面量应丢弃"
+    
+    print("✅ JSON修复测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_locate()
+        test_repair()
+        print("\n🎉 所有JSON修复测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
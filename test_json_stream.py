@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for the incremental JSON parser.
+Tests that checklist categories are emitted as soon as they are complete.
+"""
+
+import sys
+import os
+import json
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.json_stream import StreamingJSONObjectParser
+from core.travel_functions import _finish_checklist_stream
+
+CHECKLIST = {
+    "documents": ["身份证", "医保卡（\"原件\"）"],
+    "clothing": ["薄外套{可叠放}", "舒适的鞋子]"],
+    "days": 5,
+    "booking_guides": {"hotel": {"title": "酒店预订", "platforms": ["携程", "飞猪"]}},
+    "tips": ["多喝水"],
+}
+RESPONSE = "好的，以下是您的清单：\n```json\n" + json.dumps(CHECKLIST, ensure_ascii=False, indent=2) + "\n```"
+
+
+def test_any_chunking():
+    """Test that every chunk size yields the same members."""
+    print("🔍 测试分块解析...")
+    
+    for size in (1, 2, 5, 17, len(RESPONSE)):
+        parser = StreamingJSONObjectParser()
+        members = []
+        for i in range(0, len(RESPONSE), size):
+            members.extend(parser.feed(RESPONSE[i:i + size]))
+        assert dict(members) == CHECKLIST, f"分块大小 {size} 解析结果不一致"
+        assert parser.done
+    
+    print("✅ 分块解析测试通过")
+
+
+def test_emits_early():
+    """Test that a category is emitted when its closing bracket arrives."""
+    print("\n🔍 测试类别提前输出...")
+    
+    parser = StreamingJSONObjectParser()
+    cut = RESPONSE.index("]") + 1
+    members = parser.feed(RESPONSE[:cut])
+    assert members == [("documents", CHECKLIST["documents"])], "证件类应在数组闭合时立即输出"
+    assert not parser.done
+    
+    members = parser.feed(RESPONSE[cut:])
+    assert [key for key, _ in members] == ["clothing", "days", "booking_guides", "tips"]
+    
+    print("✅ 类别提前输出测试通过")
+
+
+def test_not_json():
+    """Test that plain text produces no members."""
+    print("\n🔍 测试非JSON文本...")
+    
+    parser = StreamingJSONObjectParser()
+    assert parser.feed("抱歉，我无法生成清单。") == []
+    assert not parser.done and parser.members == []
+    
+    print("✅ 非JSON文本测试通过")
+
+
+def test_malformed_member():
+    """Test that a member with a trailing comma is repaired, not dropped."""
+    print("\n🔍 测试格式有误的成员...")
+    
+    response = '{"documents": ["身份证", "医保卡",], "clothing": ["外套"], "tips": ["多喝水"]}'
+    parser = StreamingJSONObjectParser()
+    for index in range(0, len(response), 7):
+        parser.feed(response[index:index + 7])
+    assert dict(parser.members)["documents"] == ["身份证", "医保卡"], "尾随逗号的成员应修复后保留"
+    
+    # The final render comes from the whole response even if streaming lost a member
+    lossy = StreamingJSONObjectParser()
+    lossy.members = [("clothing", ["外套"])]
+    assert "医保卡" in _finish_checklist_stream(lossy, response), "最终清单不应丢失类别"
+    
+    print("✅ 格式有误的成员测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_any_chunking()
+        test_emits_early()
+        test_not_json()
+        test_malformed_member()
+        print("\n🎉 所有增量解析测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
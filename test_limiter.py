@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for upstream admission control.
+Tests slot limits, per-session fairness, queue bounds and wait timeouts.
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from api.limiter import ConcurrencyLimiter, AsyncConcurrencyLimiter, AdmissionError
+
+
+def test_session_fairness():
+    """Test that waiting sessions are served round robin."""
+    print("🔍 测试会话公平调度...")
+    
+    limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=10, queue_timeout=2)
+    order = []
+    
+    def job(session_id, index):
+        with limiter.slot(session_id):
+            order.append(f"{session_id}{index}")
+            time.sleep(0.01)
+    
+    limiter.acquire("holder")
+    threads = []
+    for session_id, index in [("A", 0), ("A", 1), ("A", 2), ("B", 0)]:
+        thread = threading.Thread(target=job, args=(session_id, index))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.01)
+    limiter.release()
+    for thread in threads:
+        thread.join()
+    
+    print(f"  执行顺序: {order}")
+    assert order == ["A0", "B0", "A1", "A2"], "会话B不应排在会话A的全部请求之后"
+    
+    metrics = limiter.metrics()
+    assert metrics["active"] == 0 and metrics["queue_depth"] == 0
+    assert metrics["wait_max_seconds"] > 0
+    
+    print("✅ 会话公平调度测试通过")
+
+
+def test_queue_bounds():
+    """Test that full queues reject and slow queues time out."""
+    print("\n🔍 测试排队上限与超时...")
+    
+    limiter = ConcurrencyLimiter(max_concurrency=1, max_queue=1, queue_timeout=0.1)
+    limiter.acquire()
+    
+    started = time.monotonic()
+    try:
+        limiter.acquire()
+        assert False, "排队超时应抛出异常"
+    except AdmissionError as e:
+        print(f"  超时提示: {e}")
+    assert time.monotonic() - started < 1, "超时应快速失败"
+    assert limiter.metrics()["timed_out"] == 1
+    
+    async def run():
+        async_limiter = AsyncConcurrencyLimiter(max_concurrency=2, max_queue=2, queue_timeout=1)
+        
+        async def job():
+            async with async_limiter.slot():
+                await asyncio.sleep(0.05)
+        
+        results = await asyncio.gather(*[job() for _ in range(6)], return_exceptions=True)
+        return results, async_limiter.metrics()
+    
+    results, metrics = asyncio.run(run())
+    rejected = [r for r in results if isinstance(r, AdmissionError)]
+    assert len(rejected) == 2, f"应拒绝2个请求，实际 {len(rejected)} 个"
+    assert metrics["admitted"] == 4 and metrics["rejected"] == 2
+    
+    print("✅ 排队上限与超时测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_session_fairness()
+        test_queue_bounds()
+        print("\n🎉 所有限流测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
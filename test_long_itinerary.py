@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for two-phase itinerary generation.
+Tests outline parsing and that blocks of days are expanded concurrently and stitched in order.
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.helpers import parse_day_outline
+from core.travel_functions import _expand_itinerary, _expand_itinerary_async, _itinerary_jobs
+
+OUTLINE = """
+📅 行程大纲
+第1天：杭州 - 抵达休整
+**第二天**：杭州 - 西湖
+### 第3天 - 灵隐寺
+第3天：重复的一行
+第十二天：返程
+"""
+
+
+class SlowClient:
+    """Client whose every block takes the same time; the block starting on day 3 fails."""
+    
+    def generate_itinerary_days(self, destination, duration, mobility, health_focus, outline, start_day, end_day):
+        time.sleep(0.2)
+        if start_day == 3:
+            raise RuntimeError("上游错误")
+        return f"第{start_day}天至第{end_day}天详细安排"
+    
+    def generate_itinerary_notes(self, destination, duration, mobility, health_focus, outline):
+        time.sleep(0.2)
+        return "注意事项：按时服药"
+
+
+class SlowAsyncClient:
+    async def generate_itinerary_days(self, destination, duration, mobility, health_focus, outline, start_day, end_day):
+        await asyncio.sleep(0.2 if start_day > 1 else 0.05)
+        return f"第{start_day}天至第{end_day}天详细安排"
+    
+    async def generate_itinerary_notes(self, destination, duration, mobility, health_focus, outline):
+        await asyncio.sleep(0.2)
+        return "注意事项：按时服药"
+
+
+def test_parse_outline():
+    """Test that day lines are extracted in order, deduplicated and bounded."""
+    print("🔍 测试行程大纲解析...")
+    
+    assert parse_day_outline(OUTLINE, 15) == ["杭州 - 抵达休整", "杭州 - 西湖", "灵隐寺", "返程"]
+    assert parse_day_outline(OUTLINE, 3) == ["杭州 - 抵达休整", "杭州 - 西湖", "灵隐寺"], "超过天数上限的行应被忽略"
+    assert parse_day_outline("暂无安排", 15) == []
+    
+    print("✅ 行程大纲解析测试通过")
+
+
+def test_jobs():
+    """Test that days are split into blocks followed by the notes."""
+    print("\n🔍 测试分段...")
+    
+    assert _itinerary_jobs(5) == [(1, 2), (3, 4), (5, 5), None]
+    
+    print("✅ 分段测试通过")
+
+
+def test_sync_expand():
+    """Test that blocks run concurrently and a failed block is marked in place."""
+    print("\n🔍 测试同步并行展开...")
+    
+    days = [f"杭州 - 主题{day}" for day in range(1, 13)]
+    started = time.monotonic()
+    frames = list(_expand_itinerary(SlowClient(), "杭州", "10-15天", "行走自如", "饮食清淡", days))
+    elapsed = time.monotonic() - started
+    
+    jobs = _itinerary_jobs(len(days))
+    assert elapsed < 0.2 * len(jobs) / 2, f"耗时应接近最慢的分段，实际 {elapsed:.2f}秒"
+    assert len(frames) == len(jobs) + 1, "大纲和每个分段完成时各输出一次"
+    assert frames[0].startswith("📅 行程总览（共12天）") and "第12天：杭州 - 主题12" in frames[0]
+    
+    final = frames[-1]
+    assert "生成中" not in final
+    assert final.index("第1天至第2天详细安排") < final.index("第3-4天行程生成失败") < final.index("第11天至第12天详细安排") < final.index("注意事项")
+    
+    print("✅ 同步并行展开测试通过")
+
+
+def test_async_expand():
+    """Test the async expansion stitches pieces in day order whatever order they finish in."""
+    print("\n🔍 测试异步并行展开...")
+    
+    async def run():
+        days = ["抵达", "西湖", "灵隐寺"]
+        return [frame async for frame in _expand_itinerary_async(SlowAsyncClient(), "杭州", "10-15天", "行走自如", "饮食清淡", days)]
+    
+    started = time.monotonic()
+    frames = asyncio.run(run())
+    assert time.monotonic() - started < 0.4
+    assert "第3天行程生成中" in frames[1], "先完成的分段应先显示，其余保留占位"
+    assert frames[-1].index("第1天至第2天") < frames[-1].index("第3天至第3天") < frames[-1].index("注意事项")
+    
+    print("✅ 异步并行展开测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_parse_outline()
+        test_jobs()
+        test_sync_expand()
+        test_async_expand()
+        print("\n🎉 所有长行程测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for per-task model routing.
+Tests task settings and SLO-based fallback to the faster model.
+"""
+
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from api.router import ModelRouter
+from config.config import MODEL_NAME, MAX_TOKENS
+
+TASK_MODELS = {
+    "destination": {"model": "slow-model", "max_tokens": 1024, "temperature": 0.5,
+                    "fallback_model": "fast-model", "ttft_slo": 2.0},
+}
+
+
+def test_task_settings():
+    """Test per-task settings and defaults for unknown tasks."""
+    print("🔍 测试任务模型配置...")
+    
+    router = ModelRouter(TASK_MODELS)
+    route = router.route("destination")
+    assert (route.model, route.max_tokens, route.temperature) == ("slow-model", 1024, 0.5)
+    
+    default = router.route(None)
+    assert default.model == MODEL_NAME and default.max_tokens == MAX_TOKENS
+    assert default.fallback_model is None, "未配置的任务不应切换模型"
+    
+    print("✅ 任务模型配置测试通过")
+
+
+def test_slo_fallback():
+    """Test that a primary over its SLO is replaced except for probes."""
+    print("\n🔍 测试延迟目标降级...")
+    
+    router = ModelRouter(TASK_MODELS, probe_interval=5)
+    route = router.route("destination")
+    
+    for _ in range(10):
+        router.record_ttft("slow-model", 0.5)
+    assert router.choose_model(route) == "slow-model", "满足延迟目标时应使用主模型"
+    
+    for _ in range(3):
+        router.deadline_policy(route, "slow-model").record_deadline_miss()
+    chosen = [router.choose_model(route) for _ in range(10)]
+    assert chosen.count("fast-model") == 8, f"超出延迟目标后应改用快速模型，实际 {chosen}"
+    assert chosen.count("slow-model") == 2, "应定期探测主模型是否恢复"
+    assert router.metrics()["slow-model"]["ttft_misses"] == 3
+    
+    for _ in range(10):
+        router.record_ttft("slow-model", 0.5)
+    assert router.choose_model(route) == "slow-model", "主模型恢复后应切回"
+    
+    print("✅ 延迟目标降级测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_task_settings()
+        test_slo_fallback()
+        print("\n🎉 所有模型路由测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
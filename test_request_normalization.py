@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for request canonicalization.
+Tests that equivalent user inputs produce identical prompts and fingerprints.
+"""
+
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.helpers import (
+    format_interests, format_health_focus, normalize_location,
+    canonicalize_request, request_fingerprint
+)
+
+
+def test_multiselect_order():
+    """Test that multiselect values are joined in option-list order."""
+    print("🔍 测试多选项排序...")
+    
+    assert format_interests(["温泉养生", "避寒康养"]) == format_interests(["避寒康养", "温泉养生"])
+    assert format_interests(["温泉养生", "避寒康养"]) == "避寒康养、温泉养生"
+    assert format_health_focus(["定期休息", "饮食清淡", "避免过度疲劳"]) == "避免过度疲劳、饮食清淡、定期休息"
+    assert format_interests([]) == "暂无特别偏好"
+    
+    print("✅ 多选项排序测试通过")
+
+
+def test_location_normalization():
+    """Test free-text location normalization."""
+    print("\n🔍 测试地名规范化...")
+    
+    cases = [
+        ("杭州市", "杭州"),
+        (" 杭州 ", "杭州"),
+        ("杭州　", "杭州"),  # 全角空格
+        ("浙江省", "浙江"),
+        ("沙市", "沙市"),  # 去掉后缀会过短，保持不变
+        ("普陀山", "普陀山"),
+    ]
+    for raw, expected in cases:
+        result = normalize_location(raw)
+        print(f"  {raw!r} -> {result!r}")
+        assert result == expected, f"{raw!r} 应规范化为 {expected!r}"
+    
+    print("✅ 地名规范化测试通过")
+
+
+def test_fingerprint():
+    """Test that equivalent requests share a fingerprint."""
+    print("\n🔍 测试请求指纹...")
+    
+    first = canonicalize_request("itinerary", destination="杭州市", duration="一周左右",
+                                 health_focus=["饮食清淡", "避免过度疲劳"])
+    second = canonicalize_request("itinerary", destination="杭州", duration="一周左右",
+                                  health_focus=["避免过度疲劳", "饮食清淡"])
+    third = canonicalize_request("itinerary", destination="苏州", duration="一周左右",
+                                 health_focus=["避免过度疲劳", "饮食清淡"])
+    
+    assert request_fingerprint(first) == request_fingerprint(second), "等价请求指纹应一致"
+    assert request_fingerprint(first) != request_fingerprint(third), "不同请求指纹应不同"
+    assert len(request_fingerprint(first)) == 16
+    
+    print("✅ 请求指纹测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_multiselect_order()
+        test_location_normalization()
+        test_fingerprint()
+        print("\n🎉 所有规范化测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script for the upstream resilience layer.
+Tests retry classification, Retry-After handling, deadlines and the circuit breaker.
+"""
+
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from api.resilience import (
+    RetryPolicy, CircuitBreaker, UpstreamUnavailableError,
+    call_with_retry, is_retryable, retry_after_seconds
+)
+
+
+class FakeStatusError(Exception):
+    """Stand-in for an SDK status error carrying a status code and headers."""
+    
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def test_error_classification():
+    """Test which errors are retried and how Retry-After is read."""
+    print("🔍 测试错误分类...")
+    
+    assert is_retryable(FakeStatusError(429))
+    assert is_retryable(FakeStatusError(503))
+    assert not is_retryable(FakeStatusError(400))
+    assert not is_retryable(ValueError("bad"))
+    
+    assert retry_after_seconds(FakeStatusError(429, {"retry-after": "3"})) == 3.0
+    assert retry_after_seconds(FakeStatusError(429, {"retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(FakeStatusError(429)) is None
+    
+    print("✅ 错误分类测试通过")
+
+
+def test_retry_and_deadline():
+    """Test that transient errors are retried within the deadline."""
+    print("\n🔍 测试重试与截止时间...")
+    
+    policy = RetryPolicy(max_retries=3, base_delay=0.01, max_delay=0.05, deadline=5)
+    breaker = CircuitBreaker(failure_threshold=10, recovery_timeout=1)
+    failures = [FakeStatusError(429, {"retry-after": "0.1"}), FakeStatusError(502)]
+    
+    def flaky(timeout):
+        if failures:
+            raise failures.pop(0)
+        return "成功"
+    
+    started = time.monotonic()
+    assert call_with_retry(flaky, policy, breaker) == "成功"
+    assert time.monotonic() - started >= 0.1, "应遵守Retry-After"
+    
+    def slow(timeout):
+        raise FakeStatusError(429, {"retry-after": "10"})
+    
+    short_policy = RetryPolicy(max_retries=3, base_delay=0.01, deadline=0.5)
+    started = time.monotonic()
+    try:
+        call_with_retry(slow, short_policy, breaker)
+        assert False, "超过截止时间应放弃重试"
+    except FakeStatusError:
+        pass
+    assert time.monotonic() - started < 0.5, "不应等待超过截止时间"
+    
+    print("✅ 重试与截止时间测试通过")
+
+
+def test_circuit_breaker():
+    """Test that the breaker opens, fails fast and recovers."""
+    print("\n🔍 测试熔断器...")
+    
+    policy = RetryPolicy(max_retries=0, deadline=5)
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.1)
+    calls = []
+    
+    def failing(timeout):
+        calls.append(1)
+        raise FakeStatusError(500)
+    
+    for _ in range(2):
+        try:
+            call_with_retry(failing, policy, breaker)
+        except FakeStatusError:
+            pass
+    assert breaker.state == "open"
+    
+    try:
+        call_with_retry(failing, policy, breaker)
+        assert False, "熔断时应快速失败"
+    except UpstreamUnavailableError as e:
+        print(f"  熔断提示: {e}")
+    assert len(calls) == 2, "熔断期间不应调用上游"
+    
+    time.sleep(0.15)
+    assert breaker.state == "half_open"
+    assert call_with_retry(lambda timeout: "恢复", policy, breaker) == "恢复"
+    assert breaker.state == "closed"
+    
+    print("✅ 熔断器测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_error_classification()
+        test_retry_and_deadline()
+        test_circuit_breaker()
+        print("\n🎉 所有容错测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
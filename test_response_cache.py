@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for the two-tier response cache.
+Tests key stability, LRU eviction, TTL expiry and the shared on-disk tier.
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from api.cache import ResponseCache, make_cache_key
+
+
+def test_cache_key():
+    """Test that the cache key covers every request parameter."""
+    print("🔍 测试缓存键...")
+    
+    base = make_cache_key("model", "系统", "用户", 4096, 0.7)
+    assert base == make_cache_key("model", "系统", "用户", 4096, 0.7), "相同请求的键应一致"
+    assert base != make_cache_key("other", "系统", "用户", 4096, 0.7), "模型不同键应不同"
+    assert base != make_cache_key("model", "系统", "用户", 1024, 0.7), "max_tokens不同键应不同"
+    assert base != make_cache_key("model", "系统", "用户", 4096, 0.2), "temperature不同键应不同"
+    
+    print("✅ 缓存键测试通过")
+
+
+def test_memory_tier():
+    """Test LRU eviction and TTL expiry in the in-process tier."""
+    print("\n🔍 测试内存缓存层...")
+    
+    cache = ResponseCache(ttl_seconds=60, memory_max_entries=2, disk_dir=None)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"
+    cache.set("c", "C")  # evicts "b", the least recently used
+    assert cache.get("b") is None, "最久未使用的条目应被淘汰"
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+    
+    expiring = ResponseCache(ttl_seconds=0.05, disk_dir=None)
+    expiring.set("k", "V")
+    time.sleep(0.1)
+    assert expiring.get("k") is None, "过期条目不应返回"
+    
+    stale = ResponseCache(ttl_seconds=0.05, stale_ttl_seconds=0.2, disk_dir=None)
+    stale.set("k", "V")
+    time.sleep(0.1)
+    assert stale.get("k", allow_stale=True) == "V", "保留期内的过期条目可作为兜底"
+    time.sleep(0.2)
+    assert stale.get("k", allow_stale=True) is None, "超过保留期的条目不应返回"
+    
+    print("✅ 内存缓存层测试通过")
+
+
+def test_disk_tier():
+    """Test that entries are shared through the on-disk tier and trimmed to size."""
+    print("\n🔍 测试磁盘缓存层...")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        writer = ResponseCache(ttl_seconds=60, disk_dir=tmp_dir, disk_max_entries=3)
+        for i in range(5):
+            writer.set(f"key{i}", f"value{i}")
+        
+        # A second instance simulates another worker process
+        reader = ResponseCache(ttl_seconds=60, disk_dir=tmp_dir, disk_max_entries=3)
+        assert reader.get("key4") == "value4", "其他进程应能读取磁盘缓存"
+        assert reader.get("key0") is None, "磁盘层应按容量淘汰旧条目"
+        
+        reader.clear()
+        assert reader.get("key4") is None
+        
+        short_lived = ResponseCache(ttl_seconds=0.2, disk_dir=tmp_dir)
+        short_lived.set("short", "value")
+        time.sleep(0.1)
+        assert reader.get("short") == "value"
+        time.sleep(0.15)
+        assert reader.get("short") is None, "从磁盘载入内存的条目应沿用原有过期时间"
+    
+    print("✅ 磁盘缓存层测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_cache_key()
+        test_memory_tier()
+        test_disk_tier()
+        print("\n🎉 所有缓存测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for response cleaning.
+Tests that fences and thinking blocks are removed the same way in one pass and chunk by chunk.
+"""
+
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.helpers import clean_response, safe_json_parse
+from utils.cleaning import ResponseCleaner
+
+RESPONSE = """<thinking>用户是老人，行程要轻松。
+```草稿```</thinking>
+
+好的，清单如下：
+```json
+{"documents": ["身份证"]}
+```
+
+
+
+祝您旅途愉快！
+"""
+
+
+def stream(text, size):
+    """Feed text to a fresh cleaner in chunks of the given size."""
+    cleaner = ResponseCleaner()
+    output = "".join(cleaner.feed(text[i:i + size]) for i in range(0, len(text), size))
+    return output + cleaner.flush()
+
+
+def test_clean_response():
+    """Test fences, thinking blocks and blank lines in one pass."""
+    print("🔍 测试响应清理...")
+    
+    cleaned = clean_response(RESPONSE)
+    assert cleaned == '好的，清单如下：\n{"documents": ["身份证"]}\n\n祝您旅途愉快！', cleaned
+    assert safe_json_parse("```json\n{\"a\": 1}\n```") == {"a": 1}
+    assert clean_response("") == "" and clean_response(None) == ""
+    assert clean_response("思考<thinking>未结束") == "思考", "未闭合的思考块应整体丢弃"
+    assert clean_response("代码`x`与<b>标签") == "代码`x`与<b>标签", "不完整的标记应原样保留"
+    
+    print("✅ 响应清理测试通过")
+
+
+def test_stream_matches_batch():
+    """Test that every chunk size gives the one-pass result."""
+    print("\n🔍 测试流式清理...")
+    
+    for text in (RESPONSE, "思考<thinking>未结束", "```\n{}\n```", "结尾是半个标记 <think"):
+        for size in (1, 2, 3, 7, len(text)):
+            assert stream(text, size) == clean_response(text), f"分块大小 {size} 结果不一致: {text!r}"
+    
+    cleaner = ResponseCleaner()
+    assert cleaner.feed("<thinking>" + "很长的思考" * 1000) == ""
+    assert len(cleaner._pending) < len("</thinking>"), "思考块内容不应被缓存"
+    assert cleaner.feed("</thinking>正文") == "正文"
+    
+    print("✅ 流式清理测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_clean_response()
+        test_stream_matches_batch()
+        print("\n🎉 所有响应清理测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
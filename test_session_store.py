@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the server-side session store.
+Tests references, LRU and memory-cap eviction, TTL expiry and spilling to disk.
+"""
+
+import sys
+import os
+import tempfile
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from data.session_store import SessionStore, session_of
+from data.itinerary import parse_trip
+
+
+def test_references():
+    """Test that put merges values and returns a new reference each time."""
+    print("🔍 测试会话引用...")
+    
+    store = SessionStore(spill_dir=None)
+    first = store.put("s1", itinerary="第1天：西湖", destination="杭州")
+    second = store.put("s1", itinerary="第1天：灵隐寺")
+    assert first != second and session_of(first) == session_of(second) == "s1"
+    assert store.get(first) == {"itinerary": "第1天：灵隐寺", "destination": "杭州"}, "应返回合并后的最新值"
+    assert store.get("") is None and store.get("unknown#1") is None
+    
+    values = store.get(second)
+    values["destination"] = "苏州"
+    assert store.get(second)["destination"] == "杭州", "返回的应是副本"
+    
+    print("✅ 会话引用测试通过")
+
+
+def test_eviction():
+    """Test LRU eviction by count, the memory cap and TTL expiry."""
+    print("\n🔍 测试会话淘汰...")
+    
+    store = SessionStore(max_sessions=2, spill_dir=None)
+    store.put("a", itinerary="A")
+    store.put("b", itinerary="B")
+    store.get("a")
+    store.put("c", itinerary="C")  # evicts "b", the least recently used
+    assert store.get("b") is None, "最久未使用的会话应被淘汰"
+    assert store.get("a") and store.get("c")
+    
+    capped = SessionStore(max_bytes=30000, spill_dir=None)
+    for index in range(10):
+        capped.put(f"s{index}", itinerary="行程" * 2000)
+    metrics = capped.metrics()
+    assert metrics["resident_bytes"] <= 30000 and metrics["evicted"] > 0, "驻留内存应受上限约束"
+    assert capped.get("s9"), "最新的会话应保留"
+    
+    expiring = SessionStore(ttl_seconds=0.05, spill_dir=None)
+    ref = expiring.put("s", itinerary="X")
+    time.sleep(0.1)
+    assert expiring.get(ref) is None and expiring.metrics()["expired"] == 1, "过期会话不应返回"
+    
+    print("✅ 会话淘汰测试通过")
+
+
+def test_spill_to_disk():
+    """Test that evicted sessions, including a parsed Trip, come back from disk."""
+    print("\n🔍 测试会话溢出到磁盘...")
+    
+    trip = parse_trip("第1天：西湖\n上午：游船\n住宿：西湖国宾馆", "杭州", "3天")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = SessionStore(max_sessions=1, spill_dir=tmp_dir)
+        ref = store.put("a", itinerary="第1天：西湖", trip=trip)
+        store.put("b", itinerary="B")
+        assert store.metrics()["sessions"] == 1 and store.metrics()["spilled"] == 1
+        
+        restored = store.get(ref)
+        assert restored["itinerary"] == "第1天：西湖" and restored["trip"] == trip, "溢出的会话应完整恢复"
+        assert store.metrics()["loaded"] == 1
+        
+        store.discard("a")
+        store.discard("b")
+        assert store.get("a") is None and store.get("b") is None
+        assert not os.listdir(tmp_dir), "丢弃的会话不应残留文件"
+    
+    print("✅ 会话溢出测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_references()
+        test_eviction()
+        test_spill_to_disk()
+        print("\n🎉 所有会话存储测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
\ No newline at end of file
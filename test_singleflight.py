@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Test script for request coalescing.
+Tests that concurrent identical requests share a single upstream call.
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from api.singleflight import SingleFlight, AsyncSingleFlight
+
+
+def test_sync_coalescing():
+    """Test that concurrent threads share one call and one stream."""
+    print("🔍 测试同步请求合并...")
+    
+    flights = SingleFlight()
+    calls = []
+    
+    def slow_call():
+        calls.append(1)
+        time.sleep(0.1)
+        return "结果"
+    
+    def slow_stream():
+        calls.append(1)
+        for chunk in ["第一天", "第二天", "第三天"]:
+            time.sleep(0.03)
+            yield chunk
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flights.do("k", slow_call))) for _ in range(5)]
+    threads += [threading.Thread(target=lambda: results.append("".join(flights.stream("k", slow_stream)))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert results.count("结果") == 5 and results.count("第一天第二天第三天") == 5
+    assert len(calls) == 2, f"应只调用上游2次，实际 {len(calls)} 次"
+    
+    print("✅ 同步请求合并测试通过")
+
+
+def test_async_coalescing():
+    """Test that concurrent coroutines share one call and one stream."""
+    print("\n🔍 测试异步请求合并...")
+    
+    flights = AsyncSingleFlight()
+    calls = []
+    
+    async def slow_call():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "结果"
+    
+    async def slow_stream():
+        calls.append(1)
+        for chunk in ["第一天", "第二天"]:
+            await asyncio.sleep(0.03)
+            yield chunk
+    
+    async def collect():
+        return "".join([chunk async for chunk in flights.stream("k", slow_stream)])
+    
+    async def run():
+        return await asyncio.gather(
+            *[flights.do("k", slow_call) for _ in range(5)],
+            *[collect() for _ in range(5)]
+        )
+    
+    results = asyncio.run(run())
+    assert results == ["结果"] * 5 + ["第一天第二天"] * 5
+    assert len(calls) == 2, f"应只调用上游2次，实际 {len(calls)} 次"
+    
+    print("✅ 异步请求合并测试通过")
+
+
+def test_error_propagation():
+    """Test that followers see the leader's error."""
+    print("\n🔍 测试错误传递...")
+    
+    flights = SingleFlight()
+    
+    def failing_call():
+        time.sleep(0.05)
+        raise RuntimeError("上游错误")
+    
+    errors = []
+    
+    def call():
+        try:
+            flights.do("k", failing_call)
+        except RuntimeError as e:
+            errors.append(str(e))
+    
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == ["上游错误"] * 3
+    
+    print("✅ 错误传递测试通过")
+
+
+def test_abandoned_stream():
+    """Test that the upstream stream is closed once its only consumer leaves."""
+    print("\n🔍 测试放弃流式请求...")
+    
+    state = {"sent": 0, "closed": False}
+    
+    def upstream():
+        try:
+            for i in range(100):
+                state["sent"] += 1
+                time.sleep(0.01)
+                yield f"块{i}"
+        finally:
+            state["closed"] = True
+    
+    flights = SingleFlight()
+    consumer = flights.stream("k", upstream)
+    assert next(consumer) == "块0"
+    consumer.close()
+    
+    for _ in range(100):
+        if state["closed"]:
+            break
+        time.sleep(0.01)
+    
+    assert state["closed"], "上游流应在最后一个订阅者离开后关闭"
+    assert state["sent"] < 100, "被放弃的上游流不应被读完"
+    assert not flights._streams, "被放弃的请求不应再被新请求复用"
+    
+    async_state = {"sent": 0, "closed": False}
+    
+    async def async_upstream():
+        try:
+            for i in range(100):
+                async_state["sent"] += 1
+                await asyncio.sleep(0.01)
+                yield f"块{i}"
+        finally:
+            async_state["closed"] = True
+    
+    async def abandon():
+        async_flights = AsyncSingleFlight()
+        consumer = async_flights.stream("k", async_upstream)
+        assert await consumer.__anext__() == "块0"
+        await consumer.aclose()
+        await asyncio.sleep(0.05)
+        assert not async_flights._streams
+    
+    asyncio.run(abandon())
+    
+    assert async_state["closed"], "异步上游流应在最后一个订阅者离开后关闭"
+    assert async_state["sent"] < 100, "被放弃的异步上游流不应被读完"
+    
+    print("✅ 放弃流式请求测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_sync_coalescing()
+        test_async_coalescing()
+        test_error_propagation()
+        test_abandoned_stream()
+        print("\n🎉 所有请求合并测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming deadline.
+Tests that a stream dripping tokens past the call deadline is closed and reported.
+"""
+
+import sys
+import os
+import asyncio
+import time
+from types import SimpleNamespace
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+os.environ.setdefault("MODEL_API_KEY", "test-key")
+
+from api.openai_client import OpenAIClient, AsyncOpenAIClient
+from api.pool import EndpointPool
+from api.resilience import RetryPolicy, UpstreamUnavailableError
+
+
+def _chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class SlowStream:
+    """Yields one token every `delay` seconds and records whether it was closed."""
+    
+    def __init__(self, delay, count=100):
+        self.delay = delay
+        self.count = count
+        self.sent = 0
+        self.closed = False
+    
+    def __iter__(self):
+        for i in range(self.count):
+            time.sleep(self.delay)
+            self.sent += 1
+            yield _chunk(f"词{i}")
+    
+    def close(self):
+        self.closed = True
+
+
+class AsyncSlowStream(SlowStream):
+    """Async counterpart of SlowStream."""
+    
+    async def __aiter__(self):
+        for i in range(self.count):
+            await asyncio.sleep(self.delay)
+            self.sent += 1
+            yield _chunk(f"词{i}")
+    
+    async def close(self):
+        self.closed = True
+
+
+class FakeCompletions:
+    def __init__(self, stream, is_async):
+        self.stream = stream
+        self.is_async = is_async
+    
+    def create(self, **kwargs):
+        if not self.is_async:
+            return self.stream
+        
+        async def opened():
+            return self.stream
+        return opened()
+
+
+def _fake_client(client, stream, is_async):
+    """Point a client at a single fake endpoint and give it a short deadline."""
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(stream, is_async)))
+    client.pool = EndpointPool([{"base_url": "http://fake", "api_key": "test-key"}], lambda base_url, api_key: fake)
+    client.cache = None
+    client.hedging.enabled = False
+    client.retry_policy = RetryPolicy(max_retries=0, deadline=0.3)
+    return client
+
+
+def test_sync_stream_deadline():
+    """Test that the sync stream stops once the deadline passes mid-answer."""
+    print("🔍 测试同步流式截止时间...")
+    
+    stream = SlowStream(0.05)
+    client = _fake_client(OpenAIClient(), stream, is_async=False)
+    
+    chunks, error = [], None
+    try:
+        for chunk in client.generate_response_stream("系统", "同步慢速"):
+            chunks.append(chunk)
+    except UpstreamUnavailableError as e:
+        error = e
+    
+    assert error is not None and "超时" in str(error), "超过截止时间应报告超时"
+    assert chunks and stream.sent < stream.count, "慢速流不应被读完"
+    assert stream.closed, "超时后应关闭上游流"
+    assert client.limiter.metrics()["active"] == 0, "超时后应释放并发名额"
+    
+    print("✅ 同步流式截止时间测试通过")
+
+
+def test_async_stream_deadline():
+    """Test that the async stream stops once the deadline passes mid-answer."""
+    print("\n🔍 测试异步流式截止时间...")
+    
+    stream = AsyncSlowStream(0.05)
+    
+    async def consume():
+        client = _fake_client(AsyncOpenAIClient(), stream, is_async=True)
+        chunks = []
+        try:
+            async for chunk in client.generate_response_stream("系统", "异步慢速"):
+                chunks.append(chunk)
+        except UpstreamUnavailableError as e:
+            return chunks, e, client
+        return chunks, None, client
+    
+    chunks, error, client = asyncio.run(consume())
+    
+    assert error is not None and "超时" in str(error), "超过截止时间应报告超时"
+    assert chunks and stream.sent < stream.count, "慢速流不应被读完"
+    assert stream.closed, "超时后应关闭上游流"
+    assert client.limiter.metrics()["active"] == 0, "超时后应释放并发名额"
+    
+    print("✅ 异步流式截止时间测试通过")
+
+
+if __name__ == "__main__":
+    try:
+        test_sync_stream_deadline()
+        test_async_stream_deadline()
+        print("\n🎉 所有流式截止时间测试通过!")
+    except AssertionError as e:
+        print(f"\n❌ 测试失败: {e}")
+        sys.exit(1)
@@ -7,6 +7,13 @@ import requests
 from PIL import Image
 from io import BytesIO
 import re
+import sys
+
+# 清单存储与 src/ 下的新版应用共用
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+from data.checklist_store import get_checklist_store
 
 # 从环境变量读取API配置（更安全）
 API_KEY = os.getenv('MODEL_API_KEY')
@@ -280,57 +287,64 @@ def generate_checklist(destination, duration, special_needs, itinerary_content=N
         return result
 
 def save_checklist_data(checklist_id, destination, duration, data):
-    """保存清单数据到本地JSON文件"""
-    import json
-    import os
-    from datetime import datetime
-
-    # 创建保存目录
-    save_dir = "checklist_data"
-    if not os.path.exists(save_dir):
-        os.makedirs(save_dir)
-
-    # 准备保存的数据
-    save_data = {
-        "id": checklist_id,
-        "destination": destination,
-        "duration": duration,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "data": data
-    }
-
-    # 保存到文件
-    file_path = os.path.join(save_dir, f"{checklist_id}.json")
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(save_data, f, ensure_ascii=False, indent=2)
+    """保存清单数据到本地SQLite清单库（与 src/data/checklist_store.py 共用）"""
+    get_checklist_store().save(data, destination=destination, duration=duration, record_id=checklist_id)
+
+# 清单样式只随页面下发一次，清单HTML中只使用类名，减小每次响应的体积
+CHECKLIST_CSS = """
+        .tc-list {font-family: Arial, sans-serif; max-width: 100%;}
+        .tc-banner {background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 10px; margin-bottom: 20px;}
+        .tc-banner h2 {margin: 0; font-size: 24px;}
+        .tc-note {background: #e8f5e9; padding: 15px; border-radius: 8px; margin-bottom: 20px;}
+        .tc-note h3 {margin: 0 0 10px 0; color: #2e7d32;}
+        .tc-note p {margin: 0; color: #558b2f; font-size: 13px;}
+        .tc-category {margin-bottom: 25px; border: 2px solid #e0e0e0; border-radius: 8px; overflow: hidden;}
+        .tc-category-name {background: #f5f5f5; padding: 12px 15px; font-weight: bold; font-size: 16px; border-bottom: 1px solid #e0e0e0;}
+        .tc-items {padding: 15px; background: white;}
+        .tc-item {margin-bottom: 12px; padding: 8px; border-radius: 6px; line-height: 1.6;}
+        .tc-tag {color: #757575; font-size: 12px; font-weight: bold;}
+        .tc-name {color: #333; margin-left: 8px;}
+        .tc-required .tc-tag {color: #d32f2f;}
+        .tc-required .tc-name {font-weight: bold;}
+        .tc-item-note {color: #666; font-size: 13px; margin-top: 4px;}
+        .tc-booking {background: #e3f2fd; padding: 15px; border-radius: 8px; margin-bottom: 20px;}
+        .tc-booking h3 {margin: 0 0 10px 0; color: #1565c0;}
+        .tc-guide {margin-bottom: 20px; padding: 15px; border-left: 4px solid var(--tc-accent); background: #f5f5f5;}
+        .tc-guide h4 {margin: 0 0 10px 0; color: var(--tc-title);}
+        .tc-guide p {margin: 0; color: #555; line-height: 1.6;}
+        .tc-guide p.tc-platforms {margin: 10px 0 5px 0; color: #333; font-weight: bold;}
+        .tc-guide ul {margin: 0; color: #555;}
+        .tc-guide li {margin-bottom: 5px;}
+        .tc-tips {background: #fff3e0; padding: 15px; border-radius: 8px; margin-bottom: 20px;}
+        .tc-tips h3 {margin: 0 0 10px 0; color: #e65100;}
+        .tc-tips p {margin: 8px 0; color: #555;}
+        .tc-footer {background: #f5f5f5; padding: 15px; border-radius: 8px; text-align: center; color: #666; font-size: 13px; margin-top: 20px;}
+        .tc-footer p {margin: 5px 0;}
+"""
+
+# 预订指引：字段名、标题、边框颜色、标题颜色
+BOOKING_GUIDE_SECTIONS = [
+    ("transport", "✈️ 交通预订", "#2196f3", "#1976d2"),
+    ("hotel", "🏨 酒店预订", "#4caf50", "#388e3c"),
+    ("attractions", "🎯 景点预订", "#ff9800", "#f57c00"),
+]
 
 def format_checklist_output(checklist_id, destination, duration, data):
-    """格式化清单输出为可读文本（无checkbox）"""
+    """格式化清单输出为可读文本（无checkbox），样式见 CHECKLIST_CSS"""
 
     # 构建HTML输出
-    html = f"""
-    <div style="font-family: Arial, sans-serif; max-width: 100%;">
-        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; border-radius: 10px; margin-bottom: 20px;">
-            <h2 style="margin: 0; font-size: 24px;">📋 旅行清单 - {destination} ({duration})</h2>
-        </div>
-
-        <div style="background: #e8f5e9; padding: 15px; border-radius: 8px; margin-bottom: 20px;">
-            <h3 style="margin: 0 0 10px 0; color: #2e7d32;">📦 行前准备清单</h3>
-            <p style="margin: 0; color: #558b2f; font-size: 13px;">💡 提示：此清单仅供参考，请根据实际情况调整</p>
-        </div>
-    """
+    html = f"""<div class="tc-list">
+        <div class="tc-banner"><h2>📋 旅行清单 - {destination} ({duration})</h2></div>
+        <div class="tc-note">
+            <h3>📦 行前准备清单</h3>
+            <p>💡 提示：此清单仅供参考，请根据实际情况调整</p>
+        </div>"""
 
     # 生成每个类别的清单
     for category in data.get("checklist", []):
         category_name = category.get("category", "")
         items = category.get("items", [])
-        html += f"""
-        <div style="margin-bottom: 25px; border: 2px solid #e0e0e0; border-radius: 8px; overflow: hidden;">
-            <div style="background: #f5f5f5; padding: 12px 15px; font-weight: bold; font-size: 16px; border-bottom: 1px solid #e0e0e0;">
-                🔹 {category_name}
-            </div>
-            <div style="padding: 15px; background: white;">
-        """
+        html += f'<div class="tc-category"><div class="tc-category-name">🔹 {category_name}</div><div class="tc-items">'
 
         for item in items:
             name = item.get("name", "")
@@ -338,91 +352,39 @@ def format_checklist_output(checklist_id, destination, duration, data):
             note = item.get("note", "")
             required_text = "【必带】" if required else "【可选】"
 
-            html += f"""
-                <div style="margin-bottom: 12px; padding: 8px; border-radius: 6px; line-height: 1.6;">
-                    <span style="color: {'#d32f2f' if required else '#757575'}; font-size: 12px; font-weight: bold;">{required_text}</span>
-                    <span style="color: #333; margin-left: 8px; font-weight: {('bold' if required else 'normal')}">{name}</span>
-                    {f'<div style="color: #666; font-size: 13px; margin-top: 4px; margin-left: 0;">💡 {note}</div>' if note else ''}
-                </div>
-            """
+            html += f'<div class="tc-item{" tc-required" if required else ""}"><span class="tc-tag">{required_text}</span><span class="tc-name">{name}</span>'
+            if note:
+                html += f'<div class="tc-item-note">💡 {note}</div>'
+            html += '</div>'
 
-        html += """
-            </div>
-        </div>
-        """
+        html += '</div></div>'
 
     # 预订指引部分（纯文本）
-    html += """
-        <div style="background: #e3f2fd; padding: 15px; border-radius: 8px; margin-bottom: 20px;">
-            <h3 style="margin: 0 0 10px 0; color: #1565c0;">🎫 预订指引</h3>
-        </div>
-    """
+    html += '<div class="tc-booking"><h3>🎫 预订指引</h3></div>'
 
     booking_guides = data.get("booking_guides", {})
-    if booking_guides:
-        # 交通指引
-        if "transport" in booking_guides:
-            html += f"""
-            <div style="margin-bottom: 20px; padding: 15px; border-left: 4px solid #2196f3; background: #f5f5f5;">
-                <h4 style="margin: 0 0 10px 0; color: #1976d2;">✈️ 交通预订</h4>
-                <p style="margin: 0; color: #555; line-height: 1.6;">{booking_guides['transport'].get('guide', '')}</p>
-            """
-            platforms = booking_guides['transport'].get('platforms', [])
+    for key, title, accent, title_color in BOOKING_GUIDE_SECTIONS:
+        if key in booking_guides:
+            guide = booking_guides[key]
+            html += f'<div class="tc-guide" style="--tc-accent: {accent}; --tc-title: {title_color};"><h4>{title}</h4><p>{guide.get("guide", "")}</p>'
+            platforms = guide.get('platforms', [])
             if platforms:
-                html += '<p style="margin: 10px 0 5px 0; color: #333; font-weight: bold;">推荐平台：</p><ul style="margin: 0; color: #555;">'
+                html += '<p class="tc-platforms">推荐平台：</p><ul>'
                 for platform in platforms:
-                    html += f'<li style="margin-bottom: 5px;">{platform}</li>'
-                html += '</ul>'
-            html += "</div>"
-
-        # 酒店指引
-        if "hotel" in booking_guides:
-            html += f"""
-            <div style="margin-bottom: 20px; padding: 15px; border-left: 4px solid #4caf50; background: #f5f5f5;">
-                <h4 style="margin: 0 0 10px 0; color: #388e3c;">🏨 酒店预订</h4>
-                <p style="margin: 0; color: #555; line-height: 1.6;">{booking_guides['hotel'].get('guide', '')}</p>
-            """
-            platforms = booking_guides['hotel'].get('platforms', [])
-            if platforms:
-                html += '<p style="margin: 10px 0 5px 0; color: #333; font-weight: bold;">推荐平台：</p><ul style="margin: 0; color: #555;">'
-                for platform in platforms:
-                    html += f'<li style="margin-bottom: 5px;">{platform}</li>'
-                html += '</ul>'
-            html += "</div>"
-
-        # 景点指引
-        if "attractions" in booking_guides:
-            html += f"""
-            <div style="margin-bottom: 20px; padding: 15px; border-left: 4px solid #ff9800; background: #f5f5f5;">
-                <h4 style="margin: 0 0 10px 0; color: #f57c00;">🎯 景点预订</h4>
-                <p style="margin: 0; color: #555; line-height: 1.6;">{booking_guides['attractions'].get('guide', '')}</p>
-            """
-            platforms = booking_guides['attractions'].get('platforms', [])
-            if platforms:
-                html += '<p style="margin: 10px 0 5px 0; color: #333; font-weight: bold;">推荐平台：</p><ul style="margin: 0; color: #555;">'
-                for platform in platforms:
-                    html += f'<li style="margin-bottom: 5px;">{platform}</li>'
+                    html += f'<li>{platform}</li>'
                 html += '</ul>'
             html += "</div>"
 
     # 温馨提示
     tips = data.get("tips", [])
     if tips:
-        html += """
-        <div style="background: #fff3e0; padding: 15px; border-radius: 8px; margin-bottom: 20px;">
-            <h3 style="margin: 0 0 10px 0; color: #e65100;">💡 温馨提示</h3>
-        """
+        html += '<div class="tc-tips"><h3>💡 温馨提示</h3>'
         for tip in tips:
-            html += f'<p style="margin: 8px 0; color: #555;">• {tip}</p>'
+            html += f'<p>• {tip}</p>'
         html += "</div>"
 
     # 底部信息
-    html += """
-        <div style="background: #f5f5f5; padding: 15px; border-radius: 8px; text-align: center; color: #666; font-size: 13px; margin-top: 20px;">
-            <p style="margin: 5px 0;">💡 此清单仅供参考，请根据实际情况调整</p>
-        </div>
-    </div>
-    """
+    html += '<div class="tc-footer"><p>💡 此清单仅供参考，请根据实际情况调整</p></div></div>'
 
     return html
 
@@ -455,7 +417,7 @@ def create_app():
         .gr-button {font-size: 18px !important; padding: 12px 20px !important;}
         .gr-textbox input {font-size: 16px !important;}
         .gr-multiselect {min-height: 120px !important;}
-        """
+        """ + CHECKLIST_CSS
     ) as app:
         gr.HTML('''
         <h1 style="text-align:center; font-size:48px; margin-bottom:10px;">